@@ -0,0 +1,58 @@
+"""
+Compares two JSON files of results of benchmarks, and exits with status 1 if
+any result regressed beyond the threshold.
+
+:Example:
+
+.. code::
+
+    python -m benchmarks.compare baseline.json current.json --threshold 0.1
+"""
+import argparse
+import json
+import sys
+
+from strong.bench import compare, format_comparisons
+
+parser = argparse.ArgumentParser(
+    description="Compares two runs of the benchmarks of strong."
+)
+
+parser.add_argument("baseline", type=str, help="JSON results of the reference run")
+parser.add_argument("current", type=str, help="JSON results of the new run")
+parser.add_argument(
+    "--threshold",
+    type=float,
+    default=0.1,
+    help="relative change above which a result regresses (default: 0.1)",
+)
+parser.add_argument(
+    "--key",
+    choices=["ratio", "overhead_ns", "time_ns"],
+    default="ratio",
+    help="measure to compare (default: ratio)",
+)
+
+
+def main() -> int:
+    args = parser.parse_args()
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    comparisons = compare(baseline, current, args.threshold, args.key)
+    print(format_comparisons(comparisons))
+
+    regressions = [c.name for c in comparisons if c.regression]
+    if regressions:
+        print(
+            "\n%d regression(s) beyond %.0f%%"
+            % (len(regressions), 100 * args.threshold)
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+Runs the benchmark suites of strong and stores their results in JSON.
+
+:Example:
+
+.. code::
+
+    python -m benchmarks.run -o baseline.json
+    python -m benchmarks.run --quick --suite checks --suite decorators
+"""
+import argparse
+import sys
+from typing import Dict, List, Optional
+
+from strong.bench import Result, benchmark, format_results, to_json
+
+from benchmarks.suites import SUITES
+
+parser = argparse.ArgumentParser(description="Runs the benchmarks of strong.")
+
+parser.add_argument(
+    "--suite",
+    action="append",
+    choices=list(SUITES),
+    help="suite to run, can be repeated (default: every suite)",
+)
+parser.add_argument(
+    "--quick",
+    action="store_true",
+    help="small containers and source trees, and fewer rounds",
+)
+parser.add_argument(
+    "--repeat", type=int, default=None, help="number of rounds per case"
+)
+parser.add_argument(
+    "-o", "--output", type=str, default=None, help="JSON file of the results"
+)
+
+
+def run(
+    suites: List[str], quick: bool = False, repeat: Optional[int] = None
+) -> Dict[str, Result]:
+    """
+    Runs benchmark suites.
+
+    :param suites: the names of the suites
+    :param quick: if True, runs the small cases with fewer rounds
+    :param repeat: the number of rounds per case, by default the one of the
+        case, or 30 (10 if `quick`)
+    :return: the results, by name of case and of configuration
+    """
+    results = dict()
+    for suite in suites:
+        for case in SUITES[suite](quick):
+            rounds = repeat or case.repeat or (10 if quick else 30)
+            case_results = benchmark(
+                case.func, case.configs, case.args, case.kwargs, repeat=rounds
+            )
+            for name, result in case_results.items():
+                name = "%s/%s" % (case.name, name)
+                results[name] = result._replace(name=name)
+            print(case.name, file=sys.stderr)
+            print(format_results(case_results), file=sys.stderr)
+            print(file=sys.stderr)
+    return results
+
+
+def main() -> None:
+    args = parser.parse_args()
+    suites = args.suite or list(SUITES)
+    results = run(suites, quick=args.quick, repeat=args.repeat)
+    text = to_json(results, args.output, suites=suites, quick=args.quick)
+    if args.output is None:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
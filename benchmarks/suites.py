@@ -0,0 +1,283 @@
+"""
+Benchmark suites of strong.
+
+Each suite returns, or yields, cases measured by
+:func:`strong.bench.benchmark`: the configurations of a case are measured
+against its function, the baseline.
+
+* `checks`: the cost of checking an object against an annotation, with a
+  compiled checker (:func:`strong.core.signature.compile_obj_typing`) and
+  with :func:`strong.core.signature.check_obj_typing`, against a raw
+  `isinstance` with the equivalent classes;
+* `decorators`: the cost of calling decorated functions, with passing and
+  failing checks, against the plain function;
+* `cli`: the cost of the `strong` command line tool on a generated source
+  tree, against loading the modules of the tree.
+"""
+import collections.abc
+import contextlib
+import functools
+import importlib.util
+import inspect
+import io
+import sys
+import tempfile
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from strong.core.decorators import assert_correct_typing, check_correct_typing
+from strong.core.signature import (
+    FULL,
+    SHALLOW,
+    check_obj_typing,
+    compile_obj_typing,
+    sampled_elements,
+)
+from strong.scripts.strong import main as strong_main
+
+
+class Case(NamedTuple):
+    """
+    A function, measured with its positional and keyword arguments against
+    configurations wrapping it (see :func:`strong.bench.benchmark`), with an
+    optional number of rounds.
+    """
+
+    name: str
+    func: Callable
+    configs: Dict[str, Callable[[Callable], Callable]]
+    args: tuple = ()
+    kwargs: Optional[Dict[str, Any]] = None
+    repeat: Optional[int] = None
+
+
+SIZES = (10, 100, 1000, 10000)
+QUICK_SIZES = (10, 1000)
+TREE_SIZES = (1000, 10000)
+QUICK_TREE_SIZES = (100,)
+
+
+class Point:
+    def __init__(self, x: float, y: float):
+        self.x = x
+        self.y = y
+
+
+def increment(a: int) -> int:
+    return a + 1
+
+
+def _raw_isinstance(obj: Any, classes: Any) -> bool:
+    return isinstance(obj, classes)
+
+
+def _check_configs(tp: Any, elements: Any) -> Dict[str, Callable]:
+    checker = compile_obj_typing(tp, elements)
+
+    def compiled(obj: Any, classes: Any) -> bool:
+        return checker(obj)
+
+    def checked(obj: Any, classes: Any) -> bool:
+        return check_obj_typing(obj, tp, elements)
+
+    return {"compiled": lambda _: compiled, "check_obj_typing": lambda _: checked}
+
+
+def checks(quick: bool = False) -> List[Case]:
+    """
+    Returns the cases of the cost of checks, per family of annotations and
+    per size of containers.
+
+    :param quick: if True, only small containers are checked
+    :return: the cases
+    """
+    objects = [
+        ("int", int, 1, int),
+        ("class", Point, Point(1.0, 2.0), Point),
+        ("Union", Union[int, str, float], "a", (int, str, float)),
+        ("Optional", Optional[int], None, (int, type(None))),
+        ("Callable", Callable[[int], int], increment, collections.abc.Callable),
+        ("Tuple", Tuple[int, str], (1, "a"), tuple),
+        ("Type", Type[int], bool, type),
+        ("Any", Any, object(), object),
+    ]
+
+    for size in QUICK_SIZES if quick else SIZES:
+        values = list(range(size))
+        objects += [
+            ("List[%d]" % size, List[int], values, list),
+            ("Tuple[%d]" % size, Tuple[int, ...], tuple(values), tuple),
+            ("Dict[%d]" % size, Dict[str, int], {str(v): v for v in values}, dict),
+        ]
+
+    cases = []
+    for name, tp, obj, classes in objects:
+        strategies = [("shallow", SHALLOW)]
+        if "[" in name:
+            strategies += [("full", FULL), ("sampled", sampled_elements(16, 0))]
+
+        for strategy, elements in strategies:
+            cases.append(
+                Case(
+                    "checks/%s/%s" % (name, strategy),
+                    _raw_isinstance,
+                    _check_configs(tp, elements),
+                    (obj, classes),
+                )
+            )
+
+    return cases
+
+
+def _discard(msg: str) -> None:
+    pass
+
+
+def decorators(quick: bool = False) -> List[Case]:
+    """
+    Returns the cases of the cost of decorated calls, with passing and failing
+    checks.
+
+    :param quick: unused, decorated calls are always measured
+    :return: the cases
+    """
+
+    def f(a: int, b: List[int], c: Optional[str] = None) -> int:
+        return a
+
+    def g(*args: int, **kwargs: float) -> None:
+        pass
+
+    discard = functools.partial(check_correct_typing, output=_discard)
+    configs = {
+        "assert": assert_correct_typing,
+        "full": functools.partial(assert_correct_typing, elements=FULL),
+        "lazy": functools.partial(assert_correct_typing, lazy=True),
+        "sample_every=16": functools.partial(assert_correct_typing, sample_every=16),
+        "budget=0.05": functools.partial(assert_correct_typing, budget=0.05),
+    }
+    failing_configs = {
+        "discard": discard,
+        "join=False": functools.partial(discard, join=False),
+    }
+
+    return [
+        Case("decorators/pass", f, configs, (1, list(range(100)), "c")),
+        Case("decorators/fail", f, failing_configs, ("a", list(range(100)), 1)),
+        Case(
+            "decorators/varargs",
+            g,
+            {"assert": assert_correct_typing, "full": configs["full"]},
+            (1, 2, 3),
+            {"x": 1.0, "y": 2.0},
+        ),
+    ]
+
+
+MODULE_TEMPLATE = """\
+from typing import Dict, List, Optional
+
+
+class Model{i}:
+    def __init__(self, name: str, values: List[int]):
+        self.name = name
+        self.values = values
+
+    def total(self) -> int:
+        return sum(self.values)
+
+    def scale(self, factor):
+        return [factor * value for value in self.values]
+
+    @classmethod
+    def empty(cls, name: str) -> "Model{i}":
+        return cls(name, [])
+
+
+def index_{i}(models: List[Model{i}]) -> Dict[str, Model{i}]:
+    return {{model.name: model for model in models}}
+
+
+def find_{i}(models: Dict[str, Model{i}], name: str) -> Optional[Model{i}]:
+    return models.get(name)
+
+
+def describe_{i}(model, verbose: bool = False):
+    return model.name
+"""
+
+
+def generate_tree(root: str, files: int, per_package: int = 100) -> None:
+    """
+    Writes a synthetic source tree, of packages of `per_package` modules each
+    defining a class and functions, some of them missing type hints.
+
+    :param root: the directory of the tree
+    :param files: the number of modules
+    :param per_package: the number of modules per package
+    """
+    for i in range(files):
+        package = Path(root, "package_%03d" % (i // per_package))
+        if i % per_package == 0:
+            package.mkdir(parents=True, exist_ok=True)
+            (package / "__init__.py").write_text("")
+        (package / ("module_%05d.py" % i)).write_text(MODULE_TEMPLATE.format(i=i))
+
+
+def _load_tree(root: str) -> None:
+    for path in Path(root).rglob("*.py"):
+        filename = str(path)
+        spec = importlib.util.spec_from_file_location(
+            inspect.getmodulename(filename), filename
+        )
+        module = importlib.util.module_from_spec(spec)
+        try:
+            spec.loader.exec_module(module)
+        except Exception:
+            pass
+
+
+def _run_cli(root: str) -> None:
+    argv, path = sys.argv, list(sys.path)
+    sys.argv = ["strong", root]
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            strong_main()
+    finally:
+        sys.argv = argv
+        sys.path[:] = path
+
+
+def cli(quick: bool = False) -> Iterator[Case]:
+    """
+    Yields the cases of the cost of the `strong` command line tool on
+    generated source trees of growing size. Trees are removed once the cases
+    are consumed.
+
+    :param quick: if True, only a small tree is generated
+    :return: the cases
+    """
+    for files in QUICK_TREE_SIZES if quick else TREE_SIZES:
+        with tempfile.TemporaryDirectory() as root:
+            generate_tree(root, files)
+            yield Case(
+                "cli/%d files" % files,
+                _load_tree,
+                {"strong": lambda _: _run_cli},
+                (root,),
+                repeat=5,
+            )
+
+
+SUITES = {"checks": checks, "decorators": decorators, "cli": cli}
@@ -20,6 +20,7 @@ setuptools.setup(
     ],
     license="MIT",
     python_requires=">=3.8",
+    extras_require={"numpy": ["numpy"]},
     entry_points="""
         [console_scripts]
         strong=strong.scripts.strong:main
@@ -0,0 +1,23 @@
+from strong.core.decorators import (
+    assert_correct_typing,
+    check_correct_typing,
+    suspended,
+    warmup,
+    warn_if_incorrect_typing,
+)
+from strong.core.instrument import instrument_class, instrument_module
+
+_HOOK_ATTRIBUTES_ = ("install_import_hook", "uninstall_import_hook")
+
+
+def __getattr__(name):
+    # The import hook module (ast, importlib.abc, ...) is only loaded when used
+    if name in _HOOK_ATTRIBUTES_:
+        from strong.core import hook
+
+        return getattr(hook, name)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_HOOK_ATTRIBUTES_))
@@ -0,0 +1,367 @@
+"""
+Statistical measure of the overhead of type checks.
+
+Each configuration (e.g. a decorator with its options) is timed against the
+plain function in repeated rounds. Within a round, the plain function and
+every configuration are run in a random order, so that drifts of the machine
+(frequency scaling, other processes, ...) affect all of them alike, and the
+overhead of a round is measured against the plain function of the same round.
+Results report the median over the rounds, the interquartile range and a
+confidence interval of the median, both for the absolute overhead per call
+and for the ratio of times.
+
+:Example:
+
+>>> from strong.bench import benchmark, format_results
+>>> from strong.core.decorators import assert_correct_typing
+>>> from strong.core.signature import FULL
+>>> def f(a: int, b: List[int]) -> int:
+>>>     return a
+>>> results = benchmark(
+>>>     f,
+>>>     {
+>>>         "shallow": assert_correct_typing,
+>>>         "full": functools.partial(assert_correct_typing, elements=FULL),
+>>>     },
+>>>     args=(1, list(range(100))),
+>>> )
+>>> print(format_results(results))
+config   overhead (ns)                       ratio
+shallow  412.3 [398.1, 425.0] IQR 31.2       5.12 [4.98, 5.27] IQR 0.35
+full     3210.8 [3150.2, 3262.4] IQR 98.7    34.61 [33.90, 35.20] IQR 1.20
+"""
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+from timeit import Timer
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+
+class Stats(NamedTuple):
+    """
+    Summary of repeated measures.
+    """
+
+    median: float
+    q1: float
+    q3: float
+    ci_low: float
+    ci_high: float
+    n: int
+
+    @property
+    def iqr(self) -> float:
+        """
+        The interquartile range.
+        """
+        return self.q3 - self.q1
+
+
+class Result(NamedTuple):
+    """
+    Measures of a configuration, times being per call, in nanoseconds.
+    """
+
+    name: str
+    baseline_ns: Stats
+    time_ns: Stats
+    overhead_ns: Stats
+    ratio: Stats
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the result as a dictionary, e.g. to be serialized in JSON.
+
+        :return: the dictionary
+        """
+        result = {"name": self.name}
+        for field in ("baseline_ns", "time_ns", "overhead_ns", "ratio"):
+            stats = getattr(self, field)
+            result[field] = dict(stats._asdict(), iqr=stats.iqr)
+        return result
+
+
+def summarize(values: List[float], confidence: float = 0.95) -> Stats:
+    """
+    Returns the median, quartiles and confidence interval of the median of
+    measures. The confidence interval is distribution-free, from the order
+    statistics of the measures.
+
+    :param values: the measures
+    :param confidence: the confidence level of the interval
+    :return: the summary
+    """
+    values = sorted(values)
+    n = len(values)
+    median = statistics.median(values)
+
+    if n < 2:
+        return Stats(median, median, median, median, median, n)
+
+    q1, _, q3 = statistics.quantiles(values, n=4, method="inclusive")
+
+    # Ranks of the bounds, from the normal approximation of Binomial(n, 1/2)
+    z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+    half_width = z * math.sqrt(n) / 2
+    low = max(int(math.floor(n / 2 - half_width)), 0)
+    high = min(int(math.ceil(n / 2 + half_width)), n - 1)
+
+    return Stats(median, q1, q3, values[low], values[high], n)
+
+
+def _timer(func: Callable, args: Tuple[Any, ...], kwargs: Mapping[str, Any]) -> Timer:
+    return Timer(
+        "func(*args, **kwargs)",
+        globals={"func": func, "args": args, "kwargs": dict(kwargs)},
+    )
+
+
+def _time_per_call(timer: Timer, round_time: float) -> float:
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= round_time / 10 or number >= 10 ** 9:
+            return elapsed / number
+        number *= 10
+
+
+def benchmark(
+    func: Callable,
+    configs: Mapping[str, Callable[[Callable], Callable]],
+    args: Tuple[Any, ...] = (),
+    kwargs: Optional[Mapping[str, Any]] = None,
+    repeat: int = 30,
+    number: Optional[int] = None,
+    warmup: int = 3,
+    round_time: float = 0.005,
+    confidence: float = 0.95,
+    seed: Optional[int] = 0,
+) -> Dict[str, Result]:
+    """
+    Measures the overhead of several configurations, each being a function
+    wrapping `func` (e.g. a decorator), over the plain function.
+
+    Exceptions raised by calls, e.g. by checks failing with an assertion
+    error, are part of the measures: use outputs which do not raise to
+    measure the cost of failures.
+
+    :param func: the function
+    :param configs: the configurations, by name
+    :param args: the positional arguments of the calls
+    :param kwargs: the keyword arguments of the calls
+    :param repeat: the number of measured rounds
+    :param number: the number of calls per function and per round, by default
+        chosen so that the slowest function takes about `round_time`
+    :param warmup: the number of rounds run before measuring
+    :param round_time: the time of the slowest function in a round, in
+        seconds, if `number` is not given
+    :param confidence: the confidence level of the intervals
+    :param seed: the seed of the order of functions in rounds
+    :return: the results, by name of configuration
+    """
+    if kwargs is None:
+        kwargs = dict()
+
+    timers = {None: _timer(func, args, kwargs)}
+    for name, config in configs.items():
+        timers[name] = _timer(config(func), args, kwargs)
+
+    if number is None:
+        per_call = max(_time_per_call(timer, round_time) for timer in timers.values())
+        number = max(1, int(round_time / max(per_call, 1e-12)))
+
+    order = list(timers)
+    rng = random.Random(seed)
+    times = {name: [] for name in timers}
+
+    for index in range(warmup + repeat):
+        rng.shuffle(order)
+        for name in order:
+            elapsed = timers[name].timeit(number)
+            if index >= warmup:
+                times[name].append(elapsed / number * 1e9)
+
+    baseline = times[None]
+    results = dict()
+    for name in configs:
+        config_times = times[name]
+        results[name] = Result(
+            name=name,
+            baseline_ns=summarize(baseline, confidence),
+            time_ns=summarize(config_times, confidence),
+            overhead_ns=summarize(
+                [t - b for t, b in zip(config_times, baseline)], confidence
+            ),
+            ratio=summarize(
+                [t / b for t, b in zip(config_times, baseline)], confidence
+            ),
+        )
+
+    return results
+
+
+def _format_stats(stats: Stats, precision: int) -> str:
+    return "%.*f [%.*f, %.*f] IQR %.*f" % (
+        precision,
+        stats.median,
+        precision,
+        stats.ci_low,
+        precision,
+        stats.ci_high,
+        precision,
+        stats.iqr,
+    )
+
+
+def format_results(results: Mapping[str, Result]) -> str:
+    """
+    Formats results as a table: the median, its confidence interval and the
+    interquartile range of the overhead and of the ratio of each
+    configuration.
+
+    :param results: the results, as returned by :func:`benchmark`
+    :return: the table
+    """
+    rows = [("config", "overhead (ns)", "ratio")]
+    for name, result in results.items():
+        rows.append(
+            (
+                name,
+                _format_stats(result.overhead_ns, 1),
+                _format_stats(result.ratio, 2),
+            )
+        )
+
+    widths = [max(len(row[i]) for row in rows) for i in range(2)]
+    return "\n".join(
+        "%-*s  %-*s  %s" % (widths[0], row[0], widths[1], row[1], row[2])
+        for row in rows
+    )
+
+
+def to_json(
+    results: Mapping[str, Result], path: Optional[str] = None, **metadata: Any
+) -> str:
+    """
+    Serializes results in JSON, with the description of the machine.
+
+    :param results: the results, as returned by :func:`benchmark`
+    :param path: if given, the file where the JSON is written
+    :param metadata: additional metadata, e.g. the name of the benchmark
+    :return: the JSON
+    """
+    data = {
+        "metadata": dict(
+            python=sys.version,
+            implementation=platform.python_implementation(),
+            platform=platform.platform(),
+            time=time.time(),
+            **metadata,
+        ),
+        "results": {name: result.to_dict() for name, result in results.items()},
+    }
+    text = json.dumps(data, indent=2)
+
+    if path is not None:
+        with open(path, "w") as f:
+            f.write(text)
+
+    return text
+
+
+class Comparison(NamedTuple):
+    """
+    Comparison of a measure between two runs of benchmarks.
+    """
+
+    name: str
+    baseline: float
+    current: float
+    change: float
+    regression: bool
+
+
+def compare(
+    baseline: Mapping[str, Any],
+    current: Mapping[str, Any],
+    threshold: float = 0.1,
+    key: str = "ratio",
+) -> List[Comparison]:
+    """
+    Compares the results of two runs of benchmarks, as serialized by
+    :func:`to_json`. A result is a regression if its median grew by more than
+    `threshold` and its confidence interval lies above the one of the
+    baseline, so that noisy measures are not reported.
+
+    :param baseline: the results of the reference run
+    :param current: the results of the new run
+    :param threshold: the relative change above which a result may be a
+        regression, e.g. 0.1 for 10%
+    :param key: the measure to compare, one of `"ratio"` (the default, which
+        is the least dependent on the machine), `"overhead_ns"` or
+        `"time_ns"`
+    :return: the comparisons of the results present in both runs, in the order
+        of the current run
+    """
+    old_results = baseline["results"]
+    comparisons = []
+
+    for name, result in current["results"].items():
+        if name not in old_results:
+            continue
+
+        old = old_results[name][key]
+        new = result[key]
+        if old["median"] > 0:
+            change = new["median"] / old["median"] - 1
+        else:
+            change = math.inf if new["median"] > old["median"] else 0.0
+
+        regression = change > threshold and new["ci_low"] > old["ci_high"]
+        comparisons.append(
+            Comparison(name, old["median"], new["median"], change, regression)
+        )
+
+    return comparisons
+
+
+def format_comparisons(comparisons: List[Comparison]) -> str:
+    """
+    Formats comparisons as a table, regressions being marked with a `!`.
+
+    :param comparisons: the comparisons, as returned by :func:`compare`
+    :return: the table
+    """
+    rows = [("", "name", "baseline", "current", "change")]
+    for comparison in comparisons:
+        rows.append(
+            (
+                "!" if comparison.regression else "",
+                comparison.name,
+                "%.2f" % comparison.baseline,
+                "%.2f" % comparison.current,
+                "%+.1f%%" % (100 * comparison.change),
+            )
+        )
+
+    widths = [max(len(row[i]) for row in rows) for i in range(5)]
+    return "\n".join(
+        "%-*s %-*s  %*s  %*s  %*s"
+        % (
+            widths[0],
+            row[0],
+            widths[1],
+            row[1],
+            widths[2],
+            row[2],
+            widths[3],
+            row[3],
+            widths[4],
+            row[4],
+        )
+        for row in rows
+    )
@@ -0,0 +1,138 @@
+"""
+Online control of the time spent in type checks.
+
+A :class:`OverheadController` keeps moving averages of the time spent in
+checks and of the time spent in the function itself, and moves between levels
+of checking so that their ratio stays under a budget: checks are as deep as
+they can afford to be, and are degraded when they are too expensive.
+
+:Example:
+
+>>> from strong.core.decorators import warn_if_incorrect_typing
+>>> @warn_if_incorrect_typing(budget=0.02)
+>>> def f(a: List[int]) -> int:
+>>>     return sum(a)
+>>> f.controller.level  # 0 (full checks) until checks cost more than 2%
+"""
+from typing import Optional, Sequence, Tuple
+
+from strong.core.signature import FULL, SHALLOW, Elements, sampled_elements
+
+LEVELS = (
+    (FULL, 1),
+    (sampled_elements(16), 1),
+    (SHALLOW, 1),
+    (SHALLOW, 16),
+    (SHALLOW, 256),
+)
+"""
+Default levels of checking, from the most to the least expensive, as pairs
+of the strategy for checking elements of containers and of the number of
+calls per checked call: full checks, sampled deep checks, shallow checks,
+then sampled shallow checks.
+"""
+
+
+class OverheadController:
+    """
+    Chooses the level of checking of a function, from measures of checked
+    calls.
+
+    After each window of `window` measures, the level is decreased if the
+    overhead, i.e. the time spent in checks over the time spent in the
+    function, exceeds the budget, or increased if it is under
+    `headroom * budget`. If checks exceed the budget again right after the
+    level was increased, the next increase waits twice as many measures.
+
+    :param budget: the maximum overhead, e.g. 0.02 for 2%
+    :param levels: the levels of checking, see :data:`LEVELS`
+    :param alpha: the smoothing factor of the moving averages
+    :param window: the number of measures between two decisions
+    :param headroom: the fraction of the budget under which the level is
+        increased
+    :param measure_every: the number of checked calls per measured call
+    :raises: ValueError: if the budget is not positive
+    """
+
+    def __init__(
+        self,
+        budget: float,
+        levels: Sequence[Tuple[Elements, int]] = LEVELS,
+        alpha: float = 0.2,
+        window: int = 16,
+        headroom: float = 0.25,
+        measure_every: int = 8,
+    ):
+        if not budget > 0:
+            raise ValueError("`budget` must be positive, not %r" % budget)
+
+        self.budget = budget
+        self.levels = tuple(levels)
+        self.alpha = alpha
+        self.window = window
+        self.headroom = headroom
+        self.measure_every = measure_every
+
+        self.level = 0
+        self.check_time = 0.0
+        self.func_time = 0.0
+        self.samples = 0
+        self.patience = window
+        self.probing = False
+
+    @property
+    def overhead(self) -> float:
+        """
+        The current estimate of the overhead of checks.
+        """
+        if self.func_time > 0:
+            return self.check_time / self.func_time
+        elif self.check_time > 0:
+            return float("inf")
+        else:
+            return 0.0
+
+    def update(self, check_time: float, func_time: float) -> Optional[int]:
+        """
+        Adds the measure of a checked call.
+
+        :param check_time: the time spent in checks, in seconds
+        :param func_time: the time spent in the function, in seconds
+        :return: the new level, or None if the level did not change
+        """
+        # Only one call every `calls` is checked at this level
+        check_time /= self.levels[self.level][1]
+
+        if self.samples == 0:
+            self.check_time = check_time
+            self.func_time = func_time
+        else:
+            self.check_time += self.alpha * (check_time - self.check_time)
+            self.func_time += self.alpha * (func_time - self.func_time)
+
+        self.samples += 1
+        if self.samples < self.window:
+            return None
+
+        overhead = self.overhead
+        probing = self.probing
+        self.probing = False
+
+        if overhead > self.budget and self.level < len(self.levels) - 1:
+            if probing:
+                self.patience = min(2 * self.patience, 1024 * self.window)
+            self.level += 1
+        elif (
+            overhead < self.headroom * self.budget
+            and self.level > 0
+            and self.samples >= self.patience
+        ):
+            self.probing = True
+            self.level -= 1
+        else:
+            if probing:
+                self.patience = self.window
+            return None
+
+        self.samples = 0
+        return self.level
@@ -0,0 +1,240 @@
+"""
+Value constraints, to be used as metadata of :class:`typing.Annotated` type
+annotations.
+
+Constraints are checked after the type itself. On NumPy arrays (or any
+object whose comparisons return arrays), they are evaluated with a single
+vectorized reduction instead of Python code per element.
+
+:Example:
+
+>>> from typing import Annotated
+>>> from strong.core.decorators import assert_correct_typing
+>>> from strong.core.constraints import Finite, Ge, Range
+>>> @assert_correct_typing
+>>> def f(a: Annotated[int, Range(0, 255)], b: Annotated[np.ndarray, Ge(0), Finite()]):
+>>>     pass
+>>> f(3, np.ones(3))  # O.K.
+>>> f(3, -np.ones(3))  # K.O.
+AssertionError: ...
+"""
+import math
+import sys
+from abc import ABC, abstractmethod
+from typing import Any, Callable
+
+
+def _all(result: Any) -> bool:
+    """
+    Reduces the result of a comparison, which is an array for arrays.
+    """
+    if result is True or result is False:
+        return result
+    elif hasattr(result, "all"):
+        return bool(result.all())
+    else:
+        return bool(result)
+
+
+def _is_array(x: Any) -> bool:
+    numpy = sys.modules.get("numpy")
+    return numpy is not None and isinstance(x, (numpy.ndarray, numpy.generic))
+
+
+class Constraint(ABC):
+    """
+    Base class of constraints on values.
+
+    With `every`, the constraint is only evaluated once every `every` checks
+    of the annotation, e.g. to bound the cost of reductions on large arrays.
+    Each parameter of a decorated function keeps its own counter (see
+    :func:`strong.core.signature.compile_parameter_typing`), which counts
+    calls for a parameter annotated with the constraint, and elements for
+    one nested in a container. Checkers returned by
+    :func:`strong.core.signature.compile_obj_typing` are cached, so their
+    counter is shared by every check of the same annotation.
+
+    :param every: if greater than 1, the constraint is only checked once
+        every `every` checks
+    """
+
+    def __init__(self, every: int = 1):
+        if every < 1:
+            raise ValueError("`every` must be a positive integer, not %r" % every)
+        self.every = every
+
+    @abstractmethod
+    def check(self, x: Any) -> bool:
+        """
+        Returns True if the value satisfies the constraint.
+
+        :param x: the value
+        :return: True if the value satisfies the constraint
+        """
+
+    def compile(self) -> Callable[[Any], bool]:
+        """
+        Returns a checker of the constraint, only checking one value every
+        `every` values.
+
+        :return: the checker
+        """
+        check = self.check
+        every = self.every
+
+        if every == 1:
+            return check
+
+        countdown = 0
+
+        def sampled_check(x: Any) -> bool:
+            nonlocal countdown
+            if countdown:
+                countdown -= 1
+                return True
+            countdown = every - 1
+            return check(x)
+
+        return sampled_check
+
+    def _args_repr(self) -> str:
+        return ""
+
+    def __repr__(self) -> str:
+        args = [self._args_repr()] if self._args_repr() else []
+        if self.every != 1:
+            args.append("every=%d" % self.every)
+        return "%s(%s)" % (type(self).__name__, ", ".join(args))
+
+
+class _Bound(Constraint):
+    def __init__(self, bound: Any, every: int = 1):
+        super().__init__(every=every)
+        self.bound = bound
+
+    def _args_repr(self) -> str:
+        return repr(self.bound)
+
+
+class Ge(_Bound):
+    """
+    Values must be greater than or equal to a bound.
+
+    :param bound: the bound
+    :param every: see :class:`Constraint`
+    """
+
+    def check(self, x: Any) -> bool:
+        try:
+            return _all(x >= self.bound)
+        except TypeError:
+            return False
+
+
+class Gt(_Bound):
+    """
+    Values must be strictly greater than a bound.
+
+    :param bound: the bound
+    :param every: see :class:`Constraint`
+    """
+
+    def check(self, x: Any) -> bool:
+        try:
+            return _all(x > self.bound)
+        except TypeError:
+            return False
+
+
+class Le(_Bound):
+    """
+    Values must be less than or equal to a bound.
+
+    :param bound: the bound
+    :param every: see :class:`Constraint`
+    """
+
+    def check(self, x: Any) -> bool:
+        try:
+            return _all(x <= self.bound)
+        except TypeError:
+            return False
+
+
+class Lt(_Bound):
+    """
+    Values must be strictly less than a bound.
+
+    :param bound: the bound
+    :param every: see :class:`Constraint`
+    """
+
+    def check(self, x: Any) -> bool:
+        try:
+            return _all(x < self.bound)
+        except TypeError:
+            return False
+
+
+class Range(Constraint):
+    """
+    Values must be between two bounds, both included.
+
+    :param low: the lower bound
+    :param high: the upper bound
+    :param every: see :class:`Constraint`
+    """
+
+    def __init__(self, low: Any, high: Any, every: int = 1):
+        super().__init__(every=every)
+        self.low = low
+        self.high = high
+
+    def check(self, x: Any) -> bool:
+        try:
+            if _is_array(x):
+                if x.size == 0:
+                    return True
+                # Reductions give the extrema, avoiding two boolean arrays
+                return bool(x.min() >= self.low) and bool(x.max() <= self.high)
+            return _all(x >= self.low) and _all(x <= self.high)
+        except (TypeError, ValueError):
+            return False
+
+    def _args_repr(self) -> str:
+        return "%r, %r" % (self.low, self.high)
+
+
+class Finite(Constraint):
+    """
+    Values must be finite, i.e. neither infinite nor NaN.
+
+    :param every: see :class:`Constraint`
+    """
+
+    def check(self, x: Any) -> bool:
+        try:
+            if _is_array(x):
+                return bool(sys.modules["numpy"].isfinite(x).all())
+            return math.isfinite(x)
+        except TypeError:
+            return False
+
+
+class Predicate(Constraint):
+    """
+    Values must satisfy a predicate.
+
+    :param func: the predicate, returning True for valid values
+    :param every: see :class:`Constraint`
+    """
+
+    def __init__(self, func: Callable[[Any], bool], every: int = 1):
+        super().__init__(every=every)
+        self.func = func
+
+    def check(self, x: Any) -> bool:
+        return _all(self.func(x))
+
+    def _args_repr(self) -> str:
+        return getattr(self.func, "__qualname__", repr(self.func))
@@ -1,56 +1,275 @@
 from strong.core.signature import (
-    get_function_parameters,
+    Elements,
+    FULL,
+    SHALLOW,
+    call_scope,
+    compile_parameter_typing,
     get_function_context,
-    output_if_args_incorrect_typing,
-    output_if_ret_incorrect_typing,
+    get_function_typing_plan,
+    get_item_wrong_typing_error_message,
+    get_message_with_context,
+    get_ret_wrong_typing_error_message,
+    get_yield_wrong_typing_error_message,
+    output_messages,
+    TypingPlan,
+)
+from strong.core.budget import OverheadController
+from strong.core.metrics import METRICS, FunctionMetrics, MetricsRegistry
+from strong.core.proxies import (
+    CheckedAsyncGenerator,
+    CheckedGenerator,
+    compile_stream_selector,
+    get_stream_types,
+    wrap_stream,
 )
 from strong.utils.output import (
     DEFAULT_OUTPUT,
     raise_assertion_error,
     raise_warning,
 )
-from typing import Callable, Any, Optional, Mapping
-from timeit import timeit, Timer
+from typing import Callable, Any, Iterator, Optional, Mapping, Tuple, Union
+from time import perf_counter
+import contextlib
+import contextvars
 import functools
+import inspect
+import math
+import os
+import random
+import threading
+import weakref
+import zlib
+
+
+def _is_enabled() -> bool:
+    value = os.environ.get("STRONG_DISABLE", "")
+    return value.strip().lower() in ("", "0", "false", "no", "off")
+
+
+ENABLED = _is_enabled()
+"""
+If False, the decorators return the functions themselves, without any
+wrapper. It is read from the `STRONG_DISABLE` environment variable when the
+module is imported (e.g. `STRONG_DISABLE=1`), and only affects functions
+decorated afterwards.
+"""
+
+_SUSPENDED_ = contextvars.ContextVar("strong_suspended", default=False)
+
+
+@contextlib.contextmanager
+def suspended() -> Iterator[None]:
+    """
+    Returns a context manager in which calls to the decorated functions are
+    not checked, in the current thread or task. Each call only costs the
+    reading of a context variable.
+
+    :Example:
+
+    >>> import strong
+    >>> with strong.suspended():
+    >>>     for x in data:
+    >>>         f(x)  # Not checked
+    """
+    token = _SUSPENDED_.set(True)
+    try:
+        yield
+    finally:
+        _SUSPENDED_.reset(token)
 
 
 def check_correct_typing(
     func: Optional[Callable] = None,
     join: bool = True,
     output: Callable = DEFAULT_OUTPUT,
+    elements: Elements = SHALLOW,
+    lazy: bool = False,
+    sample_every: int = 1,
+    sample_rate: Optional[float] = None,
+    seed: Optional[int] = None,
+    budget: Optional[float] = None,
+    yields: Elements = FULL,
+    iterators: Elements = SHALLOW,
+    metrics: Union[bool, MetricsRegistry] = False,
 ) -> Callable:
     """
     Wraps a function while outpouting error(s) if the arguments and
     output are incorrectly typed.
 
+    The signature is compiled once, when the function is wrapped or, in lazy
+    mode, when it is called for the first time (see
+    :func:`strong.core.signature.get_function_typing_plan`): a call only pays
+    for the checks of annotated parameters.
+
+    Calls can be sampled, so that only a fraction of them is checked: the
+    others only cost a counter decrement before calling the function.
+    Sampling is deterministic for a given seed, so failures are reproducible.
+
+    With an overhead budget, the depth of checks is chosen online by a
+    :class:`strong.core.budget.OverheadController`, available as the
+    `controller` attribute of the wrapped function: checks go from full to
+    sampled deep checks, shallow checks, then sampled calls while they cost
+    more than the budget, and back when there is headroom. The `elements`
+    and sampling options are then chosen by the controller.
+
+    Coroutine functions are checked when they are awaited, against their
+    awaited result. Generators and asynchronous generators whose return
+    annotation is a `Generator`, `Iterator` or `Iterable` (or their
+    asynchronous counterparts) are wrapped in proxies checking their items
+    as they are produced (see :mod:`strong.core.proxies`).
+
+    Optionally, iterators passed to parameters annotated with `Iterator`,
+    `Iterable` or `Generator`, or returned by the function with such an
+    annotation, are replaced with proxies checking their items as they are
+    consumed. Other iterables (e.g. lists) are passed as is.
+
+    If strong is disabled (see :data:`ENABLED`), the function is returned as
+    is. Checks can also be skipped in a block of code with :func:`suspended`.
+
+    Optionally, the calls checked and skipped, the failures and the time
+    spent in checks are recorded per function and per parameter (see
+    :mod:`strong.core.metrics`), and available as the `metrics` attribute of
+    the wrapped function.
+
     :param func: the function
     :param join: if True, will join all errors and raise them at once
     :param output: the desired output (see utils.output module)
+    :param elements: the strategy for checking elements of containers (see
+        :class:`strong.core.signature.Elements`)
+    :param lazy: if True, the signature is compiled on the first call instead
+        of when the function is wrapped (see :func:`warmup`)
+    :param sample_every: if greater than 1, only one call every
+        `sample_every` calls is checked
+    :param sample_rate: if given, the probability of a call being checked
+    :param seed: the seed of the sampling, which sets the first checked call
+        with `sample_every`; by default, it is computed from the function's
+        name
+    :param budget: if given, the maximum ratio between the time spent in
+        checks and the time spent in the function, e.g. 0.02 for 2%; not
+        supported for generators
+    :param yields: the strategy for choosing the items of generators which
+        are checked, e.g. :func:`strong.core.signature.sampled_elements` for
+        long streams, or `SHALLOW` to only check the generator itself
+    :param iterators: the strategy for choosing the items of iterator
+        arguments and return values which are checked; `SHALLOW` (default)
+        leaves them untouched
+    :param metrics: if True, records metrics of the calls in
+        :data:`strong.core.metrics.METRICS`; if a
+        :class:`strong.core.metrics.MetricsRegistry`, records them in it
     :return: the function wrapped
+    :raises: ValueError: if the sampling options or the budget are invalid
     """
+    _validate_sampling(sample_every, sample_rate)
+    if budget is not None and (sample_every != 1 or sample_rate is not None):
+        raise ValueError("sampling options cannot be combined with `budget`")
 
     def _check_correct_typing(func):
-        args_mapping, out_type = get_function_parameters(func)
-        context = get_function_context(func)
+        if not ENABLED:
+            return func
+        elif budget is not None and (
+            inspect.isgeneratorfunction(func) or inspect.isasyncgenfunction(func)
+        ):
+            raise ValueError("`budget` is not supported for generators")
 
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            output_if_args_incorrect_typing(
-                args_mapping,
-                args,
-                kwargs,
-                join=join,
-                output=output,
-                context=context,
-            )
+        lock = threading.Lock()
+        call = None
+        context = None
 
-            result = func(*args, **kwargs)
+        if not metrics:
+            function_metrics = None
+        else:
+            registry = METRICS if metrics is True else metrics
+            function_metrics = registry.function(func)
 
-            output_if_ret_incorrect_typing(
-                out_type, result, output=output, context=context
-            )
+        def get_context():
+            # Only needed to report errors
+            nonlocal context
+            if context is None:
+                context = get_function_context(func)
+            return context
 
-            return result
+        def build():
+            nonlocal call
+            with lock:
+                if call is None:
+                    if controller is not None:
+                        call = _compile_budgeted_call(
+                            func,
+                            join,
+                            output,
+                            get_context,
+                            controller,
+                            seed,
+                            yields,
+                            iterators,
+                            function_metrics,
+                        )
+                    else:
+                        plan = get_function_typing_plan(func, elements=elements)
+                        if function_metrics is not None:
+                            function_metrics.count_plan(plan)
+                        checked_call = _compile_call(
+                            func,
+                            plan,
+                            join,
+                            output,
+                            get_context,
+                            elements,
+                            yields,
+                            iterators,
+                            function_metrics,
+                        )
+                        call = _sample_calls(
+                            func,
+                            checked_call,
+                            sample_every,
+                            sample_rate,
+                            seed,
+                            function_metrics,
+                        )
+            _LAZY_WRAPPERS_.discard(wrapper)
+
+        is_suspended = _SUSPENDED_.get
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                if is_suspended():
+                    if function_metrics is not None:
+                        function_metrics.skipped += 1
+                    return await func(*args, **kwargs)
+                if call is None:
+                    build()
+                return await call(args, kwargs)
+
+        else:
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if is_suspended():
+                    if function_metrics is not None:
+                        function_metrics.skipped += 1
+                    return func(*args, **kwargs)
+                if call is None:
+                    build()
+                return call(args, kwargs)
+
+        wrapper.warmup = build
+        wrapper.__strong_checked__ = True
+        if function_metrics is not None:
+            wrapper.metrics = function_metrics
+
+        if budget is not None:
+            controller = OverheadController(budget)
+            wrapper.controller = controller
+        else:
+            controller = None
+
+        if lazy:
+            _LAZY_WRAPPERS_.add(wrapper)
+        else:
+            build()
 
         return wrapper
 
@@ -60,14 +279,513 @@ def check_correct_typing(
         return _check_correct_typing
 
 
+_LAZY_WRAPPERS_ = weakref.WeakSet()
+
+
+def warmup(*funcs: Callable) -> int:
+    """
+    Compiles the signatures of functions wrapped in lazy mode (see
+    :func:`check_correct_typing`), e.g. at the start of a service which
+    prefers to pay the cost up front.
+
+    :param funcs: the wrapped functions, or every function wrapped in lazy
+        mode and not called yet if none is given; functions which are not
+        wrapped (e.g. if strong is disabled) are skipped
+    :return: the number of functions warmed up
+    """
+    if not funcs:
+        funcs = list(_LAZY_WRAPPERS_)
+
+    count = 0
+    for func in funcs:
+        build = getattr(func, "warmup", None)
+        if build is not None:
+            build()
+            count += 1
+
+    return count
+
+
+def _validate_sampling(sample_every: int, sample_rate: Optional[float]) -> None:
+    if sample_every < 1:
+        raise ValueError(
+            "`sample_every` must be a positive integer, not %r" % sample_every
+        )
+    if sample_rate is not None:
+        if not 0 < sample_rate <= 1:
+            raise ValueError(
+                "`sample_rate` must be in the interval (0, 1], not %r" % sample_rate
+            )
+        if sample_every != 1:
+            raise ValueError("`sample_every` and `sample_rate` are exclusive")
+
+
+def _compile_gaps(
+    func: Callable,
+    sample_every: int,
+    sample_rate: Optional[float],
+    seed: Optional[int],
+) -> Tuple[int, Callable[[], int]]:
+    """
+    Returns the number of calls skipped before the first checked call, and a
+    function returning the number of calls skipped after each checked call.
+    """
+    if seed is None:
+        name = getattr(func, "__qualname__", None) or repr(func)
+        seed = zlib.crc32(("%s.%s" % (func.__module__, name)).encode())
+
+    if sample_rate is None:
+        gap = sample_every - 1
+        return seed % sample_every, lambda: gap
+    elif sample_rate == 1:
+        return 0, lambda: 0
+
+    # Gaps between Bernoulli trials follow a geometric distribution
+    rng = random.Random(seed)
+    log_q = math.log(1.0 - sample_rate)
+
+    def next_gap() -> int:
+        return int(math.log(1.0 - rng.random()) / log_q)
+
+    return next_gap(), next_gap
+
+
+def _sample_calls(
+    func: Callable,
+    checked_call: Callable[[Tuple[Any, ...], Mapping[str, Any]], Any],
+    sample_every: int,
+    sample_rate: Optional[float],
+    seed: Optional[int],
+    metrics: Optional[FunctionMetrics] = None,
+) -> Callable[[Tuple[Any, ...], Mapping[str, Any]], Any]:
+    """
+    Returns a function calling `checked_call` for sampled calls, and `func`
+    directly for the others, counted as skipped in `metrics` if given.
+    """
+    if sample_every == 1 and (sample_rate is None or sample_rate == 1):
+        return checked_call
+
+    countdown, next_gap = _compile_gaps(func, sample_every, sample_rate, seed)
+
+    if metrics is not None:
+
+        def sampled_call(args, kwargs):
+            nonlocal countdown
+            if countdown:
+                countdown -= 1
+                metrics.skipped += 1
+                return func(*args, **kwargs)
+            countdown = next_gap()
+            return checked_call(args, kwargs)
+
+        return sampled_call
+
+    def sampled_call(args, kwargs):
+        nonlocal countdown
+        if countdown:
+            countdown -= 1
+            return func(*args, **kwargs)
+        countdown = next_gap()
+        return checked_call(args, kwargs)
+
+    return sampled_call
+
+
+def _compile_stream_proxy(
+    func: Callable,
+    plan: TypingPlan,
+    report: Callable[[str], None],
+    elements: Elements,
+    yields: Elements,
+) -> Optional[Callable[[Any], Any]]:
+    """
+    Returns a function wrapping the generators returned by `func` in proxies
+    checking their items, or None if `func` is not a generator function with
+    a stream return annotation.
+    """
+    asynchronous = inspect.isasyncgenfunction(func)
+    if plan.ret_checker is None or yields.mode == "shallow":
+        return None
+    elif not (asynchronous or inspect.isgeneratorfunction(func)):
+        return None
+
+    types = get_stream_types(plan.ret_annotation, asynchronous=asynchronous)
+    if types is None:
+        return None
+
+    item_tp, return_tp = types
+    item_checker = compile_parameter_typing(item_tp, elements)
+
+    def check_item(item):
+        if not item_checker(item):
+            report(get_yield_wrong_typing_error_message(item_tp, item))
+
+    if return_tp is None:
+        check_return = None
+    else:
+        return_checker = compile_parameter_typing(return_tp, elements)
+
+        def check_return(value):
+            if not return_checker(value):
+                report(get_ret_wrong_typing_error_message(return_tp, value))
+
+    select = compile_stream_selector(yields)
+    proxy = CheckedAsyncGenerator if asynchronous else CheckedGenerator
+    return lambda stream: proxy(stream, check_item, check_return, select)
+
+
+def _compile_iterator_proxies(
+    func: Callable,
+    plan: TypingPlan,
+    report: Callable[[str], None],
+    elements: Elements,
+    iterators: Elements,
+) -> Tuple[
+    Optional[Callable[[Tuple[Any, ...], Mapping[str, Any]], Tuple[Any, Any]]],
+    Optional[Callable[[Any], Any]],
+]:
+    """
+    Returns a function replacing the iterator arguments of a call with
+    proxies checking their items, and a function doing the same with the
+    return value, each being None if there is nothing to replace.
+    """
+    select = compile_stream_selector(iterators)
+
+    def compile_wrap(name, annotation, container_checker):
+        types = get_stream_types(annotation)
+        if types is None:
+            return None
+
+        item_tp, return_tp = types
+        item_checker = compile_parameter_typing(item_tp, elements)
+
+        def check_item(item):
+            if not item_checker(item):
+                report(get_item_wrong_typing_error_message(name, item_tp, item))
+
+        def wrap(value):
+            # Values of the wrong type are reported by the plan itself
+            if not container_checker(value):
+                return value
+            return wrap_stream(value, check_item, None, select)
+
+        return wrap
+
+    positional = []
+    for index, param, checker in plan.positional:
+        wrap = compile_wrap(param.name, param.annotation, checker)
+        if wrap is not None:
+            positional.append((index, wrap))
+
+    keywords = []
+    for name, (param, checker) in plan.keywords.items():
+        wrap = compile_wrap(param.name, param.annotation, checker)
+        if wrap is not None:
+            keywords.append((name, wrap))
+
+    if positional or keywords:
+
+        def wrap_args(args, kwargs):
+            n_args = len(args)
+            if positional and positional[0][0] < n_args:
+                args = list(args)
+                for index, wrap in positional:
+                    if index < n_args:
+                        args[index] = wrap(args[index])
+            for name, wrap in keywords:
+                if name in kwargs:
+                    kwargs[name] = wrap(kwargs[name])
+            return args, kwargs
+
+    else:
+        wrap_args = None
+
+    wrap_ret = None
+    if plan.ret_checker is not None and not (
+        inspect.isgeneratorfunction(func) or inspect.isasyncgenfunction(func)
+    ):
+        wrap_ret = compile_wrap("return value", plan.ret_annotation, plan.ret_checker)
+
+    return wrap_args, wrap_ret
+
+
+def _compile_call(
+    func: Callable,
+    plan: TypingPlan,
+    join: bool,
+    output: Callable,
+    get_context: Callable[[], str],
+    elements: Elements = SHALLOW,
+    yields: Elements = FULL,
+    iterators: Elements = SHALLOW,
+    metrics: Optional[FunctionMetrics] = None,
+) -> Callable[[Tuple[Any, ...], Mapping[str, Any]], Any]:
+    """
+    Returns a function calling `func` with a tuple of positional arguments and
+    a mapping of keyword arguments, while outputting errors if they or the
+    return value do not match the typing plan.
+
+    For coroutine functions, the returned function is a coroutine function
+    checking the awaited result. For generator functions, the generators are
+    wrapped in proxies checking their items. Unless `iterators` is `SHALLOW`,
+    iterator arguments and return values are wrapped as well. If `metrics` is
+    given, checked calls and failures are counted in it.
+    """
+    check_args = plan.check_args
+    check_ret = plan.check_ret if plan.ret_checker is not None else None
+    if metrics is not None:
+        check_args, check_ret = metrics.count_calls(check_args, check_ret)
+
+    def report(msg):
+        output(get_message_with_context(msg, get_context()))
+
+    if iterators.mode != "shallow":
+        wrap_args, wrap_ret = _compile_iterator_proxies(
+            func, plan, report, elements, iterators
+        )
+        if wrap_args is not None or wrap_ret is not None:
+            checked_call = _compile_call(
+                func, plan, join, output, get_context, elements, yields, metrics=metrics
+            )
+            return _wrap_iterators(
+                checked_call, wrap_args, wrap_ret, inspect.iscoroutinefunction(func)
+            )
+
+    wrap_stream = _compile_stream_proxy(func, plan, report, elements, yields)
+
+    if inspect.iscoroutinefunction(func):
+
+        async def checked_call(args, kwargs):
+            failed = check_args(args, kwargs)
+            if failed:
+                output_messages(failed, join=join, output=output, context=get_context())
+
+            result = await func(*args, **kwargs)
+
+            if check_ret is not None:
+                ret_msg = check_ret(result)
+                if ret_msg is not None:
+                    report(ret_msg)
+
+            return result
+
+        if plan.scoped:
+
+            async def scoped_call(args, kwargs):
+                with call_scope():
+                    return await checked_call(args, kwargs)
+
+            return scoped_call
+
+        return checked_call
+
+    elif wrap_stream is not None:
+
+        def checked_call(args, kwargs):
+            failed = check_args(args, kwargs)
+            if failed:
+                output_messages(failed, join=join, output=output, context=get_context())
+
+            return wrap_stream(func(*args, **kwargs))
+
+    else:
+
+        def checked_call(args, kwargs):
+            failed = check_args(args, kwargs)
+            if failed:
+                output_messages(failed, join=join, output=output, context=get_context())
+
+            result = func(*args, **kwargs)
+
+            if check_ret is not None:
+                ret_msg = check_ret(result)
+                if ret_msg is not None:
+                    report(ret_msg)
+
+            return result
+
+    if plan.scoped:
+
+        def scoped_call(args, kwargs):
+            with call_scope():
+                return checked_call(args, kwargs)
+
+        return scoped_call
+
+    return checked_call
+
+
+def _wrap_iterators(
+    checked_call: Callable[[Tuple[Any, ...], Mapping[str, Any]], Any],
+    wrap_args: Optional[
+        Callable[[Tuple[Any, ...], Mapping[str, Any]], Tuple[Any, Any]]
+    ],
+    wrap_ret: Optional[Callable[[Any], Any]],
+    coroutine: bool,
+) -> Callable[[Tuple[Any, ...], Mapping[str, Any]], Any]:
+    if wrap_args is None:
+
+        def wrap_args(args, kwargs):
+            return args, kwargs
+
+    if wrap_ret is None:
+
+        def wrap_ret(result):
+            return result
+
+    if coroutine:
+
+        async def wrapped_call(args, kwargs):
+            args, kwargs = wrap_args(args, kwargs)
+            return wrap_ret(await checked_call(args, kwargs))
+
+    else:
+
+        def wrapped_call(args, kwargs):
+            args, kwargs = wrap_args(args, kwargs)
+            return wrap_ret(checked_call(args, kwargs))
+
+    return wrapped_call
+
+
+def _compile_budgeted_call(
+    func: Callable,
+    join: bool,
+    output: Callable,
+    get_context: Callable[[], str],
+    controller: OverheadController,
+    seed: Optional[int],
+    yields: Elements = FULL,
+    iterators: Elements = SHALLOW,
+    metrics: Optional[FunctionMetrics] = None,
+) -> Callable[[Tuple[Any, ...], Mapping[str, Any]], Any]:
+    """
+    Returns a function calling `func` with the level of checking chosen by
+    the controller, and measuring some of the checked calls. The plan of each
+    level is only compiled when the level is used for the first time.
+    """
+    timings = threading.local()
+
+    def measure(start, func_time):
+        total_time = perf_counter() - start
+        new_level = controller.update(total_time - func_time, func_time)
+        if new_level is not None:
+            set_level(new_level)
+
+    if inspect.iscoroutinefunction(func):
+
+        async def timed_func(*args, **kwargs):
+            start = perf_counter()
+            result = await func(*args, **kwargs)
+            timings.func_time = perf_counter() - start
+            return result
+
+    else:
+
+        def timed_func(*args, **kwargs):
+            start = perf_counter()
+            result = func(*args, **kwargs)
+            timings.func_time = perf_counter() - start
+            return result
+
+    def compile_level(level):
+        elements, calls = controller.levels[level]
+        plan = get_function_typing_plan(func, elements=elements)
+        if metrics is not None:
+            metrics.count_plan(plan)
+        checked_call = _compile_call(
+            func, plan, join, output, get_context, elements, yields, iterators, metrics
+        )
+        timed_call = _compile_call(
+            timed_func,
+            plan,
+            join,
+            output,
+            get_context,
+            elements,
+            yields,
+            iterators,
+            metrics,
+        )
+        countdown = 0
+
+        if inspect.iscoroutinefunction(func):
+
+            async def measured_call(args, kwargs):
+                nonlocal countdown
+                if countdown:
+                    countdown -= 1
+                    return await checked_call(args, kwargs)
+                countdown = controller.measure_every - 1
+
+                start = perf_counter()
+                result = await timed_call(args, kwargs)
+                measure(start, timings.func_time)
+                return result
+
+        else:
+
+            def measured_call(args, kwargs):
+                nonlocal countdown
+                if countdown:
+                    countdown -= 1
+                    return checked_call(args, kwargs)
+                countdown = controller.measure_every - 1
+
+                start = perf_counter()
+                result = timed_call(args, kwargs)
+                measure(start, timings.func_time)
+                return result
+
+        return _sample_calls(func, measured_call, calls, None, seed, metrics)
+
+    level_calls = dict()
+    current = None
+
+    def set_level(level):
+        nonlocal current
+        if level not in level_calls:
+            level_calls[level] = compile_level(level)
+        current = level_calls[level]
+
+    set_level(controller.level)
+
+    def budgeted_call(args, kwargs):
+        return current(args, kwargs)
+
+    return budgeted_call
+
+
 def assert_correct_typing(
-    func: Optional[Callable] = None, join: bool = True
+    func: Optional[Callable] = None,
+    join: bool = True,
+    elements: Elements = SHALLOW,
+    lazy: bool = False,
+    sample_every: int = 1,
+    sample_rate: Optional[float] = None,
+    seed: Optional[int] = None,
+    budget: Optional[float] = None,
+    yields: Elements = FULL,
+    iterators: Elements = SHALLOW,
+    metrics: Union[bool, MetricsRegistry] = False,
 ) -> Callable:
     """
     Applies :func:`check_correct_typing` with assertion error as output.
 
     :param func: the function
     :param join: if True, will join all errors and raise them at once
+    :param elements: the strategy for checking elements of containers
+    :param lazy: if True, the signature is compiled on the first call
+    :param sample_every: if greater than 1, only one call every
+        `sample_every` calls is checked
+    :param sample_rate: if given, the probability of a call being checked
+    :param seed: the seed of the sampling
+    :param budget: if given, the maximum overhead of checks
+    :param yields: the strategy for choosing the items of generators which
+        are checked
+    :param iterators: the strategy for choosing the items of iterator
+        arguments and return values which are checked
+    :param metrics: if True, or a registry, records metrics of the calls
     :return: the function wrapped
 
     :Example:
@@ -82,34 +800,87 @@ def assert_correct_typing(
         Argument `b` does not match typing: '2' is not an instance of
         <class 'int'>
     """
-    return check_correct_typing(func=func, join=join, output=raise_assertion_error)
+    return check_correct_typing(
+        func=func,
+        join=join,
+        output=raise_assertion_error,
+        elements=elements,
+        lazy=lazy,
+        sample_every=sample_every,
+        sample_rate=sample_rate,
+        seed=seed,
+        budget=budget,
+        yields=yields,
+        iterators=iterators,
+        metrics=metrics,
+    )
 
 
 def warn_if_incorrect_typing(
-    func: Optional[Callable] = None, join: bool = True
+    func: Optional[Callable] = None,
+    join: bool = True,
+    elements: Elements = SHALLOW,
+    lazy: bool = False,
+    sample_every: int = 1,
+    sample_rate: Optional[float] = None,
+    seed: Optional[int] = None,
+    budget: Optional[float] = None,
+    yields: Elements = FULL,
+    iterators: Elements = SHALLOW,
+    metrics: Union[bool, MetricsRegistry] = False,
 ) -> Callable:
     """
     Applies :func:`check_correct_typing` with warning as output.
 
     :param func: the function
     :param join: if True, will join all errors and raise them at once
+    :param elements: the strategy for checking elements of containers
+    :param lazy: if True, the signature is compiled on the first call
+    :param sample_every: if greater than 1, only one call every
+        `sample_every` calls is checked
+    :param sample_rate: if given, the probability of a call being checked
+    :param seed: the seed of the sampling
+    :param budget: if given, the maximum overhead of checks
+    :param yields: the strategy for choosing the items of generators which
+        are checked
+    :param iterators: the strategy for choosing the items of iterator
+        arguments and return values which are checked
+    :param metrics: if True, or a registry, records metrics of the calls
     :return: the function wrapped
     """
-    return check_correct_typing(func=func, join=join, output=raise_warning)
+    return check_correct_typing(
+        func=func,
+        join=join,
+        output=raise_warning,
+        elements=elements,
+        lazy=lazy,
+        sample_every=sample_every,
+        sample_rate=sample_rate,
+        seed=seed,
+        budget=budget,
+        yields=yields,
+        iterators=iterators,
+        metrics=metrics,
+    )
 
 
 def measure_overhead(
     func: Optional[Callable] = None,
     decorator: Optional[Callable] = None,
     dec_kwargs: Optional[Mapping[str, Any]] = None,
+    repeat: int = 10,
 ) -> Callable:
     """
     Returns the overhead time ratio between a function call with
     @decorator and without.
 
+    The ratio is the median over interleaved rounds, see
+    :func:`strong.bench.benchmark` for the full statistics.
+
     :param func: the function
     :param decorator: the decorator which will be measured
     :param dec_kwargs: optional keyword-arguments to be passed to the decorator
+    :param repeat: the number of measured rounds
     :return: a function computing the overhead time ratio, i.e. time
         (with dec.) / time (without dec.)
 
@@ -127,6 +898,9 @@ def measure_overhead(
     1.0687804670719938  # Ratio between time taken with
                         # @assert_correct_typing and without
     """
+    # Only imported when measuring, so that importing strong stays cheap
+    from strong.bench import benchmark
+
     if dec_kwargs is None:
         dec_kwargs = dict()
 
@@ -136,13 +910,12 @@ def measure_overhead(
 
     def _measure_overhead(func):
 
-        wrapped = decorator(func=func, **dec_kwargs)
+        configs = {"decorator": lambda func: decorator(func=func, **dec_kwargs)}
 
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            n, t_std = Timer(lambda: func(*args, **kwargs)).autorange()
-            t_wrp = timeit(lambda: wrapped(*args, **kwargs), number=n)
-            return t_wrp / t_std
+            results = benchmark(func, configs, args, kwargs, repeat=repeat)
+            return results["decorator"].ratio.median
 
         return wrapper
 
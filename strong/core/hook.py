@@ -0,0 +1,527 @@
+"""
+Import hook rewriting the functions of chosen packages so that their type
+checks are inlined in their body, instead of being run by a wrapper.
+
+Once :func:`install_import_hook` is called, the modules of the given packages
+which are imported afterwards are rewritten: the arguments of every annotated
+function are checked at the top of its body, and its return value before each
+`return`, with `isinstance` calls. Annotations which are plain classes (or
+unions of classes, containers checked shallowly, ...) are checked with the
+classes themselves, so a check does not even add a frame; other annotations
+are checked through a class whose metaclass calls the compiled checker (see
+:func:`strong.core.signature.compile_obj_typing`). Annotations are resolved
+in the global namespace of the module the first time they are checked, and
+those which cannot be resolved, e.g. names only imported under
+`if TYPE_CHECKING:`, are not checked, with a warning.
+
+Rewritten bytecode is cached next to the regular one, in a `.pyc` file with
+the `opt-strong<version>` tag (`opt-strong<version>o<level>` under `-O` and
+`-OO`), so modules are only rewritten again when their source changes.
+
+Generators, functions already decorated by strong and functions without
+annotations are left untouched. Checks are not affected by
+:func:`strong.core.decorators.suspended`, errors are output one by one, and
+symbolic dimensions of arrays are not shared between arguments.
+
+:Example:
+
+>>> import strong
+>>> strong.install_import_hook(["mypkg"])
+>>> import mypkg.domain  # Rewritten
+"""
+import ast
+import importlib.abc
+import importlib.machinery
+import importlib.util
+import inspect
+import marshal
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from strong.core import decorators
+from strong.core.signature import (
+    SHALLOW,
+    Elements,
+    compile_parameter_typing,
+    get_arg_wrong_typing_error_message,
+    get_message_with_context,
+    get_ret_wrong_typing_error_message,
+    resolve_annotation_or_any,
+)
+from strong.utils.output import DEFAULT_OUTPUT
+
+REWRITE_VERSION = 1
+"""
+Version of the rewriting, part of the tag of the cached bytecode.
+"""
+
+# Asserts and docstrings are stripped under -O/-OO, which must not share a cache
+_OPTIMIZATION_ = "strong%d" % REWRITE_VERSION + (
+    "o%d" % sys.flags.optimize if sys.flags.optimize else ""
+)
+_DECORATORS_ = {
+    "assert_correct_typing",
+    "check_correct_typing",
+    "warn_if_incorrect_typing",
+}
+
+
+class _CheckerMeta(type):
+    def __instancecheck__(cls, obj: Any) -> bool:
+        return cls.check(obj)
+
+
+class _LazyTypeMeta(type):
+    def __instancecheck__(cls, obj: Any) -> bool:
+        return isinstance(obj, cls.resolve())
+
+
+def _checker_type(checker: Callable[[Any], bool], annotation: str) -> Any:
+    """
+    Returns a class, or a tuple of classes, whose `isinstance` checks give
+    the same results as a checker.
+    """
+    classes = getattr(checker, "classes", None)
+    if classes is not None:
+        return classes
+    return _CheckerMeta(annotation, (), {"check": staticmethod(checker)})
+
+
+def define_types(namespace: Dict[str, Any], types: Iterable[Tuple[str, str]]) -> None:
+    """
+    Defines, in the global namespace of a rewritten module, the classes used
+    in its inlined checks. Each class resolves its annotation the first time
+    it is used, and replaces itself in the namespace with the class actually
+    checking the annotation, or accepting anything if the annotation cannot
+    be resolved (see :func:`strong.core.signature.resolve_annotation_or_any`).
+
+    :param namespace: the global namespace of the module
+    :param types: the names of the classes and the source of their
+        annotation
+    """
+
+    def lazy_type(name, annotation):
+        def resolve():
+            hook = namespace.get("__strong_settings__")
+            elements = hook.elements if hook is not None else SHALLOW
+            tp = resolve_annotation_or_any(annotation, namespace)
+            resolved = _checker_type(compile_parameter_typing(tp, elements), annotation)
+            namespace[name] = resolved
+            return resolved
+
+        return _LazyTypeMeta(annotation, (), {"resolve": staticmethod(resolve)})
+
+    for name, annotation in types:
+        namespace[name] = lazy_type(name, annotation)
+
+
+def fail_arg(hook: Any, context: str, name: str, arg: Any, annotation: str) -> None:
+    """
+    Outputs the error of an argument of a rewritten function.
+    """
+    kind = inspect.Parameter.POSITIONAL_OR_KEYWORD
+    param = inspect.Parameter(name.split("[")[0], kind, annotation=annotation)
+    msg = get_arg_wrong_typing_error_message(param, arg, name)
+    _output(hook, get_message_with_context(msg, context))
+
+
+def fail_ret(hook: Any, context: str, ret: Any, annotation: str) -> None:
+    """
+    Outputs the error of the return value of a rewritten function.
+    """
+    msg = get_ret_wrong_typing_error_message(annotation, ret)
+    _output(hook, get_message_with_context(msg, context))
+
+
+def _output(hook: Any, msg: str) -> None:
+    output = hook.output if hook is not None else DEFAULT_OUTPUT
+    output(msg)
+
+
+def _locate(nodes: List[ast.AST], node: ast.AST) -> List[ast.AST]:
+    """
+    Gives the location of a node to new nodes.
+    """
+    for new_node in nodes:
+        for child in ast.walk(new_node):
+            for attr in ("lineno", "col_offset", "end_lineno", "end_col_offset"):
+                if attr in child._attributes:
+                    setattr(child, attr, getattr(node, attr, None) or 0)
+    return nodes
+
+
+def _parse(source: str, node: ast.AST) -> List[ast.stmt]:
+    return _locate(ast.parse(source).body, node)
+
+
+class _ScopeVisitor(ast.NodeVisitor):
+    """
+    Visits the nodes of a function, without entering nested scopes.
+    """
+
+    def visit_FunctionDef(self, node: ast.AST) -> Any:
+        return node
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+    visit_ClassDef = visit_FunctionDef
+    visit_Lambda = visit_FunctionDef
+
+
+class _YieldFinder(_ScopeVisitor):
+    def __init__(self):
+        self.found = False
+
+    def visit_Yield(self, node: ast.AST) -> None:
+        self.found = True
+
+    visit_YieldFrom = visit_Yield
+
+
+class _ReturnRewriter(_ScopeVisitor, ast.NodeTransformer):
+    def __init__(self, check: Callable[[ast.Return], List[ast.stmt]]):
+        self.check = check
+
+    def visit_Return(self, node: ast.Return) -> List[ast.stmt]:
+        return self.check(node)
+
+
+class _Rewriter(ast.NodeTransformer):
+    """
+    Inlines the type checks of every annotated function of a module.
+    """
+
+    def __init__(self, source: str, filename: str):
+        self.source = source
+        self.filename = filename
+        self.types = []
+        self.scope = []
+
+    def type_name(self, annotation: ast.expr) -> Tuple[str, str]:
+        segment = ast.get_source_segment(self.source, annotation)
+        if segment is None:
+            segment = ast.unparse(annotation)
+        elif "\n" in segment:
+            segment = "(%s)" % segment
+        name = "__strong_T_%d__" % len(self.types)
+        self.types.append((name, segment))
+        return name, segment
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> ast.ClassDef:
+        self.scope.append(node.name)
+        self.generic_visit(node)
+        self.scope.pop()
+        return node
+
+    def visit_FunctionDef(self, node: ast.AST) -> ast.AST:
+        self.scope.extend((node.name, "<locals>"))
+        self.generic_visit(node)
+        del self.scope[-2:]
+        return self.rewrite(node)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def rewrite(self, node: ast.AST) -> ast.AST:
+        for decorator in node.decorator_list:
+            if isinstance(decorator, ast.Call):
+                decorator = decorator.func
+            name = getattr(decorator, "id", getattr(decorator, "attr", None))
+            if name in _DECORATORS_:
+                return node
+
+        finder = _YieldFinder()
+        for stmt in node.body:
+            finder.visit(stmt)
+        if finder.found:
+            return node
+
+        lineno = node.decorator_list[0].lineno if node.decorator_list else node.lineno
+        context = "%s:%d:%s" % (
+            self.filename,
+            lineno,
+            ".".join(self.scope + [node.name]),
+        )
+        checks = []
+        args = node.args
+
+        for arg in args.posonlyargs + args.args + args.kwonlyargs:
+            if arg.annotation is not None:
+                tp, annotation = self.type_name(arg.annotation)
+                checks.extend(
+                    _parse(
+                        "if not isinstance(%s, %s):\n"
+                        "    __strong_hook__.fail_arg("
+                        "__strong_settings__, %r, %r, %s, %r)"
+                        % (arg.arg, tp, context, arg.arg, arg.arg, annotation),
+                        node,
+                    )
+                )
+
+        if args.vararg is not None and args.vararg.annotation is not None:
+            tp, annotation = self.type_name(args.vararg.annotation)
+            name = args.vararg.arg
+            checks.extend(
+                _parse(
+                    "for __strong_index__, __strong_arg__ in enumerate(%s):\n"
+                    "    if not isinstance(__strong_arg__, %s):\n"
+                    "        __strong_hook__.fail_arg(__strong_settings__, %r, "
+                    "'%s[%%d]' %% __strong_index__, __strong_arg__, %r)"
+                    % (name, tp, context, name, annotation),
+                    node,
+                )
+            )
+
+        if args.kwarg is not None and args.kwarg.annotation is not None:
+            tp, annotation = self.type_name(args.kwarg.annotation)
+            name = args.kwarg.arg
+            checks.extend(
+                _parse(
+                    "for __strong_key__, __strong_arg__ in %s.items():\n"
+                    "    if not isinstance(__strong_arg__, %s):\n"
+                    "        __strong_hook__.fail_arg(__strong_settings__, %r, "
+                    "'%s[%%r]' %% __strong_key__, __strong_arg__, %r)"
+                    % (name, tp, context, name, annotation),
+                    node,
+                )
+            )
+
+        body = node.body
+        if node.returns is not None:
+            tp, annotation = self.type_name(node.returns)
+            template = (
+                "if not isinstance(__strong_ret__, %s):\n"
+                "    __strong_hook__.fail_ret("
+                "__strong_settings__, %r, __strong_ret__, %r)"
+                % (tp, context, annotation)
+            )
+
+            def check_return(ret):
+                value = ret.value
+                if value is None:
+                    value = _locate([ast.Constant(None)], ret)[0]
+                assign = ast.Assign(
+                    targets=[ast.Name("__strong_ret__", ast.Store())], value=value
+                )
+                new_ret = ast.Return(ast.Name("__strong_ret__", ast.Load()))
+                _locate([assign.targets[0], new_ret, new_ret.value], ret)
+                ast.copy_location(assign, ret)
+                return [assign] + _parse(template, ret) + [new_ret]
+
+            rewriter = _ReturnRewriter(check_return)
+            body = [rewriter.visit(stmt) for stmt in body]
+            body = [
+                new_stmt
+                for stmt in body
+                for new_stmt in (stmt if isinstance(stmt, list) else [stmt])
+            ]
+
+            if not isinstance(body[-1], (ast.Return, ast.Raise)):
+                # Falling off the end of the function returns None
+                end = ast.Return(None)
+                ast.copy_location(end, body[-1])
+                body.extend(check_return(end)[:-1])
+
+        if not checks and body is node.body:
+            return node
+
+        # The docstring must stay the first statement
+        if (
+            body
+            and isinstance(body[0], ast.Expr)
+            and isinstance(body[0].value, ast.Constant)
+            and isinstance(body[0].value.value, str)
+        ):
+            node.body = body[:1] + checks + body[1:]
+        else:
+            node.body = checks + body
+
+        return node
+
+
+def rewrite_module(tree: ast.Module, source: str, filename: str) -> ast.Module:
+    """
+    Inlines the type checks of every annotated function of a module.
+
+    :param tree: the syntax tree of the module
+    :param source: the source of the module
+    :param filename: the file of the module
+    :return: the rewritten syntax tree
+    """
+    rewriter = _Rewriter(source, filename)
+    tree = rewriter.visit(tree)
+
+    if not rewriter.types:
+        return tree
+
+    header = _parse(
+        "import strong.core.hook as __strong_hook__\n"
+        "__strong_hook__.define_types(globals(), %r)" % (tuple(rewriter.types),),
+        tree.body[0] if tree.body else ast.Pass(lineno=1, col_offset=0),
+    )
+
+    # After the docstring and the __future__ imports
+    index = 0
+    for index, stmt in enumerate(tree.body):
+        if isinstance(stmt, ast.ImportFrom) and stmt.module == "__future__":
+            continue
+        elif (
+            index == 0
+            and isinstance(stmt, ast.Expr)
+            and isinstance(stmt.value, ast.Constant)
+            and isinstance(stmt.value.value, str)
+        ):
+            continue
+        break
+    else:
+        index = len(tree.body)
+
+    tree.body[index:index] = header
+    return tree
+
+
+class StrongLoader(importlib.machinery.SourceFileLoader):
+    """
+    Loader of the modules rewritten by an :class:`ImportHook`, caching their
+    bytecode apart from the regular one.
+
+    :param fullname: the name of the module
+    :param path: the path of its source file
+    :param hook: the import hook
+    """
+
+    def __init__(self, fullname: str, path: str, hook: "ImportHook"):
+        super().__init__(fullname, path)
+        self.hook = hook
+
+    def source_to_code(self, data: bytes, path: str, *, _optimize: int = -1) -> Any:
+        source = importlib.util.decode_source(data)
+        tree = rewrite_module(ast.parse(source, filename=path), source, path)
+        return compile(tree, path, "exec", dont_inherit=True, optimize=_optimize)
+
+    def get_code(self, fullname: str) -> Any:
+        source_path = self.get_filename(fullname)
+        try:
+            cache_path = importlib.util.cache_from_source(
+                source_path, optimization=_OPTIMIZATION_
+            )
+        except NotImplementedError:
+            cache_path = None
+
+        stats = self.path_stats(source_path)
+        header = (
+            importlib.util.MAGIC_NUMBER
+            + (0).to_bytes(4, "little")
+            + (int(stats["mtime"]) & 0xFFFFFFFF).to_bytes(4, "little")
+            + (stats["size"] & 0xFFFFFFFF).to_bytes(4, "little")
+        )
+
+        if cache_path is not None:
+            try:
+                data = self.get_data(cache_path)
+            except OSError:
+                pass
+            else:
+                if data[:16] == header:
+                    try:
+                        return marshal.loads(data[16:])
+                    except (EOFError, ValueError, TypeError):
+                        pass
+
+        code = self.source_to_code(self.get_data(source_path), source_path)
+
+        if cache_path is not None and not sys.dont_write_bytecode:
+            try:
+                self.set_data(cache_path, header + marshal.dumps(code))
+            except (OSError, NotImplementedError):
+                pass
+
+        return code
+
+    def exec_module(self, module: Any) -> None:
+        module.__strong_settings__ = self.hook
+        super().exec_module(module)
+
+
+class ImportHook(importlib.abc.MetaPathFinder):
+    """
+    Finder of the modules of some packages, loading them with
+    :class:`StrongLoader`.
+
+    :param packages: the names of the packages
+    :param output: the desired output (see utils.output module)
+    :param elements: the strategy for checking elements of containers
+    """
+
+    def __init__(
+        self,
+        packages: Iterable[str],
+        output: Callable = DEFAULT_OUTPUT,
+        elements: Elements = SHALLOW,
+    ):
+        self.packages = tuple(packages)
+        self.output = output
+        self.elements = elements
+
+    def matches(self, fullname: str) -> bool:
+        """
+        Returns True if a module belongs to one of the packages.
+
+        :param fullname: the name of the module
+        :return: True if the module is rewritten
+        """
+        return any(
+            fullname == package or fullname.startswith(package + ".")
+            for package in self.packages
+        )
+
+    def find_spec(
+        self, fullname: str, path: Optional[Any] = None, target: Optional[Any] = None
+    ) -> Optional[importlib.machinery.ModuleSpec]:
+        if not self.matches(fullname):
+            return None
+
+        spec = importlib.machinery.PathFinder.find_spec(fullname, path)
+        if spec is None or not isinstance(
+            spec.loader, importlib.machinery.SourceFileLoader
+        ):
+            return spec
+
+        spec.loader = StrongLoader(fullname, spec.origin, self)
+        return spec
+
+
+def install_import_hook(
+    packages: Iterable[str],
+    output: Callable = DEFAULT_OUTPUT,
+    elements: Elements = SHALLOW,
+) -> Optional[ImportHook]:
+    """
+    Installs an import hook rewriting the modules of some packages, imported
+    afterwards, so that the type checks of their functions are inlined. Does
+    nothing if strong is disabled (see
+    :data:`strong.core.decorators.ENABLED`).
+
+    :param packages: the names of the packages, e.g. `["mypkg"]`
+    :param output: the desired output (see utils.output module)
+    :param elements: the strategy for checking elements of containers
+    :return: the hook, or None if strong is disabled
+    """
+    if not decorators.ENABLED:
+        return None
+
+    hook = ImportHook(packages, output=output, elements=elements)
+    sys.meta_path.insert(0, hook)
+    return hook
+
+
+def uninstall_import_hook(hook: Optional[ImportHook] = None) -> None:
+    """
+    Uninstalls an import hook, or all of them. Modules which were already
+    imported stay rewritten.
+
+    :param hook: the hook, or None to uninstall all of them
+    """
+    sys.meta_path[:] = [
+        finder
+        for finder in sys.meta_path
+        if not (finder is hook or (hook is None and isinstance(finder, ImportHook)))
+    ]
@@ -0,0 +1,152 @@
+"""
+Instrumentation of whole classes and modules: every annotated function,
+method, classmethod and staticmethod they define is wrapped with
+:func:`strong.core.decorators.check_correct_typing`, in a single walk.
+
+Functions are wrapped in lazy mode by default, so instrumenting a module only
+costs the creation of the wrappers: the signature of a function is compiled
+on its first call (or by :func:`strong.core.decorators.warmup`), and
+annotations shared by several functions are compiled once, in the cache of
+:func:`strong.core.signature.compile_obj_typing`. Parameters without
+annotation, such as `self` and `cls`, are not checked.
+
+:Example:
+
+>>> import strong
+>>> import mypackage.domain
+>>> strong.instrument_module(mypackage.domain)
+<module 'mypackage.domain' ...>
+>>> @strong.instrument_class
+>>> class Point:
+>>>     def __init__(self, x: float, y: float):
+>>>         ...
+"""
+import inspect
+import types
+from typing import Any, Callable, Iterator, Optional, Tuple, TypeVar, Union
+
+from strong.core.decorators import check_correct_typing
+
+T = TypeVar("T", type, types.ModuleType)
+
+
+def iter_functions(
+    obj: Union[type, types.ModuleType], depth: int = 1
+) -> Iterator[Tuple[Any, str, Any, Callable]]:
+    """
+    Yields the functions defined in a module or a class, and in the classes
+    they define, down to a given depth. Members imported from other modules
+    are skipped.
+
+    :param obj: the module or the class
+    :param depth: the depth of nested classes to walk through
+    :return: an iterator of `(owner, name, member, function)` tuples, where
+        `member` is the attribute of `owner`, i.e. the function itself, or
+        the classmethod or staticmethod object wrapping it
+    """
+    if isinstance(obj, types.ModuleType):
+        module_name = obj.__name__
+    else:
+        module_name = obj.__module__
+
+    visited = set()
+
+    def walk(owner, depth):
+        visited.add(id(owner))
+
+        for name, member in list(vars(owner).items()):
+            if isinstance(member, (classmethod, staticmethod)):
+                function = member.__func__
+            else:
+                function = member
+
+            if inspect.isfunction(function):
+                if function.__module__ == module_name:
+                    yield owner, name, member, function
+            elif (
+                inspect.isclass(member)
+                and depth > 0
+                and member.__module__ == module_name
+                and id(member) not in visited
+            ):
+                yield from walk(member, depth - 1)
+
+    return walk(obj, depth)
+
+
+def is_instrumented(f: Callable) -> bool:
+    """
+    Returns True if a function is already wrapped by strong's decorators.
+
+    :param f: the function
+    :return: True if the function is wrapped
+    """
+    return getattr(f, "__strong_checked__", False)
+
+
+def _instrument(
+    obj: T, depth: int, decorator: Optional[Callable], kwargs: dict
+) -> T:
+    if decorator is None:
+        kwargs.setdefault("lazy", True)
+        decorator = check_correct_typing(**kwargs)
+
+    for owner, name, member, function in iter_functions(obj, depth=depth):
+        if not function.__annotations__ or is_instrumented(function):
+            continue
+
+        wrapper = decorator(function)
+        if isinstance(member, (classmethod, staticmethod)):
+            wrapper = type(member)(wrapper)
+        setattr(owner, name, wrapper)
+
+    return obj
+
+
+def instrument_class(
+    cls: Optional[type] = None,
+    depth: int = 1,
+    decorator: Optional[Callable] = None,
+    **kwargs: Any,
+) -> Union[type, Callable[[type], type]]:
+    """
+    Wraps every annotated function, method, classmethod and staticmethod
+    defined in a class, and in the classes it defines. Functions which are
+    already wrapped are left untouched. Can be used as a class decorator.
+
+    :param cls: the class
+    :param depth: the depth of nested classes to instrument
+    :param decorator: the decorator to apply, by default
+        :func:`strong.core.decorators.check_correct_typing` with `kwargs`
+    :param kwargs: keyword arguments of
+        :func:`strong.core.decorators.check_correct_typing`, `lazy` being
+        True by default
+    :return: the class
+    """
+    if cls is None:
+        return lambda cls: _instrument(cls, depth, decorator, kwargs)
+    return _instrument(cls, depth, decorator, kwargs)
+
+
+def instrument_module(
+    module: types.ModuleType,
+    depth: int = 1,
+    decorator: Optional[Callable] = None,
+    **kwargs: Any,
+) -> types.ModuleType:
+    """
+    Wraps every annotated function defined in a module, as well as the
+    methods, classmethods and staticmethods of the classes it defines.
+    Functions which are already wrapped are left untouched, and so are
+    members imported from other modules.
+
+    :param module: the module
+    :param depth: the depth of nested classes to instrument
+    :param decorator: the decorator to apply, by default
+        :func:`strong.core.decorators.check_correct_typing` with `kwargs`
+    :param kwargs: keyword arguments of
+        :func:`strong.core.decorators.check_correct_typing`, `lazy` being
+        True by default
+    :return: the module
+    """
+    return _instrument(module, depth, decorator, kwargs)
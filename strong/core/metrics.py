@@ -0,0 +1,400 @@
+"""
+Runtime metrics of decorated functions: how many calls are checked or
+skipped, how many values fail their checks, and, optionally, how much time
+is spent in checks, per function and per parameter.
+
+Metrics are opt-in: functions decorated with `metrics=True` (see
+:func:`strong.core.decorators.check_correct_typing`) record them in the
+default registry, :data:`METRICS`, and functions decorated with
+`metrics=registry` in the given :class:`MetricsRegistry`. Counters are plain
+integers incremented without locks, so counts may be slightly off when
+several threads call the same function without the GIL. Timing, with
+:func:`time.perf_counter_ns`, is only enabled with `timing=True`.
+
+Snapshots are plain dictionaries, which can be sent from worker processes
+and added up with :func:`merge`, then exported with :func:`to_prometheus`.
+
+:Example:
+
+>>> from strong.core.decorators import warn_if_incorrect_typing
+>>> from strong.core.metrics import METRICS
+>>> @warn_if_incorrect_typing(metrics=True)
+>>> def f(a: int, b: List[int]) -> int:
+>>>     return a
+>>> f(1, [2])
+>>> METRICS.snapshot()["mymodule.f"]["params"]["b"]
+{'checked': 1, 'failures': 0, 'check_time_ns': 0}
+>>> print(METRICS.to_prometheus())
+# HELP strong_calls_checked_total Calls whose types were checked.
+# TYPE strong_calls_checked_total counter
+strong_calls_checked_total{function="mymodule.f"} 1
+...
+"""
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from strong.core.signature import TypingPlan
+
+Snapshot = Dict[str, Dict[str, Any]]
+
+RETURN = "return"
+"""
+Name of the return value in the metrics of parameters.
+"""
+
+
+class ParameterMetrics:
+    """
+    Counters of the checks of a parameter, or of the return value.
+    """
+
+    __slots__ = ("checked", "failures", "check_time_ns")
+
+    def __init__(self):
+        self.checked = 0
+        self.failures = 0
+        self.check_time_ns = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        """
+        Returns the counters as a dictionary.
+
+        :return: the dictionary
+        """
+        return {
+            "checked": self.checked,
+            "failures": self.failures,
+            "check_time_ns": self.check_time_ns,
+        }
+
+
+class FunctionMetrics:
+    """
+    Counters of the calls of a decorated function, and of its parameters.
+
+    :param timing: if True, the time spent in checks is measured
+    """
+
+    __slots__ = ("checked", "skipped", "failures", "check_time_ns", "params", "timing")
+
+    def __init__(self, timing: bool = False):
+        self.checked = 0
+        self.skipped = 0
+        self.failures = 0
+        self.check_time_ns = 0
+        self.params = dict()
+        self.timing = timing
+
+    def param(self, name: str) -> ParameterMetrics:
+        """
+        Returns the counters of a parameter, created on first use.
+
+        :param name: the name of the parameter, or :data:`RETURN`
+        :return: the counters
+        """
+        metrics = self.params.get(name)
+        if metrics is None:
+            metrics = self.params[name] = ParameterMetrics()
+        return metrics
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the counters as a dictionary.
+
+        :return: the dictionary
+        """
+        return {
+            "checked": self.checked,
+            "skipped": self.skipped,
+            "failures": self.failures,
+            "check_time_ns": self.check_time_ns,
+            "params": {name: p.to_dict() for name, p in self.params.items()},
+        }
+
+    def count_checker(
+        self, name: str, checker: Callable[[Any], bool]
+    ) -> Callable[[Any], bool]:
+        """
+        Returns a checker counting the checks of a parameter and their
+        failures.
+
+        :param name: the name of the parameter, or :data:`RETURN`
+        :param checker: the checker
+        :return: the counting checker
+        """
+        param = self.param(name)
+
+        if self.timing:
+
+            def counted(x):
+                start = perf_counter_ns()
+                ok = checker(x)
+                param.check_time_ns += perf_counter_ns() - start
+                param.checked += 1
+                if not ok:
+                    param.failures += 1
+                return ok
+
+        else:
+
+            def counted(x):
+                param.checked += 1
+                if checker(x):
+                    return True
+                param.failures += 1
+                return False
+
+        return counted
+
+    def count_calls(
+        self,
+        check_args: Callable[[Tuple[Any, ...], Mapping[str, Any]], Optional[List[str]]],
+        check_ret: Optional[Callable[[Any], Optional[str]]],
+    ) -> Tuple[
+        Callable[[Tuple[Any, ...], Mapping[str, Any]], Optional[List[str]]],
+        Optional[Callable[[Any], Optional[str]]],
+    ]:
+        """
+        Returns checks of the arguments and of the return value of calls (see
+        :class:`strong.core.signature.TypingPlan`) counting checked calls and
+        failures.
+
+        :param check_args: the check of the arguments
+        :param check_ret: the check of the return value, or None
+        :return: the counting checks
+        """
+        timing = self.timing
+
+        def counted_args(args, kwargs):
+            self.checked += 1
+            if timing:
+                start = perf_counter_ns()
+                failed = check_args(args, kwargs)
+                self.check_time_ns += perf_counter_ns() - start
+            else:
+                failed = check_args(args, kwargs)
+            if failed:
+                self.failures += len(failed)
+            return failed
+
+        if check_ret is None:
+            return counted_args, None
+
+        def counted_ret(ret):
+            if timing:
+                start = perf_counter_ns()
+                msg = check_ret(ret)
+                self.check_time_ns += perf_counter_ns() - start
+            else:
+                msg = check_ret(ret)
+            if msg is not None:
+                self.failures += 1
+            return msg
+
+        return counted_args, counted_ret
+
+    def count_plan(self, plan: TypingPlan) -> TypingPlan:
+        """
+        Replaces the checkers of a typing plan (see
+        :class:`strong.core.signature.TypingPlan`) with checkers counting the
+        checks of each parameter. Each item of `*args` and `**kwargs` is a
+        check of the parameter.
+
+        :param plan: the typing plan
+        :return: the plan
+        """
+        counted = dict()
+
+        def count(param, checker):
+            if param.name not in counted:
+                counted[param.name] = self.count_checker(param.name, checker)
+            return counted[param.name]
+
+        plan.positional = tuple(
+            (index, param, count(param, checker))
+            for index, param, checker in plan.positional
+        )
+        if plan.var_positional is not None:
+            index, param, checker = plan.var_positional
+            plan.var_positional = (index, param, count(param, checker))
+        plan.keywords = {
+            name: (param, count(param, checker))
+            for name, (param, checker) in plan.keywords.items()
+        }
+        if plan.var_keyword is not None:
+            param, checker = plan.var_keyword
+            plan.var_keyword = (param, count(param, checker))
+        if plan.ret_checker is not None:
+            plan.ret_checker = self.count_checker(RETURN, plan.ret_checker)
+
+        return plan
+
+
+class MetricsRegistry:
+    """
+    Metrics of decorated functions, by qualified name.
+
+    :param timing: if True, the time spent in checks by the functions
+        decorated afterwards is measured
+    """
+
+    def __init__(self, timing: bool = False):
+        self.timing = timing
+        self.functions = dict()
+
+    def function(self, func: Callable) -> FunctionMetrics:
+        """
+        Returns the metrics of a function, created on first use. Functions
+        with the same qualified name share their metrics.
+
+        :param func: the function
+        :return: the metrics
+        """
+        name = get_function_name(func)
+        metrics = self.functions.get(name)
+        if metrics is None:
+            metrics = self.functions[name] = FunctionMetrics(timing=self.timing)
+        return metrics
+
+    def snapshot(self) -> Snapshot:
+        """
+        Returns a copy of the metrics, as dictionaries.
+
+        :return: the metrics, by qualified name of function
+        """
+        return {
+            name: metrics.to_dict() for name, metrics in list(self.functions.items())
+        }
+
+    def reset(self) -> None:
+        """
+        Forgets the metrics of every function. Functions decorated before keep
+        recording in their former metrics, which are not part of the registry
+        anymore.
+        """
+        self.functions = dict()
+
+    def to_prometheus(self, prefix: str = "strong") -> str:
+        """
+        Returns the metrics in the Prometheus text exposition format.
+
+        :param prefix: the prefix of the names of metrics
+        :return: the metrics
+        """
+        return to_prometheus(self.snapshot(), prefix=prefix)
+
+
+METRICS = MetricsRegistry()
+"""
+The default registry, of functions decorated with `metrics=True`.
+"""
+
+
+def get_function_name(func: Callable) -> str:
+    """
+    Returns the qualified name of a function, by which its metrics are
+    recorded.
+
+    :param func: the function
+    :return: the name, e.g. `"mymodule.MyClass.method"`
+    """
+    name = getattr(func, "__qualname__", None) or getattr(func, "__name__", repr(func))
+    module = getattr(func, "__module__", None)
+    if module:
+        return "%s.%s" % (module, name)
+    return name
+
+
+def merge(*snapshots: Snapshot) -> Snapshot:
+    """
+    Adds up snapshots, e.g. of several worker processes.
+
+    :param snapshots: the snapshots (see :meth:`MetricsRegistry.snapshot`)
+    :return: the merged snapshot
+    """
+    merged = dict()
+
+    for snapshot in snapshots:
+        for name, metrics in snapshot.items():
+            total = merged.get(name)
+            if total is None:
+                total = merged[name] = {
+                    "checked": 0,
+                    "skipped": 0,
+                    "failures": 0,
+                    "check_time_ns": 0,
+                    "params": dict(),
+                }
+            for key in ("checked", "skipped", "failures", "check_time_ns"):
+                total[key] += metrics.get(key, 0)
+
+            for param, counters in metrics.get("params", {}).items():
+                param_total = total["params"].setdefault(
+                    param, {"checked": 0, "failures": 0, "check_time_ns": 0}
+                )
+                for key in ("checked", "failures", "check_time_ns"):
+                    param_total[key] += counters.get(key, 0)
+
+    return merged
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _value(counters: Mapping[str, int], key: str) -> str:
+    if key == "check_time_ns":
+        return repr(counters[key] / 1e9)
+    return repr(counters[key])
+
+
+_FUNCTION_METRICS_ = (
+    ("calls_checked_total", "checked", "Calls whose types were checked."),
+    ("calls_skipped_total", "skipped", "Calls which were not checked."),
+    ("failures_total", "failures", "Values which did not match their type."),
+    ("check_seconds_total", "check_time_ns", "Time spent in checks."),
+)
+_PARAMETER_METRICS_ = (
+    ("parameter_checks_total", "checked", "Checks of a parameter."),
+    ("parameter_failures_total", "failures", "Failed checks of a parameter."),
+    (
+        "parameter_check_seconds_total",
+        "check_time_ns",
+        "Time spent in the checks of a parameter.",
+    ),
+)
+
+
+def to_prometheus(snapshot: Snapshot, prefix: str = "strong") -> str:
+    """
+    Returns metrics in the Prometheus text exposition format, as counters
+    labelled by `function` and, for parameters, by `parameter`.
+
+    :param snapshot: the metrics (see :meth:`MetricsRegistry.snapshot` and
+        :func:`merge`)
+    :param prefix: the prefix of the names of metrics
+    :return: the metrics
+    """
+    lines = []
+
+    for suffix, key, doc in _FUNCTION_METRICS_:
+        metric = "%s_%s" % (prefix, suffix)
+        lines.append("# HELP %s %s" % (metric, doc))
+        lines.append("# TYPE %s counter" % metric)
+        for name, metrics in snapshot.items():
+            lines.append(
+                '%s{function="%s"} %s' % (metric, _escape(name), _value(metrics, key))
+            )
+
+    for suffix, key, doc in _PARAMETER_METRICS_:
+        metric = "%s_%s" % (prefix, suffix)
+        lines.append("# HELP %s %s" % (metric, doc))
+        lines.append("# TYPE %s counter" % metric)
+        for name, metrics in snapshot.items():
+            for param, counters in metrics["params"].items():
+                lines.append(
+                    '%s{function="%s",parameter="%s"} %s'
+                    % (metric, _escape(name), _escape(param), _value(counters, key))
+                )
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,284 @@
+"""
+Optional integration of NumPy arrays.
+
+Importing this module registers :class:`NDArray` annotations, as well as the
+`numpy.typing.NDArray` ones, with :func:`strong.core.signature.tag`.
+Arrays are only checked with their metadata (dtype, shape and flags), so the
+cost of a check does not depend on the number of elements.
+"""
+import numpy as np
+from typing import Any, Callable, Optional, Tuple
+
+from strong.core.signature import (
+    SHALLOW,
+    Elements,
+    compiles,
+    get_call_scope,
+    tag,
+    _by_type,
+)
+
+try:
+    from types import GenericAlias
+except ImportError:  # Python 3.8
+    from typing import _GenericAlias as GenericAlias
+
+
+_BUILTIN_KINDS_ = {
+    bool: "b",
+    int: "iu",
+    float: "f",
+    complex: "c",
+    str: "U",
+    bytes: "S",
+    object: "O",
+}
+_ABSTRACT_SCALARS_ = (
+    np.generic,
+    np.number,
+    np.integer,
+    np.signedinteger,
+    np.unsignedinteger,
+    np.inexact,
+    np.floating,
+    np.complexfloating,
+    np.flexible,
+    np.character,
+)
+_ORDER_FLAGS_ = {"C": "C_CONTIGUOUS", "F": "F_CONTIGUOUS"}
+
+
+class _Name:
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __eq__(self, other: Any) -> bool:
+        return type(other) is type(self) and other.name == self.name
+
+    def __hash__(self) -> int:
+        return hash((type(self), self.name))
+
+    def __repr__(self) -> str:
+        return "%s(%r)" % (type(self).__name__, self.name)
+
+
+class Dim(_Name):
+    """
+    Symbolic dimension of :class:`NDArray` shapes: `Dim("n")` is the same as
+    `"n"`, but is not mistaken for a forward reference, e.g. by linters.
+
+    :param name: the name of the dimension
+    """
+
+    __slots__ = ()
+
+
+class _Order(_Name):
+    __slots__ = ()
+
+
+class NDArray:
+    """
+    Annotation for NumPy arrays: `NDArray[dtype, shape, order]`, where each
+    parameter is optional.
+
+    * `dtype` can be Any, a Python type (`float` stands for any floating
+      dtype), a NumPy scalar type (`np.float32` is exact, `np.floating` is
+      any of its subtypes), a dtype, or anything else understood by
+      `np.dtype`, e.g. `"float32"` or `"i8"` (`"b"` is int8, `"?"` bool);
+    * `shape` is a tuple of dimensions: an integer is a fixed size, a string
+      (or a :class:`Dim`) is a symbolic size which must be the same everywhere
+      it appears in the annotations of a function, None or Any is any size
+      and at most one Ellipsis stands for any number of dimensions. An
+      integer alone is the number of dimensions;
+    * `order` is "C" or "F" for C- or Fortran-contiguous arrays.
+
+    :Example:
+
+    >>> from strong.core.decorators import assert_correct_typing
+    >>> from strong.core.ndarray import NDArray
+    >>> @assert_correct_typing
+    >>> def dot(
+    >>>     a: NDArray[float, ("m", "n")], b: NDArray[float, ("n",)]
+    >>> ) -> NDArray[float, ("m",)]:
+    >>>     return a @ b
+    >>> dot(np.ones((2, 3)), np.ones(3))  # O.K.
+    >>> dot(np.ones((2, 3)), np.ones(2))  # K.O.
+    AssertionError: ...
+        Argument `b` does not match typing: ...
+    """
+
+    def __class_getitem__(cls, params: Any) -> GenericAlias:
+        if not isinstance(params, tuple):
+            params = (params,)
+        params = [
+            tuple(param) if isinstance(param, list) else param for param in params
+        ]
+
+        # Strings would be evaluated as forward references by get_type_hints
+        if params and isinstance(params[0], str):
+            params[0] = np.dtype(params[0])
+        if len(params) > 1 and isinstance(params[1], tuple):
+            params[1] = tuple(
+                Dim(dim) if isinstance(dim, str) else dim for dim in params[1]
+            )
+        if len(params) > 2 and isinstance(params[2], str):
+            params[2] = _Order(params[2])
+
+        return GenericAlias(cls, tuple(params))
+
+
+def _compile_dtype_checker(dtype: Any) -> Optional[Callable[[np.dtype], bool]]:
+    """
+    Returns a function checking an array's dtype, or None if any dtype is
+    accepted.
+    """
+    if dtype is Any or dtype is None:
+        return None
+    elif isinstance(dtype, np.dtype):
+        return lambda x: x == dtype
+    elif dtype in _BUILTIN_KINDS_:
+        kinds = _BUILTIN_KINDS_[dtype]
+        return lambda x: x.kind in kinds
+    elif dtype in _ABSTRACT_SCALARS_:
+        verdicts = dict()
+
+        def check(x: np.dtype) -> bool:
+            verdict = verdicts.get(x)
+            if verdict is None:
+                verdict = verdicts[x] = np.issubdtype(x, dtype)
+            return verdict
+
+        return check
+    else:
+        expected = np.dtype(dtype)
+        return lambda x: x == expected
+
+
+def _parse_shape(
+    shape: Any,
+) -> Tuple[Optional[Tuple[Any, ...]], Optional[Tuple[Any, ...]]]:
+    """
+    Returns the dimensions before and after the Ellipsis, if any, with None
+    for dimensions of any size.
+    """
+    if shape is Any or shape is None:
+        return None, None
+    elif isinstance(shape, int):
+        return (None,) * shape, None
+
+    dims = tuple(
+        None if dim is Any else dim.name if isinstance(dim, Dim) else dim
+        for dim in shape
+    )
+    for dim in dims:
+        if not (dim is None or dim is Ellipsis or isinstance(dim, (int, str))):
+            raise TypeError("Invalid dimension in NDArray shape: %r" % (dim,))
+
+    if dims.count(Ellipsis) > 1:
+        raise TypeError("NDArray shape can contain at most one Ellipsis")
+    elif Ellipsis in dims:
+        index = dims.index(Ellipsis)
+        return dims[:index], dims[index + 1 :]
+    else:
+        return dims, None
+
+
+def _compile_ndarray(
+    dtype: Any = Any, shape: Any = Any, order: Optional[str] = None
+) -> Callable[[Any], bool]:
+    if isinstance(order, _Order):
+        order = order.name
+    dtype_checker = _compile_dtype_checker(dtype)
+    head, tail = _parse_shape(shape)
+    flag = _ORDER_FLAGS_.get(order) if order is not None else None
+
+    if order is not None and order not in _ORDER_FLAGS_:
+        raise TypeError("NDArray order must be 'C' or 'F', not %r" % (order,))
+
+    if head is None:
+        dims = ()
+        ndim = None
+    elif tail is None:
+        dims = tuple(enumerate(head))
+        ndim = len(head)
+    else:
+        dims = tuple(enumerate(head)) + tuple(
+            (index - len(tail), dim) for index, dim in enumerate(tail)
+        )
+        ndim = None
+        min_ndim = len(head) + len(tail)
+
+    fixed = tuple((index, dim) for index, dim in dims if isinstance(dim, int))
+    symbolic = tuple((index, dim) for index, dim in dims if isinstance(dim, str))
+
+    def check(x: Any) -> bool:
+        if not isinstance(x, np.ndarray):
+            return False
+        if dtype_checker is not None and not dtype_checker(x.dtype):
+            return False
+        if flag is not None and not x.flags[flag]:
+            return False
+
+        shape = x.shape
+        if ndim is not None:
+            if len(shape) != ndim:
+                return False
+        elif tail is not None and len(shape) < min_ndim:
+            return False
+
+        for index, size in fixed:
+            if shape[index] != size:
+                return False
+
+        if symbolic:
+            bindings = get_call_scope()
+            if bindings is None:
+                bindings = dict()
+            new_bindings = dict()
+
+            for index, name in symbolic:
+                size = bindings.get(name, new_bindings.get(name))
+                if size is None:
+                    new_bindings[name] = shape[index]
+                elif size != shape[index]:
+                    return False
+
+            # Sizes are only bound once the whole array matches
+            bindings.update(new_bindings)
+
+        return True
+
+    _by_type(check, False)
+    check.scoped = bool(symbolic)
+    return check
+
+
+@tag(NDArray)
+def _ndarray_(x: Any, *args: type) -> bool:
+    return _compile_ndarray(*args)(x)
+
+
+@compiles(NDArray)
+def _compile_ndarray_(origin: type, elements: Elements, *args: type) -> Callable:
+    return _compile_ndarray(*args)
+
+
+@tag(np.ndarray)
+def _np_ndarray_(x: Any, *args: type) -> bool:
+    return _compile_np_ndarray_(np.ndarray, SHALLOW, *args)(x)
+
+
+@compiles(np.ndarray)
+def _compile_np_ndarray_(origin: type, elements: Elements, *args: type) -> Callable:
+    # numpy.typing.NDArray[T] is np.ndarray[Any, np.dtype[T]]
+    dtype = Any
+    if len(args) == 2:
+        dtype_args = getattr(args[1], "__args__", ())
+        if dtype_args:
+            dtype = dtype_args[0]
+            if dtype in (Any, np.generic):
+                dtype = Any
+    return _compile_ndarray(dtype)
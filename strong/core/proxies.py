@@ -0,0 +1,219 @@
+"""
+Proxies of generators and asynchronous generators, checking the items they
+produce one at a time, as they are consumed. Streams are never materialized
+nor buffered, so infinite generators can be checked as well.
+
+Which items are checked is chosen with an elements strategy (see
+:class:`strong.core.signature.Elements`): every item with `FULL`, the first
+`k` ones with :func:`strong.core.signature.first_elements`, or, with
+:func:`strong.core.signature.sampled_elements`, the first `k` ones and then
+the `i`-th one with probability `k / (i + 1)`, so that the number of checks
+only grows logarithmically with the length of the stream. Each proxy counts
+its own items, and forwards other attributes (e.g. `readline` of files or
+`gi_frame` of generators) to the stream.
+"""
+import random
+from collections import abc
+from typing import Any, Callable, Optional, Tuple, get_args, get_origin
+
+from strong.core.signature import Elements
+
+_SYNC_STREAMS_ = (abc.Generator, abc.Iterator, abc.Iterable)
+_ASYNC_STREAMS_ = (abc.AsyncGenerator, abc.AsyncIterator, abc.AsyncIterable)
+
+
+def get_stream_types(
+    annotation: Any, asynchronous: bool = False
+) -> Optional[Tuple[Any, Any]]:
+    """
+    Returns the type of the items produced by a generator, and the type of
+    its return value, from the return annotation of its function.
+
+    :param annotation: the return annotation, e.g. `Iterator[int]`
+    :param asynchronous: if True, the function is an asynchronous generator
+    :return: the types of the items and of the return value (None if it is
+        not annotated), or None if the annotation is not the one of a stream
+    """
+    origin = get_origin(annotation)
+    if origin is None:
+        origin = annotation
+
+    if origin not in (_ASYNC_STREAMS_ if asynchronous else _SYNC_STREAMS_):
+        return None
+
+    args = get_args(annotation)
+    item_tp = args[0] if args else Any
+    if origin is abc.Generator and len(args) == 3:
+        return item_tp, args[2]
+    return item_tp, None
+
+
+def wrap_stream(
+    stream: Any,
+    check_item: Callable[[Any], None],
+    check_return: Optional[Callable[[Any], None]] = None,
+    select: Optional[Callable[[int], bool]] = None,
+) -> Any:
+    """
+    Returns a proxy of an iterator, generator or asynchronous generator,
+    checking its items, or the object itself if it is none of them (e.g.
+    collections, which can be iterated several times, are left untouched).
+
+    :param stream: the object
+    :param check_item: called with each selected item, outputs the errors
+    :param check_return: if given, called with the return value of
+        generators
+    :param select: the selector of the items to check (see
+        :func:`compile_stream_selector`)
+    :return: the proxy, or the object
+    """
+    if isinstance(stream, abc.Generator):
+        return CheckedGenerator(stream, check_item, check_return, select)
+    elif isinstance(stream, abc.Iterator):
+        return CheckedIterator(stream, check_item, None, select)
+    elif isinstance(stream, abc.AsyncGenerator):
+        return CheckedAsyncGenerator(stream, check_item, None, select)
+    else:
+        return stream
+
+
+def compile_stream_selector(elements: Elements) -> Optional[Callable[[int], bool]]:
+    """
+    Returns a function telling, from its index, whether an item of a stream
+    is checked, or None if every item is.
+
+    :param elements: the strategy
+    :return: the selector
+    """
+    if elements.mode == "full":
+        return None
+    elif elements.mode == "shallow":
+        return lambda index: False
+
+    k = elements.k
+    if elements.mode == "first":
+        return lambda index: index < k
+
+    rng = random.Random(elements.seed)
+
+    def select(index: int) -> bool:
+        return index < k or rng.random() * (index + 1) < k
+
+    return select
+
+
+class _CheckedStream:
+    __slots__ = ("_stream", "_check_item", "_check_return", "_select", "_index")
+
+    def __init__(
+        self,
+        stream: Any,
+        check_item: Callable[[Any], None],
+        check_return: Optional[Callable[[Any], None]] = None,
+        select: Optional[Callable[[int], bool]] = None,
+    ):
+        self._stream = stream
+        self._check_item = check_item
+        self._check_return = check_return
+        self._select = select
+        self._index = 0
+
+    def _check(self, item: Any) -> Any:
+        select = self._select
+        if select is not None:
+            index = self._index
+            self._index = index + 1
+            if not select(index):
+                return item
+        self._check_item(item)
+        return item
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes the proxy lacks, e.g. readline or gi_frame
+        if name in _CheckedStream.__slots__:
+            raise AttributeError(name)
+        return getattr(self._stream, name)
+
+    def __repr__(self) -> str:
+        return "<%s of %r>" % (type(self).__name__, self._stream)
+
+
+class CheckedIterator(_CheckedStream, abc.Iterator):
+    """
+    Proxy of an iterator, checking the items it produces.
+
+    :param stream: the iterator
+    :param check_item: called with each selected item, outputs the errors
+    :param check_return: unused, iterators return nothing
+    :param select: the selector of the items to check (see
+        :func:`compile_stream_selector`)
+    """
+
+    __slots__ = ()
+
+    def __next__(self) -> Any:
+        return self._check(next(self._stream))
+
+
+class CheckedGenerator(_CheckedStream, abc.Generator):
+    """
+    Proxy of a generator, checking the items it yields and its return value.
+
+    :param stream: the generator
+    :param check_item: called with each selected item, outputs the errors
+    :param check_return: if given, called with the return value
+    :param select: the selector of the items to check (see
+        :func:`compile_stream_selector`)
+    """
+
+    __slots__ = ()
+
+    def send(self, value: Any) -> Any:
+        try:
+            item = self._stream.send(value)
+        except StopIteration as stop:
+            if self._check_return is not None:
+                self._check_return(stop.value)
+            raise
+        return self._check(item)
+
+    def __next__(self) -> Any:
+        return self.send(None)
+
+    def throw(self, *args: Any) -> Any:
+        try:
+            item = self._stream.throw(*args)
+        except StopIteration as stop:
+            if self._check_return is not None:
+                self._check_return(stop.value)
+            raise
+        return self._check(item)
+
+    def close(self) -> None:
+        self._stream.close()
+
+
+class CheckedAsyncGenerator(_CheckedStream, abc.AsyncGenerator):
+    """
+    Proxy of an asynchronous generator, checking the items it yields.
+
+    :param stream: the asynchronous generator
+    :param check_item: called with each selected item, outputs the errors
+    :param check_return: unused, asynchronous generators return nothing
+    :param select: the selector of the items to check (see
+        :func:`compile_stream_selector`)
+    """
+
+    __slots__ = ()
+
+    async def asend(self, value: Any) -> Any:
+        return self._check(await self._stream.asend(value))
+
+    def __anext__(self) -> Any:
+        return self.asend(None)
+
+    async def athrow(self, *args: Any) -> Any:
+        return self._check(await self._stream.athrow(*args))
+
+    async def aclose(self) -> None:
+        await self._stream.aclose()
@@ -1,4 +1,10 @@
 import inspect
+import functools
+import contextlib
+import contextvars
+import types
+import warnings
+import weakref
 from typing import (
     Callable,
     Tuple,
@@ -9,6 +15,11 @@ from typing import (
     Dict,
     Set,
     Type,
+    Optional,
+    NamedTuple,
+    Iterable,
+    Iterator,
+    Collection,
 )
 from typing import (
     Any,
@@ -16,14 +27,26 @@ from typing import (
     Union,
     Tuple,
     Type,
+    ForwardRef,
+    Literal,
     get_type_hints,
     get_origin,
     get_args,
 )
 from collections import abc
+from abc import ABCMeta, get_cache_token
+from itertools import islice
+import collections
+import random
 
+from strong.core.constraints import Constraint
 from strong.utils.output import DEFAULT_OUTPUT, raise_assertion_error
 
+try:
+    from typing import Annotated
+except ImportError:  # Python 3.8
+    Annotated = None
+
 
 def annotation_to_type(annotation: type) -> type:
     if annotation == inspect.Parameter.empty:
@@ -71,13 +94,184 @@ def get_function_type_hints(
     ([int, int], int)
     """
     args, ret = get_function_parameters(f)
-    ret = annotation_to_type(ret)
+    globalns = get_function_globals(f)
+    ret = annotation_to_type(_resolve_or_any(ret, globalns))
 
-    args = [annotation_to_type(arg.annotation) for arg in args.values()]
+    args = [
+        annotation_to_type(_resolve_or_any(arg.annotation, globalns))
+        for arg in args.values()
+    ]
 
     return args, ret
 
 
+def get_function_globals(f: Callable) -> Optional[Dict[str, Any]]:
+    """
+    Returns the global namespace in which the annotations of a function are
+    evaluated, or None if it has none (e.g. builtin functions).
+
+    :param f: the function
+    :return: the global namespace
+    """
+    try:
+        f = inspect.unwrap(f)
+    except ValueError:  # Cycle of wrappers
+        pass
+    return getattr(f, "__globals__", None)
+
+
+def _has_forward_refs(annotation: Any) -> bool:
+    """
+    Returns True if an annotation is, or contains, a forward reference.
+    Strings nested in other annotations are only forward references when
+    `typing` made them so, e.g. not the values of `Literal` or the metadata
+    of `Annotated`.
+    """
+    if isinstance(annotation, (str, ForwardRef)):
+        return True
+
+    args = get_args(annotation)
+    if not args or get_origin(annotation) is Literal:
+        return False
+    elif Annotated is not None and get_origin(annotation) is Annotated:
+        args = args[:1]
+
+    for arg in args:
+        if isinstance(arg, ForwardRef):
+            return True
+        elif isinstance(arg, list):  # Parameters of Callable
+            if any(_has_forward_refs(a) for a in arg if not isinstance(a, str)):
+                return True
+        elif not isinstance(arg, str) and _has_forward_refs(arg):
+            return True
+
+    return False
+
+
+def resolve_annotation(
+    annotation: Any,
+    globalns: Optional[Dict[str, Any]] = None,
+    localns: Optional[Dict[str, Any]] = None,
+) -> Any:
+    """
+    Returns an annotation with its forward references, i.e. strings such as
+    the ones left by `from __future__ import annotations`, evaluated in the
+    given namespaces. Annotations without forward references are returned
+    as is.
+
+    :param annotation: the annotation
+    :param globalns: the global namespace, usually the function's module one
+    :param localns: the local namespace
+    :return: the resolved annotation
+    :raises: NameError: if a name is not defined (yet)
+
+    :Example:
+
+    >>> resolve_annotation("List[int]", {"List": List})
+    typing.List[int]
+    """
+    if not _has_forward_refs(annotation):
+        return annotation
+
+    # get_type_hints evaluates nested forward references as well
+    holder = types.SimpleNamespace(__annotations__={"annotation": annotation})
+    if Annotated is None:  # Python 3.8
+        hints = get_type_hints(holder, globalns, localns)
+    else:
+        hints = get_type_hints(holder, globalns, localns, include_extras=True)
+    return hints["annotation"]
+
+
+def _resolve_or_any(annotation: Any, globalns: Optional[Dict[str, Any]]) -> Any:
+    try:
+        return resolve_annotation(annotation, globalns)
+    except (NameError, SyntaxError, TypeError):
+        return Any
+
+
+def resolve_annotation_or_any(
+    annotation: Any, globalns: Optional[Dict[str, Any]] = None
+) -> Any:
+    """
+    Returns an annotation resolved as with :func:`resolve_annotation`, or
+    `Any`, with a warning, if it cannot be resolved: names only imported
+    under `if typing.TYPE_CHECKING:`, classes local to a function in a
+    module with postponed annotations, or malformed annotation strings.
+
+    :param annotation: the annotation
+    :param globalns: the global namespace, usually the function's module one
+    :return: the resolved annotation, or `Any`
+    """
+    try:
+        return resolve_annotation(annotation, globalns)
+    except (NameError, SyntaxError, TypeError) as e:
+        warnings.warn(
+            "Annotation %r cannot be resolved (%s: %s), it is not checked"
+            % (annotation, type(e).__name__, e),
+            stacklevel=2,
+        )
+        return Any
+
+
+_CALLABLE_HINTS_ = weakref.WeakKeyDictionary()
+_METHOD_HINTS_ = weakref.WeakKeyDictionary()
+_BUILTIN_HINTS_ = dict()
+
+
+def get_callable_type_hints(f: Callable) -> Optional[Tuple[List[type], type]]:
+    """
+    Returns the same as :func:`get_function_type_hints`, but caches the
+    result for every callable, and returns None if the signature of the
+    callable cannot be retrieved.
+
+    Bound methods share the cache entry of their function, whatever the
+    instance they are bound to. Callables which cannot be weakly referenced
+    (e.g. builtin functions) are kept in a regular cache, except builtin
+    methods bound to an object, which would be kept alive.
+
+    :param f: the callable
+    :return: the parameters types and the output type, or None
+    """
+    if isinstance(f, types.MethodType):
+        cache, key = _METHOD_HINTS_, f.__func__
+    else:
+        cache, key = _CALLABLE_HINTS_, f
+
+    try:
+        return cache[key]
+    except KeyError:
+        pass
+    except TypeError:  # Not weakly referenceable, or not hashable
+        cache = _BUILTIN_HINTS_
+        try:
+            return cache[key]
+        except KeyError:
+            self = getattr(f, "__self__", None)
+            if self is not None and not isinstance(self, types.ModuleType):
+                cache = None
+        except TypeError:
+            cache = None
+
+    try:
+        hints = get_function_type_hints(f)
+    except (ValueError, TypeError):
+        hints = None
+
+    if cache is not None:
+        cache[key] = hints
+
+    return hints
+
+
+def clear_callable_cache() -> None:
+    """
+    Clears the cache of :func:`get_callable_type_hints`.
+    """
+    _CALLABLE_HINTS_.clear()
+    _METHOD_HINTS_.clear()
+    _BUILTIN_HINTS_.clear()
+
+
 def get_function_context(f: Callable) -> str:
     """
     Returns the function's context, containing:
@@ -85,6 +279,9 @@ def get_function_context(f: Callable) -> str:
     * the location of its code
     * the first line of its code (if exists)
 
+    For Python functions, the location is read from their code object, so
+    the source file is never read.
+
     :param f: the function
     :return: the context
     :raises: TypeError: if the function is a builtin function or method
@@ -96,25 +293,215 @@ def get_function_context(f: Callable) -> str:
     >>> get_function_context(f)
     "<stdin>:1:f"
     """
+    f = inspect.unwrap(f)
     name = f.__qualname__
 
+    code = getattr(f, "__code__", None)
+    if code is not None:
+        return "%s:%d:%s" % (code.co_filename, code.co_firstlineno, name)
+
     file = inspect.getsourcefile(f)
     try:
         lineno = inspect.getsourcelines(f)[1]
     except OSError:
         lineno = "<SourceCodeCannotBeRetrieved>"
 
-    return "%s:%d:%s" % (file, lineno, name)
+    return "%s:%s:%s" % (file, lineno, name)
 
 
 _TAGS_ = dict()
+_COMPILERS_ = dict()
 _TAG_FUNCTION_SIGNATURE_ = {"x": Any, "args": type, "return": bool}
 
 
+class Elements(NamedTuple):
+    """
+    Strategy used to check the elements of containers, e.g. the integers of
+    a `List[int]`:
+
+    * `"shallow"`: elements are not checked, only the container's type;
+    * `"full"`: every element is checked;
+    * `"first"`: the first `k` elements are checked;
+    * `"sample"`: `k` elements picked at random are checked. Containers which
+      cannot be indexed (sets, mappings, ...) fall back on their first `k`
+      elements.
+
+    See :data:`SHALLOW`, :data:`FULL`, :func:`first_elements` and
+    :func:`sampled_elements`.
+    """
+
+    mode: str
+    k: int = 0
+    seed: Optional[int] = None
+
+
+SHALLOW = Elements("shallow")
+FULL = Elements("full")
+
+
+def first_elements(k: int) -> Elements:
+    """
+    Returns the strategy checking the first `k` elements of containers.
+
+    :param k: the number of elements to check
+    :return: the strategy
+    """
+    return Elements("first", k)
+
+
+def sampled_elements(k: int, seed: Optional[int] = None) -> Elements:
+    """
+    Returns the strategy checking `k` elements of containers, picked at
+    random.
+
+    :param k: the number of elements to check
+    :param seed: the seed of the random generator, for reproducible checks
+    :return: the strategy
+    """
+    return Elements("sample", k, seed)
+
+
+def _compile_selector(
+    elements: Elements,
+) -> Optional[Callable[[Collection], Iterable]]:
+    """
+    Returns a function selecting the elements of a container to be checked,
+    or None if they should not be checked.
+    """
+    if elements.mode == "shallow":
+        return None
+    elif elements.mode == "full":
+        return lambda x: x
+    elif elements.mode == "first":
+        k = elements.k
+        return lambda x: islice(x, k)
+    elif elements.mode == "sample":
+        k = elements.k
+        sample = random.Random(elements.seed).sample
+
+        def select(x):
+            if isinstance(x, (list, tuple)) or isinstance(x, abc.Sequence):
+                n = len(x)
+                if n > k:
+                    return [x[i] for i in sample(range(n), k)]
+                return x
+            return islice(x, k)
+
+        return select
+    else:
+        raise ValueError("Unknown mode for checking elements: %r" % elements.mode)
+
+
+TYPING_CACHE_SIZE = 1024
+TYPE_VERDICTS_SIZE = 256
+
+
+def _compile_obj_typing_(tp: type, elements: Elements) -> Callable[[Any], bool]:
+    if tp is None:
+        tp = type(None)
+    origin, args = get_origin(tp), get_args(tp)
+    if origin is None:
+        origin = tp
+    elif origin is tuple and getattr(tp, "__args__", None) == ():
+        args = ((),)  # Tuple[()], whose arguments are empty since Python 3.11
+    if origin in _COMPILERS_:
+        checker = _COMPILERS_[origin](origin, elements, *args)
+    elif origin in _TAGS_:
+        func = _TAGS_[origin]
+        return lambda x: func(x, *args)
+    else:
+        checker = _isinstance_checker(origin)
+
+    return _cache_type_verdicts(checker)
+
+
+def _cache_type_verdicts(checker: Callable[[Any], bool]) -> Callable[[Any], bool]:
+    """
+    Memoizes the results of a checker whose result only depends on the
+    type of the object. Other checkers are returned as is.
+    As abstract base classes can register new subclasses at any time, results
+    involving them are forgotten every time a class is registered.
+    Objects whose `__class__` is not their type, e.g. proxies, are always
+    checked, as `isinstance` also looks at their `__class__`.
+    """
+    if not getattr(checker, "by_type", False):
+        return checker
+    elif isinstance(getattr(checker, "classes", None), type) and not checker.abstract:
+        return checker  # A single isinstance is already cheaper than any cache
+
+    verdicts = dict()
+    abstract = checker.abstract
+    cache_token = get_cache_token()
+
+    def check(x: Any) -> bool:
+        nonlocal cache_token
+        if abstract and cache_token != get_cache_token():
+            verdicts.clear()
+            cache_token = get_cache_token()
+
+        tp = type(x)
+        if tp is not x.__class__:
+            return checker(x)
+        verdict = verdicts.get(tp)
+        if verdict is None:
+            if len(verdicts) >= TYPE_VERDICTS_SIZE:
+                verdicts.clear()
+            verdict = verdicts[tp] = checker(x)
+        return verdict
+
+    check.__dict__.update(checker.__dict__)
+    return check
+
+
+_TYPING_CACHE_ = functools.lru_cache(maxsize=TYPING_CACHE_SIZE)(_compile_obj_typing_)
+
+
+def typing_cache_info() -> Tuple[int, int, int, int]:
+    """
+    Returns the statistics of the cache of compiled type annotations (see
+    :func:`compile_obj_typing`).
+
+    :return: a named tuple (hits, misses, maxsize, currsize)
+
+    :Example:
+
+    >>> clear_typing_cache()
+    >>> check_obj_typing(1, int)
+    True
+    >>> check_obj_typing(2, int)
+    True
+    >>> typing_cache_info()
+    CacheInfo(hits=1, misses=1, maxsize=1024, currsize=1)
+    """
+    return _TYPING_CACHE_.cache_info()
+
+
+def clear_typing_cache() -> None:
+    """
+    Clears the cache of compiled type annotations and its statistics.
+    This is automatically done every time :func:`tag` or :func:`compiles`
+    registers a new function.
+    """
+    _TYPING_CACHE_.cache_clear()
+
+
+def set_typing_cache_size(maxsize: Optional[int]) -> None:
+    """
+    Sets the maximum number of compiled type annotations kept in cache, and
+    clears it. The least recently used annotations are dropped first.
+
+    :param maxsize: the size of the cache, or None if it should be unbounded
+    """
+    global _TYPING_CACHE_
+    _TYPING_CACHE_ = functools.lru_cache(maxsize=maxsize)(_compile_obj_typing_)
+
+
 def tag(*tags: type) -> Callable:
     """
     Wrapper that will add current function as reference to know is an object is
     instance of tagged types.
+    Functions already wrapped by a decorator keep the type checks compiled
+    when they were wrapped, so tags should be registered before.
 
     :param tags:
     :return:
@@ -126,7 +513,9 @@ def tag(*tags: type) -> Callable:
         ), f"Function {func} must exactly have this signature: {_TAG_FUNCTION_SIGNATURE_}"
         for _tag in tags:
             _TAGS_[_tag] = func
+            _COMPILERS_.pop(_tag, None)
 
+        clear_typing_cache()
         return func
 
     return _tag_
@@ -137,8 +526,86 @@ def _issubclass_(a: type, b: type) -> bool:
         return a
     elif b is Any:
         return False
-    else:
+    try:
         return issubclass(a, b)
+    except TypeError:  # Type annotations, e.g. List[int]
+        return a == b
+
+
+def compiles(*tags: type) -> Callable:
+    """
+    Wrapper that will add current function as the compiler of tagged types.
+    A compiler receives the origin of an annotation (see
+    :func:`typing.get_origin`), the strategy for checking elements of
+    containers (see :class:`Elements`) and the arguments of the annotation
+    (see :func:`typing.get_args`). It returns a checker, i.e. a function
+    taking an object and returning True if it matches the annotation.
+
+    Tagged types without a compiler fall back on the function registered with
+    :func:`tag`.
+
+    :param tags:
+    :return:
+    """
+
+    def _compiles_(func):
+        for _tag in tags:
+            _COMPILERS_[_tag] = func
+
+        clear_typing_cache()
+        return func
+
+    return _compiles_
+
+
+_PLAIN_INSTANCECHECKS_ = (type.__instancecheck__, ABCMeta.__instancecheck__)
+
+
+def _by_type(
+    checker: Callable,
+    by_type: bool,
+    abstract: bool = False,
+    children: Iterable[Callable] = (),
+) -> Callable:
+    """
+    Marks whether a checker's result only depends on the type of the object,
+    and whether it involves abstract base classes.
+    A checker needs the call scope (see :func:`get_call_scope`) if any of the
+    checkers it is made of needs it, and has counters of sampled constraints
+    (see :func:`compile_parameter_typing`) if any of them has.
+    """
+    checker.by_type = by_type
+    checker.abstract = abstract
+    checker.scoped = any(getattr(child, "scoped", False) for child in children)
+    checker.sampled = any(getattr(child, "sampled", False) for child in children)
+    return checker
+
+
+def _isinstance_checker(classes: Union[type, Tuple[type, ...]]) -> Callable:
+    def check(x: Any) -> bool:
+        return isinstance(x, classes)
+
+    check.classes = classes
+
+    if not isinstance(classes, tuple):
+        classes = (classes,)
+
+    # Metaclasses may implement __instancecheck__ with the instance itself
+    by_type = all(
+        isinstance(cls, type) and type(cls).__instancecheck__ in _PLAIN_INSTANCECHECKS_
+        for cls in classes
+    )
+    abstract = any(isinstance(cls, ABCMeta) for cls in classes)
+
+    return _by_type(check, by_type, abstract)
+
+
+def _always_true(x: Any) -> bool:
+    return True
+
+
+_always_true.classes = object
+_by_type(_always_true, True)
 
 
 @tag(Any)
@@ -146,25 +613,100 @@ def _any_(x: Any, *args: type) -> bool:
     return True
 
 
+@compiles(Any)
+def _compile_any_(origin: type, elements: Elements, *args: type) -> Callable:
+    return _always_true
+
+
 @tag(Callable, abc.Callable)
 def _callable_(x: Any, *args: type) -> bool:
-    if not isinstance(x, Callable):
-        return False
-    if args:
-        arg_tps = args[0]
-        ret_tp = args[1]
-        args, ret = get_function_type_hints(x)
-        return (
-            len(args) == len(arg_tps)
-            and all(_issubclass_(arg_tp, arg) for arg, arg_tp in zip(args, arg_tps))
-            and _issubclass_(ret_tp, ret)
-        )
-    return True
+    return _compile_callable_(abc.Callable, SHALLOW, *args)(x)
+
+
+@compiles(Callable, abc.Callable)
+def _compile_callable_(origin: type, elements: Elements, *args: type) -> Callable:
+    if not args:
+        return _cache_type_verdicts(_isinstance_checker(abc.Callable))
+
+    arg_tps, ret_tp = args
+    if arg_tps is Ellipsis:  # Callable[..., R]
+        arg_tps = None
+
+    def check(x: Any) -> bool:
+        if not callable(x):
+            return False
+        hints = get_callable_type_hints(x)
+        if hints is None:
+            return True  # The signature cannot be verified
+        x_args, x_ret = hints
+        if arg_tps is not None and (
+            len(x_args) != len(arg_tps)
+            or not all(
+                _issubclass_(arg_tp, arg) for arg, arg_tp in zip(x_args, arg_tps)
+            )
+        ):
+            return False
+        return _issubclass_(ret_tp, x_ret)
+
+    return _by_type(check, False)
 
 
 @tag(Tuple, tuple)
 def _tuple_(x: Any, *args: type) -> bool:
-    return isinstance(x, tuple) and len(x) == len(args)
+    return _compile_tuple_(tuple, SHALLOW, *args)(x)
+
+
+@compiles(Tuple, tuple)
+def _compile_tuple_(origin: type, elements: Elements, *args: type) -> Callable:
+    container_checker = _isinstance_checker(tuple)
+
+    if not args:
+        return container_checker
+
+    if args == ((),):
+        # Empty tuple, i.e. Tuple[()], unlike bare Tuple which is any tuple
+        def check(x: Any) -> bool:
+            return isinstance(x, tuple) and len(x) == 0
+
+        return _by_type(check, False)
+
+    if len(args) == 2 and args[1] is Ellipsis:
+        # Variadic tuple, e.g. Tuple[int, ...]
+        return _compile_collection_(tuple, elements, args[0])
+
+    # Fixed tuple, e.g. Tuple[int, str]: every position is always checked
+    length = len(args)
+    positions = []
+    for index, tp in enumerate(args):
+        checker = compile_obj_typing(tp, elements)
+        if checker is not _always_true:
+            positions.append((index, checker))
+    positions = tuple(positions)
+    children = tuple(checker for _, checker in positions)
+
+    if all(hasattr(checker, "classes") for _, checker in positions):
+        # Only plain classes: avoids calling a checker per element
+        positions = tuple((index, checker.classes) for index, checker in positions)
+
+        def check(x: Any) -> bool:
+            if not isinstance(x, tuple) or len(x) != length:
+                return False
+            for index, classes in positions:
+                if not isinstance(x[index], classes):
+                    return False
+            return True
+
+    else:
+
+        def check(x: Any) -> bool:
+            if not isinstance(x, tuple) or len(x) != length:
+                return False
+            for index, checker in positions:
+                if not checker(x[index]):
+                    return False
+            return True
+
+    return _by_type(check, False, children=children)
 
 
 @tag(Type, type)
@@ -172,12 +714,263 @@ def _type_(x: Any, *args: type) -> bool:
     return check_obj_typing(x, args[0])
 
 
+@compiles(Type, type)
+def _compile_type_(origin: type, elements: Elements, *args: type) -> Callable:
+    if args:
+        return compile_obj_typing(args[0], elements)
+    return _isinstance_checker(type)
+
+
 @tag(Union)
 def _union_(x: Any, *args: type) -> bool:
     return any(check_obj_typing(x, tp) for tp in args)
 
 
-def check_obj_typing(obj: Any, tp: type) -> bool:
+@compiles(Union)
+def _compile_union_(origin: type, elements: Elements, *args: type) -> Callable:
+    # Members which are plain classes are all checked by a single isinstance
+    classes = []
+    checkers = []
+
+    for tp in args:
+        checker = compile_obj_typing(tp, elements)
+        member_classes = getattr(checker, "classes", None)
+        if member_classes is None:
+            checkers.append(checker)
+        elif isinstance(member_classes, tuple):
+            classes.extend(member_classes)
+        else:
+            classes.append(member_classes)
+
+    classes = tuple(dict.fromkeys(classes))
+    if len(classes) == 1:
+        classes = classes[0]
+    checkers = tuple(checkers)
+
+    if not checkers:
+        return _isinstance_checker(classes)
+
+    if classes:
+        class_checker = _isinstance_checker(classes)
+        checkers = (class_checker,) + checkers
+
+    if len(checkers) == 2:
+        first, second = checkers
+
+        def check(x: Any) -> bool:
+            return first(x) or second(x)
+
+    else:
+
+        def check(x: Any) -> bool:
+            for checker in checkers:
+                if checker(x):
+                    return True
+            return False
+
+    return _by_type(
+        check,
+        all(getattr(checker, "by_type", False) for checker in checkers),
+        any(getattr(checker, "abstract", False) for checker in checkers),
+        checkers,
+    )
+
+
+if hasattr(types, "UnionType"):  # PEP 604 unions, e.g. `int | None`
+    tag(types.UnionType)(_union_)
+    compiles(types.UnionType)(_compile_union_)
+
+
+@compiles(
+    list,
+    set,
+    frozenset,
+    collections.deque,
+    abc.Collection,
+    abc.Sequence,
+    abc.MutableSequence,
+    abc.Set,
+    abc.MutableSet,
+)
+def _compile_collection_(origin: type, elements: Elements, *args: type) -> Callable:
+    container_checker = _cache_type_verdicts(_isinstance_checker(origin))
+    select = _compile_selector(elements)
+
+    if select is None or not args:
+        return container_checker
+
+    item_checker = compile_obj_typing(args[0], elements)
+
+    if item_checker is _always_true:
+        return container_checker
+
+    def check(x: Any) -> bool:
+        if not container_checker(x):
+            return False
+        for item in select(x):
+            if not item_checker(item):
+                return False
+        return True
+
+    return _by_type(check, False, children=(item_checker,))
+
+
+@compiles(
+    dict,
+    collections.OrderedDict,
+    collections.defaultdict,
+    abc.Mapping,
+    abc.MutableMapping,
+)
+def _compile_mapping_(origin: type, elements: Elements, *args: type) -> Callable:
+    container_checker = _cache_type_verdicts(_isinstance_checker(origin))
+    select = _compile_selector(elements)
+
+    if select is None or not args:
+        return container_checker
+
+    key_checker = compile_obj_typing(args[0], elements)
+    value_checker = compile_obj_typing(args[1], elements)
+
+    if key_checker is _always_true and value_checker is _always_true:
+        return container_checker
+
+    def check(x: Any) -> bool:
+        if not container_checker(x):
+            return False
+        for key, value in select(x.items()):
+            if not key_checker(key) or not value_checker(value):
+                return False
+        return True
+
+    return _by_type(check, False, children=(key_checker, value_checker))
+
+
+def _compile_annotated_(origin: type, elements: Elements, *args: type) -> Callable:
+    # Metadata which are not constraints are ignored, as specified by PEP 593
+    base_checker = compile_obj_typing(args[0], elements)
+    constraints = tuple(
+        constraint.compile()
+        for constraint in args[1:]
+        if isinstance(constraint, Constraint)
+    )
+
+    if not constraints:
+        return base_checker
+
+    def check(x: Any) -> bool:
+        if not base_checker(x):
+            return False
+        for constraint in constraints:
+            if not constraint(x):
+                return False
+        return True
+
+    check = _by_type(check, False, children=(base_checker,))
+    if any(c.every > 1 for c in args[1:] if isinstance(c, Constraint)):
+        check.sampled = True  # Has its own countdowns
+    return check
+
+
+if Annotated is not None:
+    compiles(Annotated)(_compile_annotated_)
+
+
+def compile_obj_typing(
+    tp: type, elements: Elements = SHALLOW
+) -> Callable[[Any], bool]:
+    """
+    Returns a checker for a given type annotation, i.e. a function taking an
+    object and returning the same result as :func:`check_obj_typing`.
+    The annotation is decomposed only once, when the checker is built, and
+    checkers are kept in a bounded cache (see :func:`typing_cache_info`).
+
+    :param tp: the type annotation
+    :param elements: the strategy for checking elements of containers
+    :return: the checker
+
+    :Example:
+
+    >>> from typing import Union
+    >>> checker = compile_obj_typing(Union[int, float])
+    >>> checker(1)
+    True
+    >>> checker("1")
+    False
+    """
+    if _UNCACHED_.get():
+        return _compile_obj_typing_(tp, elements)
+    try:
+        return _TYPING_CACHE_(tp, elements)
+    except TypeError:  # Unhashable annotation, cannot be cached
+        return _compile_obj_typing_(tp, elements)
+
+
+_UNCACHED_ = contextvars.ContextVar("strong_uncached", default=False)
+
+
+def compile_parameter_typing(
+    tp: type, elements: Elements = SHALLOW
+) -> Callable[[Any], bool]:
+    """
+    Returns the same checker as :func:`compile_obj_typing`, except that
+    annotations with sampled constraints (e.g. `Ge(0, every=10)`, see
+    :class:`strong.core.constraints.Constraint`) are compiled again, out of
+    the cache, so that the checker has its own counters. It is used for each
+    parameter of a function.
+
+    :param tp: the type annotation
+    :param elements: the strategy for checking elements of containers
+    :return: the checker
+    """
+    checker = compile_obj_typing(tp, elements)
+    if not getattr(checker, "sampled", False):
+        return checker
+
+    token = _UNCACHED_.set(True)
+    try:
+        return _compile_obj_typing_(tp, elements)
+    finally:
+        _UNCACHED_.reset(token)
+
+
+def _compile_annotation(
+    annotation: Any, elements: Elements, globalns: Optional[Dict[str, Any]]
+) -> Tuple[Any, Callable[[Any], bool]]:
+    """
+    Returns the resolved annotation and its checker.
+
+    Forward references which cannot be resolved yet, e.g. because of circular
+    imports, are left as is, and their checker resolves them on first use.
+    Annotations which cannot be resolved then, or which are malformed, are
+    replaced with `Any` (see :func:`resolve_annotation_or_any`).
+    """
+    try:
+        annotation = resolve_annotation(annotation, globalns)
+    except NameError:
+        return annotation, _compile_forward_ref(annotation, elements, globalns)
+    except (SyntaxError, TypeError):
+        annotation = resolve_annotation_or_any(annotation, globalns)
+    return annotation, compile_parameter_typing(annotation, elements)
+
+
+def _compile_forward_ref(
+    annotation: Any, elements: Elements, globalns: Optional[Dict[str, Any]]
+) -> Callable[[Any], bool]:
+    checker = None
+
+    def check(x: Any) -> bool:
+        nonlocal checker
+        if checker is None:
+            checker = compile_parameter_typing(
+                resolve_annotation_or_any(annotation, globalns), elements
+            )
+        return checker(x)
+
+    return _by_type(check, False)
+
+
+def check_obj_typing(obj: Any, tp: type, elements: Elements = SHALLOW) -> bool:
     """
     Returns True if the object matches a given type.
     An object matches a type if it can be considered to be an instance of
@@ -185,22 +978,20 @@ def check_obj_typing(obj: Any, tp: type) -> bool:
 
     :param obj: the object
     :param tp: the type annotation
+    :param elements: the strategy for checking elements of containers
     :return: True if object matches given type
 
     :Example:
 
-    >>> from typing import Union
+    >>> from typing import List, Union
     >>> check_obj_typing(1, Union[int, float])
     True
+    >>> check_obj_typing([1, "2"], List[int])
+    True
+    >>> check_obj_typing([1, "2"], List[int], elements=FULL)
+    False
     """
-    origin, args = get_origin(tp), get_args(tp)
-    if origin is None:
-        origin = tp
-    if origin in _TAGS_:
-        return _TAGS_[origin](obj, *args)
-    else:
-        print(obj, origin)
-        return isinstance(obj, origin)
+    return compile_obj_typing(tp, elements)(obj)
 
 
 def check_arg_typing(param: inspect.Parameter, arg: Any) -> Tuple[bool, str]:
@@ -245,16 +1036,20 @@ def check_ret_typing(annotation: type, ret: Any) -> Tuple[bool, str]:
     return ret_val, ret_msg
 
 
-def get_arg_wrong_typing_error_message(param: inspect.Parameter, arg: Any) -> str:
+def get_arg_wrong_typing_error_message(
+    param: inspect.Parameter, arg: Any, name: Optional[str] = None
+) -> str:
     """
     Builds a message for a wrong argument typing error.
 
     :param param: the parameter
     :param arg: the input argument
+    :param name: the name of the argument, if not the parameter's name (e.g.
+        for an element of `*args`)
     :return: the message
     """
     return "Argument `%s` does not match typing:" "%s is not an instance of %s" % (
-        param.name,
+        param.name if name is None else name,
         repr(arg),
         param.annotation,
     )
@@ -274,6 +1069,36 @@ def get_ret_wrong_typing_error_message(annotation: type, ret: Any) -> str:
     )
 
 
+def get_yield_wrong_typing_error_message(annotation: type, item: Any) -> str:
+    """
+    Builds a message for a wrong yielded value typing error.
+
+    :param annotation: the type
+    :param item: the yielded value
+    :return: the message
+    """
+    return "Yielded value does not match typing:" "%s is not an instance of %s" % (
+        repr(item),
+        annotation,
+    )
+
+
+def get_item_wrong_typing_error_message(name: str, annotation: type, item: Any) -> str:
+    """
+    Builds a message for a wrong item of an iterator typing error.
+
+    :param name: the name of the argument, or "return value"
+    :param annotation: the type of the items
+    :param item: the item
+    :return: the message
+    """
+    return "Item of `%s` does not match typing:" "%s is not an instance of %s" % (
+        name,
+        repr(item),
+        annotation,
+    )
+
+
 def get_message_with_context(msg: str, context: str) -> str:
     """
     Concatenates an error message with a context. If context is empty
@@ -386,26 +1211,31 @@ def output_if_args_incorrect_typing(
     :param context: the context of the message
     """
     checks = check_args_typing(params, *args, **kwargs)
+    failed = [ret_msg for ret_val, ret_msg in checks if not ret_val]
 
-    if join:
-        success = True
-        failed = []
-
-        for ret_val, ret_msg in checks:
-            success &= ret_val
+    if failed:
+        output_messages(failed, join=join, output=output, context=context)
 
-            if not ret_val:
-                failed.append(ret_msg)
 
-        if not success:
-            ret_msg = get_message_with_context("\n".join(failed), context)
-            output(ret_msg)
+def output_messages(
+    messages: List[str],
+    join: bool = True,
+    output: Callable = DEFAULT_OUTPUT,
+    context: str = "",
+) -> None:
+    """
+    Outputs error messages, with their context.
 
+    :param messages: the messages
+    :param join: if True, will join all the messages in one
+    :param output: the desired output (see utils.output module)
+    :param context: the context of the messages
+    """
+    if join:
+        output(get_message_with_context("\n".join(messages), context))
     else:
-        for ret_val, ret_msg in checks:
-            if not ret_val:
-                ret_msg = get_message_with_context(ret_msg, context)
-                output(ret_msg)
+        for msg in messages:
+            output(get_message_with_context(msg, context))
 
 
 def assert_arg_correct_typing(
@@ -463,3 +1293,365 @@ def assert_args_correct_typing(
         output=raise_assertion_error,
         context=context,
     )
+
+
+_CALL_SCOPE_ = contextvars.ContextVar("strong_call_scope", default=None)
+
+
+def get_call_scope() -> Optional[Dict[Any, Any]]:
+    """
+    Returns the values shared by the checks of a same call, e.g. the sizes
+    bound to the symbolic dimensions of arrays, or None outside of a call
+    scope.
+    Decorators open a new call scope for every call of a function whose
+    checks need it.
+
+    :return: the values of the current call scope
+    """
+    return _CALL_SCOPE_.get()
+
+
+@contextlib.contextmanager
+def call_scope() -> Iterator[Dict[Any, Any]]:
+    """
+    Opens a new call scope (see :func:`get_call_scope`), e.g. to check that
+    several objects agree with each other.
+
+    :return: the values of the new call scope
+
+    :Example:
+
+    >>> from strong.core.ndarray import NDArray
+    >>> with call_scope():
+    >>>     check_obj_typing(np.zeros(3), NDArray[float, ("n",)])
+    >>>     check_obj_typing(np.zeros(4), NDArray[float, ("n",)])
+    True
+    False
+    """
+    token = _CALL_SCOPE_.set(dict())
+    try:
+        yield _CALL_SCOPE_.get()
+    finally:
+        _CALL_SCOPE_.reset(token)
+
+
+class TypingPlan:
+    """
+    Type checks of a function's signature, compiled once by
+    :func:`get_function_typing_plan`. Parameters without annotation are left
+    out of the plan, so they cost nothing when checking a call.
+
+    Arguments are bound to parameters the same way Python does:
+
+    * positional arguments by index;
+    * keyword arguments by name, except for positional-only parameters;
+    * remaining positional arguments are elements of `*args`;
+    * remaining keyword arguments are elements of `**kwargs`.
+
+    Annotations are resolved once, in the global namespace of the function
+    (see :func:`resolve_annotation`), so that string annotations are
+    supported. Those which cannot be resolved yet are resolved on first use.
+
+    :param params: the parameters
+    :param ret_annotation: the output type
+    :param elements: the strategy for checking elements of containers
+    :param globalns: the namespace in which string annotations are evaluated
+    """
+
+    __slots__ = (
+        "scoped",
+        "positional",
+        "keywords",
+        "names",
+        "var_positional",
+        "var_keyword",
+        "ret_annotation",
+        "ret_checker",
+    )
+
+    def __init__(
+        self,
+        params: Mapping[str, inspect.Parameter],
+        ret_annotation: type,
+        elements: Elements = SHALLOW,
+        globalns: Optional[Dict[str, Any]] = None,
+    ):
+        positional = []
+        keywords = dict()
+        names = set()
+        self.var_positional = None
+        self.var_keyword = None
+
+        for index, param in enumerate(params.values()):
+            kind = param.kind
+
+            if kind is not inspect.Parameter.POSITIONAL_ONLY:
+                names.add(param.name)
+
+            if param.annotation is inspect.Parameter.empty:
+                continue
+
+            annotation, checker = _compile_annotation(
+                param.annotation, elements, globalns
+            )
+            if annotation is not param.annotation:
+                param = param.replace(annotation=annotation)
+
+            if kind is inspect.Parameter.VAR_POSITIONAL:
+                self.var_positional = (index, param, checker)
+            elif kind is inspect.Parameter.VAR_KEYWORD:
+                self.var_keyword = (param, checker)
+            else:
+                if kind is not inspect.Parameter.KEYWORD_ONLY:
+                    positional.append((index, param, checker))
+                if kind is not inspect.Parameter.POSITIONAL_ONLY:
+                    keywords[param.name] = (param, checker)
+
+        if self.var_keyword is not None:
+            names.discard(self.var_keyword[0].name)
+
+        self.positional = tuple(positional)
+        self.keywords = keywords
+        self.names = frozenset(names)
+
+        if ret_annotation is inspect.Parameter.empty:
+            self.ret_checker = None
+        else:
+            ret_annotation, self.ret_checker = _compile_annotation(
+                ret_annotation, elements, globalns
+            )
+
+        self.ret_annotation = ret_annotation
+
+        checkers = [checker for _, _, checker in positional]
+        checkers.extend(checker for _, checker in keywords.values())
+        checkers.extend(
+            entry[-1]
+            for entry in (self.var_positional, self.var_keyword, (self.ret_checker,))
+            if entry is not None and entry[-1] is not None
+        )
+        self.scoped = any(getattr(checker, "scoped", False) for checker in checkers)
+
+    def check_args(
+        self, args: Tuple[Any], kwargs: Mapping[str, Any]
+    ) -> Optional[List[str]]:
+        """
+        Returns the error messages of the input arguments which do not match
+        their parameter type.
+        If a keyword argument is invalid, it will be skipped.
+        Same applies if to many arguments are given.
+
+        :param args: the input positional arguments
+        :param kwargs: the input keyword arguments
+        :return: the error messages, or None if every argument is correct
+        """
+        failed = None
+        n_args = len(args)
+
+        for index, param, checker in self.positional:
+            if index >= n_args:
+                break
+            arg = args[index]
+            if not checker(arg):
+                if failed is None:
+                    failed = []
+                failed.append(get_arg_wrong_typing_error_message(param, arg))
+
+        if self.var_positional is not None and n_args > self.var_positional[0]:
+            offset, param, checker = self.var_positional
+            for index in range(offset, n_args):
+                arg = args[index]
+                if not checker(arg):
+                    if failed is None:
+                        failed = []
+                    name = "%s[%d]" % (param.name, index - offset)
+                    failed.append(get_arg_wrong_typing_error_message(param, arg, name))
+
+        if kwargs:
+            keywords = self.keywords
+            var_keyword = self.var_keyword
+            for key, arg in kwargs.items():
+                entry = keywords.get(key)
+                if entry is None:
+                    if var_keyword is None or key in self.names:
+                        continue
+                    param, checker = var_keyword
+                    name = "%s[%r]" % (param.name, key)
+                else:
+                    param, checker = entry
+                    name = None
+                if not checker(arg):
+                    if failed is None:
+                        failed = []
+                    failed.append(get_arg_wrong_typing_error_message(param, arg, name))
+
+        return failed
+
+    def check_ret(self, ret: Any) -> Optional[str]:
+        """
+        Returns the error message if the return value does not match the
+        output type.
+
+        :param ret: the return value
+        :return: the error message, or None if the return value is correct
+        """
+        if self.ret_checker is None or self.ret_checker(ret):
+            return None
+        return get_ret_wrong_typing_error_message(self.ret_annotation, ret)
+
+
+def get_function_typing_plan(f: Callable, elements: Elements = SHALLOW) -> TypingPlan:
+    """
+    Returns the type checks of a function's signature, compiled once so that
+    checking a call only costs the checks themselves.
+
+    :param f: the function
+    :param elements: the strategy for checking elements of containers
+    :return: the typing plan
+    :raises: ValueError: if the function is a builtin function or method
+
+    :Example:
+
+    >>> def f(a: int, b) -> int:
+    >>>     return a + b
+    >>> plan = get_function_typing_plan(f)
+    >>> plan.check_args((1, "2"), {})  # `b` is not annotated
+    >>> plan.check_args(("1", 2), {})
+    ["Argument `a` does not match typing:'1' is not an instance of <class 'int'>"]
+    """
+    return TypingPlan(
+        *get_function_parameters(f),
+        elements=elements,
+        globalns=get_function_globals(f),
+    )
+
+
+def _failing_indices(checker: Callable[[Any], bool], values: Iterable) -> List[int]:
+    """
+    Returns the indices of the values not passing a checker. Checkers only
+    depending on the type of the objects are called once per distinct type,
+    except for objects whose `__class__` is not their type, e.g. proxies.
+    """
+    if not getattr(checker, "by_type", False):
+        return [index for index, value in enumerate(values) if not checker(value)]
+
+    failed = []
+    verdicts = dict()
+    last_type = None
+    verdict = True
+
+    for index, value in enumerate(values):
+        value_type = type(value)
+        if value_type is not value.__class__:
+            if not checker(value):
+                failed.append(index)
+            continue
+        if value_type is not last_type:
+            verdict = verdicts.get(value_type)
+            if verdict is None:
+                verdict = verdicts[value_type] = checker(value)
+            last_type = value_type
+        if not verdict:
+            failed.append(index)
+
+    return failed
+
+
+def check_many(values: Iterable, tp: type, elements: Elements = SHALLOW) -> List[int]:
+    """
+    Checks many objects against a same type annotation, in a single pass.
+    The annotation is compiled once and, if the result only depends on the
+    type of the objects, each distinct type is checked once.
+    See :func:`check_obj_typing` for more information.
+
+    :param values: the objects
+    :param tp: the type annotation
+    :param elements: the strategy for checking elements of containers
+    :return: the indices of the objects which do not match given type
+
+    :Example:
+
+    >>> from typing import Optional
+    >>> check_many([1, None, "2", 3], Optional[int])
+    [2]
+    """
+    return _failing_indices(compile_obj_typing(tp, elements), values)
+
+
+def check_columns(
+    records: Iterable[Tuple[Any, ...]],
+    signature: Union[Callable, inspect.Signature, TypingPlan],
+    elements: Elements = SHALLOW,
+) -> List[int]:
+    """
+    Checks many tuples of positional arguments against a same function
+    signature, one parameter (i.e. column) at a time. Parameters whose checks
+    share values within a call (see :func:`call_scope`), e.g. symbolic
+    dimensions of arrays, are checked record by record, each in its own call
+    scope.
+    See :func:`check_many` for more information.
+
+    :param records: the tuples of positional arguments
+    :param signature: the function, its signature or its typing plan
+    :param elements: the strategy for checking elements of containers, if a
+        typing plan is not given
+    :return: the sorted indices of the records with at least one argument
+        which does not match its parameter type
+
+    :Example:
+
+    >>> def f(a: int, b: str):
+    >>>     pass
+    >>> check_columns([(1, "a"), (2, 3), ("3", "c")], f)
+    [1, 2]
+    """
+    if isinstance(signature, TypingPlan):
+        plan = signature
+    elif isinstance(signature, inspect.Signature):
+        plan = TypingPlan(
+            signature.parameters, signature.return_annotation, elements=elements
+        )
+    else:
+        plan = get_function_typing_plan(signature, elements=elements)
+
+    if not isinstance(records, (list, tuple)):
+        records = list(records)
+
+    failed = set()
+    scoped = []
+
+    for index, _, checker in plan.positional:
+        if getattr(checker, "scoped", False):
+            scoped.append((index, index + 1, checker))
+            continue
+        rows = [row for row, record in enumerate(records) if len(record) > index]
+        column = [records[row][index] for row in rows]
+        failed.update(rows[i] for i in _failing_indices(checker, column))
+
+    if plan.var_positional is not None:
+        offset, _, checker = plan.var_positional
+        if getattr(checker, "scoped", False):
+            scoped.append((offset, None, checker))
+        else:
+            rows = [
+                row
+                for row, record in enumerate(records)
+                for _ in range(offset, len(record))
+            ]
+            column = [arg for record in records for arg in record[offset:]]
+            failed.update(rows[i] for i in _failing_indices(checker, column))
+
+    # Checks sharing values, e.g. symbolic dimensions, are done record by record
+    if scoped:
+        for row, record in enumerate(records):
+            if row in failed:
+                continue
+            with call_scope():
+                if not all(
+                    checker(arg)
+                    for start, stop, checker in scoped
+                    for arg in record[start:stop]
+                ):
+                    failed.add(row)
+
+    return sorted(failed)
@@ -1,6 +1,7 @@
 import argparse
 from pathlib import Path
 import os
+from strong.core.instrument import iter_functions
 from strong.core.signature import get_function_parameters, get_function_context
 import inspect
 import importlib.util
@@ -47,25 +48,8 @@ def check_module(filename: str) -> None:
     except Exception:
         pass  # Some files like setup.py cannot be loaded...
 
-    members = inspect.getmembers(module)
-    module_path = inspect.getfile(module)
-
-    def _check_members(obj, members, depth):
-
-        if depth < 0:
-            return
-
-        for member_name, member_type in members:
-            member = getattr(obj, member_name, None)
-
-            if inspect.isfunction(member_type) and module_path == inspect.getfile(
-                member_type
-            ):
-                check_function(member)
-            elif inspect.isclass(member_type):
-                _check_members(member, inspect.getmembers(member), depth - 1)
-
-    _check_members(module, members, 1)
+    for _, _, _, function in iter_functions(module, depth=1):
+        check_function(function)
 
 
 def main() -> None:
@@ -1,5 +1,13 @@
 import warnings
 import sys
+import atexit
+import collections
+import logging
+import os
+import threading
+import traceback
+import weakref
+from typing import Any, List, Union
 
 
 def raise_warning(msg: str) -> None:
@@ -74,4 +82,197 @@ def raise_stderr(msg: str) -> None:
     print(msg, file=sys.stderr)
 
 
+class BackgroundOutput:
+    """
+    Output handing messages to a background thread, which writes them in
+    batches to a stream, a file, a logger or a logging handler. Callers only
+    pay for appending the message to a bounded queue: when the queue is full,
+    the oldest messages are dropped, and the number of dropped messages is
+    written along with the next batch.
+
+    The thread is started with the first message, and remaining messages are
+    written when the program exits.
+
+    :param target: the stream (standard error by default), the path of a file
+        opened in append mode, or a :class:`logging.Logger` or
+        :class:`logging.Handler`
+    :param maxlen: the maximum number of messages waiting to be written
+    :param interval: the time between two batches, in seconds
+    :param level: the level of the messages sent to loggers and handlers
+
+    :Example:
+
+    >>> from strong.core.decorators import check_correct_typing
+    >>> output = BackgroundOutput("type_errors.log")
+    >>> @check_correct_typing(output=output)
+    >>> def f(a: int) -> int:
+    >>>     return a
+    >>> f("1")  # Only enqueues the message
+    >>> output.flush()  # Writes it now
+    """
+
+    def __init__(
+        self,
+        target: Union[Any, str, os.PathLike, logging.Logger, logging.Handler] = None,
+        maxlen: int = 10000,
+        interval: float = 0.1,
+        level: int = logging.WARNING,
+    ):
+        if maxlen < 1:
+            raise ValueError("`maxlen` must be a positive integer, not %r" % maxlen)
+
+        self.target = target
+        self.maxlen = maxlen
+        self.interval = interval
+        self.level = level
+        self.dropped = 0
+
+        self._queue = collections.deque(maxlen=maxlen)
+        self._reported = 0
+        self._file = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+
+        _BACKGROUND_OUTPUTS_.add(self)
+
+    def __call__(self, msg: str) -> None:
+        queue = self._queue
+        if len(queue) == self.maxlen:
+            self.dropped += 1
+        queue.append(msg)
+        if self._thread is None:
+            self._start()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(
+                    target=self._run, name="strong-output", daemon=True
+                )
+                self._thread.start()
+                return
+        if self._closed:
+            self.flush()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self.interval)
+            try:
+                self.flush()
+            except Exception:
+                self._handle_error()
+
+    def _handle_error(self) -> None:
+        # Like logging.Handler.handleError: the batch is lost, the thread goes on
+        if logging.raiseExceptions and sys.stderr:
+            try:
+                sys.stderr.write("--- Error in strong's background output ---\n")
+                traceback.print_exc(file=sys.stderr)
+            except OSError:
+                pass
+
+    def _drain(self) -> List[str]:
+        queue = self._queue
+        batch = []
+        while queue:
+            try:
+                batch.append(queue.popleft())
+            except IndexError:
+                break
+
+        dropped = self.dropped - self._reported
+        if dropped:
+            self._reported += dropped
+            batch.append("%d message(s) dropped by strong's output" % dropped)
+        return batch
+
+    def _write(self, batch: List[str]) -> None:
+        target = self.target
+
+        if isinstance(target, logging.Logger):
+            for msg in batch:
+                target.log(self.level, msg)
+        elif isinstance(target, logging.Handler):
+            for msg in batch:
+                target.handle(
+                    logging.LogRecord("strong", self.level, "", 0, msg, None, None)
+                )
+        else:
+            if target is None:
+                stream = sys.stderr
+            elif isinstance(target, (str, os.PathLike)):
+                if self._file is None:
+                    self._file = open(target, "a")
+                stream = self._file
+            else:
+                stream = target
+
+            stream.write("\n".join(batch) + "\n")
+            stream.flush()
+
+    def flush(self) -> None:
+        """
+        Writes the waiting messages now, in the calling thread.
+        """
+        with self._lock:
+            batch = self._drain()
+            if batch:
+                try:
+                    self._write(batch)
+                finally:
+                    # Once closed, files are only opened for the messages at hand
+                    if self._closed and self._file is not None:
+                        self._file.close()
+                        self._file = None
+
+    def close(self) -> None:
+        """
+        Stops the background thread, writes the waiting messages and closes
+        the file opened by the output, if any. Later messages are written
+        synchronously, and the file is closed again after each of them.
+        """
+        self._closed = True
+        self._wakeup.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self.flush()
+
+        with self._lock:
+            self._thread = None
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _after_fork(self) -> None:
+        # Threads do not survive a fork: the child starts its own
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        if self._closed:
+            self._wakeup.set()
+        self._thread = None
+        # The parent writes its own waiting messages
+        self._queue.clear()
+        self._reported = self.dropped
+
+
+_BACKGROUND_OUTPUTS_ = weakref.WeakSet()
+
+
+@atexit.register
+def _close_background_outputs() -> None:
+    for output in list(_BACKGROUND_OUTPUTS_):
+        output.close()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(
+        after_in_child=lambda: [
+            output._after_fork() for output in list(_BACKGROUND_OUTPUTS_)
+        ]
+    )
+
+
 DEFAULT_OUTPUT = raise_stderr
@@ -22,6 +22,14 @@ def f_mul_int_typed_kwd(a: int, b: int = 0) -> float:
     return f_mul(a, b)
 
 
+def f_variadic(a: int, *args: int, b: str = "", **kwargs: float) -> None:
+    pass
+
+
+def f_positional_only(a: int, /, **kwargs: str) -> None:
+    pass
+
+
 __f_mul_int_typed_from_string__ = None
 __f_mul_int_typed_code__ = """def __f_mul_int_typed_from_string__(
 a: int, b:int) -> float:
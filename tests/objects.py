@@ -4,3 +4,12 @@ class SubInt(int):
 
 class Foo:
     pass
+
+
+class Proxy:
+    def __init__(self, obj):
+        self.obj = obj
+
+    @property
+    def __class__(self):
+        return type(self.obj)
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    from decimal import Decimal
+
+
+def f_postponed(a: int, b: List[int], c: Optional[Node] = None) -> float:
+    return a * 0.5
+
+
+def f_circular(a: Later) -> Later:
+    return a
+
+
+def f_type_checking(a: Decimal) -> int:
+    return 1
+
+
+def make_f_local():
+    class Local:
+        pass
+
+    def f_local(a: Local) -> Local:
+        return a
+
+    return f_local
+
+
+class Node:
+    def merge(self, other: Node) -> Node:
+        return self
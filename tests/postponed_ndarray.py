@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+from strong.core.ndarray import Dim, NDArray
+
+N = Dim("n")
+
+
+# Strings in the annotations are not forward references
+def f_strings(a: NDArray["f8", (N,)], b: NDArray[float, ("n",), "C"]):  # noqa: F821
+    return 1
@@ -0,0 +1,85 @@
+from strong.bench import (
+    benchmark,
+    compare,
+    format_comparisons,
+    format_results,
+    summarize,
+    to_json,
+)
+from strong.core.decorators import assert_correct_typing, measure_overhead
+
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+
+def f(a: int, b: int) -> int:
+    return a + b
+
+
+class TestBench(TestCase):
+    def test_summarize(self):
+        stats = summarize(list(range(1, 102)))
+        self.assertEqual(stats.median, 51)
+        self.assertEqual((stats.q1, stats.q3), (26, 76))
+        self.assertEqual(stats.iqr, 50)
+        self.assertTrue(stats.ci_low < 51 < stats.ci_high)
+        self.assertEqual((stats.ci_low, stats.ci_high), (41, 62))
+        self.assertEqual(stats.n, 101)
+
+        stats = summarize([3.0])
+        self.assertEqual((stats.median, stats.ci_low, stats.ci_high), (3.0, 3.0, 3.0))
+
+    def test_benchmark(self):
+        results = benchmark(
+            f,
+            {"assert": assert_correct_typing, "plain": lambda func: func},
+            args=(1, 2),
+            repeat=5,
+            number=1000,
+            warmup=1,
+        )
+        self.assertEqual(list(results), ["assert", "plain"])
+
+        result = results["assert"]
+        self.assertEqual(result.overhead_ns.n, 5)
+        self.assertGreater(result.ratio.median, 1)
+        self.assertGreater(result.overhead_ns.median, 0)
+        self.assertLessEqual(result.ratio.ci_low, result.ratio.median)
+
+        self.assertEqual(len(format_results(results).splitlines()), 3)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.json")
+            text = to_json(results, path, name="test")
+            with open(path) as file:
+                data = json.load(file)
+        self.assertEqual(data, json.loads(text))
+        self.assertEqual(data["metadata"]["name"], "test")
+        self.assertIn("iqr", data["results"]["assert"]["overhead_ns"])
+
+    def test_measure_overhead(self):
+        g = measure_overhead(assert_correct_typing, repeat=3)(f)
+        self.assertGreater(g(1, 2), 1)
+
+    def test_compare(self):
+        def run(*results):
+            return {
+                "results": {
+                    name: {"ratio": {"median": m, "ci_low": low, "ci_high": high}}
+                    for name, m, low, high in results
+                }
+            }
+
+        baseline = run(("a", 2.0, 1.9, 2.1), ("b", 2.0, 1.5, 2.5), ("c", 1.0, 1, 1))
+        current = run(("a", 3.0, 2.9, 3.1), ("b", 3.0, 2.0, 4.0), ("d", 1.0, 1, 1))
+
+        comparisons = compare(baseline, current, threshold=0.1)
+        self.assertEqual([c.name for c in comparisons], ["a", "b"])
+        self.assertAlmostEqual(comparisons[0].change, 0.5)
+        self.assertTrue(comparisons[0].regression)
+        self.assertFalse(comparisons[1].regression)  # Overlapping intervals
+
+        self.assertFalse(compare(baseline, current, threshold=0.6)[0].regression)
+        self.assertIn("!", format_comparisons(comparisons).splitlines()[1])
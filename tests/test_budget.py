@@ -0,0 +1,67 @@
+from strong.core.budget import LEVELS, OverheadController
+from strong.core.decorators import assert_correct_typing
+
+from typing import List
+
+from unittest import TestCase
+
+
+class TestBudget(TestCase):
+    def test_overhead_controller(self):
+        controller = OverheadController(0.1, window=4)
+
+        def measures_until_change(check_time):
+            for n in range(1, 1000):
+                if controller.update(check_time, 1.0) is not None:
+                    return n
+
+        # 1. Check that the level decreases while over budget
+
+        for level in range(1, len(LEVELS)):
+            self.assertEqual(measures_until_change(10.0), 4)
+            self.assertEqual(controller.level, level)
+        for _ in range(8):
+            self.assertIsNone(controller.update(10.0, 1.0))
+
+        # 2. Check that the level increases with headroom, and backs off
+
+        measures_until_change(0.0)
+        self.assertEqual(controller.level, len(LEVELS) - 2)
+
+        self.assertEqual(measures_until_change(10.0), 4)
+        self.assertEqual(controller.patience, 8)
+        self.assertEqual(measures_until_change(0.0), 8)
+        self.assertEqual(controller.level, len(LEVELS) - 2)
+
+        for _ in range(4):
+            controller.update(0.0, 1.0)
+        self.assertEqual(controller.patience, 4)
+
+        with self.assertRaises(ValueError):
+            OverheadController(0)
+
+    def test_budget(self):
+        def f(a: List[int]) -> int:
+            return 0
+
+        # 1. Check that expensive checks are degraded
+
+        g = assert_correct_typing(f, budget=0.01)
+        self.assertEqual(g.controller.level, 0)
+
+        a = list(range(1000))
+        for _ in range(1000):
+            g(a)
+        self.assertGreater(g.controller.level, 0)
+        self.assertEqual(g.controller.levels[0][0].mode, "full")
+
+        # 2. Check that errors are still reported
+
+        g = assert_correct_typing(f, budget=0.01)
+        with self.assertRaises(AssertionError):
+            g(["1"])
+        with self.assertRaises(AssertionError):
+            g(None)
+
+        with self.assertRaises(ValueError):
+            assert_correct_typing(f, budget=0.01, sample_every=2)
@@ -0,0 +1,116 @@
+from strong.core.constraints import (
+    Constraint,
+    Finite,
+    Ge,
+    Gt,
+    Le,
+    Lt,
+    Range,
+    Predicate,
+)
+from strong.core.decorators import assert_correct_typing, check_correct_typing
+from strong.core.signature import check_obj_typing, compile_obj_typing, FULL
+from typing import Any, List
+
+from unittest import TestCase, skipIf
+
+try:
+    from typing import Annotated
+except ImportError:  # Python 3.8
+    Annotated = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@skipIf(Annotated is None, "typing.Annotated requires Python 3.9")
+class TestConstraints(TestCase):
+    def test_check_obj_typing(self):
+
+        # 1. Check for correct typing
+
+        args = [
+            (3, Annotated[int, Range(0, 255)]),
+            (0, Annotated[int, Ge(0), Lt(1)]),
+            (1.5, Annotated[float, Gt(1), Le(1.5), Finite()]),
+            ("a", Annotated[str, Predicate(str.islower)]),
+            ([1, 2], Annotated[List[int], "not a constraint"]),
+        ]
+
+        for i, arg in enumerate(args):
+            with self.subTest(i=i):
+                self.assertTrue(check_obj_typing(arg[0], arg[1]))
+
+        # 2. Check for incorrect typing
+
+        args = [
+            (256, Annotated[int, Range(0, 255)]),
+            (3.0, Annotated[int, Range(0, 255)]),
+            (1, Annotated[int, Ge(0), Lt(1)]),
+            (float("nan"), Annotated[float, Finite()]),
+            ("A", Annotated[str, Predicate(str.islower)]),
+        ]
+
+        for i, arg in enumerate(args):
+            with self.subTest(i=i):
+                self.assertFalse(check_obj_typing(arg[0], arg[1]))
+
+        self.assertFalse(check_obj_typing([1, -1], List[Annotated[int, Ge(0)]], FULL))
+
+    def test_every(self):
+        checker = compile_obj_typing(Annotated[int, Ge(0, every=3)])
+        self.assertEqual(
+            [checker(-1) for _ in range(6)], [False, True, True, False, True, True]
+        )
+        self.assertEqual(repr(Range(0, 1, every=2)), "Range(0, 1, every=2)")
+
+        # 1. Check that each parameter has its own counter
+
+        messages = []
+        positive = Annotated[int, Ge(0, every=2)]
+
+        @check_correct_typing(output=messages.append, join=False)
+        def f(a: positive, b: positive) -> None:
+            pass
+
+        @check_correct_typing(output=messages.append, join=False)
+        def g(a: positive) -> None:
+            pass
+
+        f(-1, -1)
+        g(-1)
+        self.assertEqual(len(messages), 3)
+        f(-1, -1)
+        g(-1)
+        self.assertEqual(len(messages), 3)
+        f(-1, -1)
+        self.assertEqual(len(messages), 5)
+
+        with self.assertRaises(TypeError):
+            Constraint()
+
+    @skipIf(np is None, "NumPy is not installed")
+    def test_arrays(self):
+        @assert_correct_typing
+        def f(
+            a: Annotated[np.ndarray, Ge(0), Finite()],
+            b: Annotated[np.ndarray, Range(0, 1)] = None,
+        ) -> None:
+            pass
+
+        f(np.ones(3))
+        f(np.ones(3), b=np.zeros(0))
+
+        for a in [-np.ones(3), np.array([1, np.nan])]:
+            with self.assertRaises(AssertionError):
+                f(a)
+
+        with self.assertRaises(AssertionError):
+            f(np.ones(3), b=np.full(3, 2))
+
+        # Arrays of other dtypes fail the checks instead of raising TypeError
+        for a in [np.array(["a"]), np.array([None])]:
+            with self.subTest(a=a):
+                self.assertFalse(check_obj_typing(a, Annotated[Any, Finite()]))
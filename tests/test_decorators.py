@@ -1,14 +1,30 @@
-from strong.core.decorators import assert_correct_typing
+from strong.core.decorators import assert_correct_typing, warmup, _is_enabled
+from strong.core.proxies import CheckedAsyncGenerator, CheckedGenerator, CheckedIterator
+from strong.core.signature import (
+    FULL,
+    SHALLOW,
+    first_elements,
+    get_function_context,
+    get_function_typing_plan,
+)
 from functions import (
     f_mul_int_typed,
     f_mul_int_missing_one,
     f_mul_int_missing_two,
     f_mul_int_missing_all,
     f_mul_int_typed_kwd,
+    f_mul_int_typed_from_string,
 )
 from objects import SubInt
 
-from unittest import TestCase
+from typing import Any, AsyncIterator, Dict, Generator, Iterable, Iterator, List
+import asyncio
+import inspect
+import io
+import os
+import threading
+
+from unittest import TestCase, mock
 
 
 class TestDecorators(TestCase):
@@ -141,3 +157,281 @@ class TestDecorators(TestCase):
         except AssertionError as e:
             error = e
         assert isinstance(error, AssertionError), assert_msg
+
+    def test_elements(self):
+        def f(a: List[int], b: Dict[str, float] = None) -> List[int]:
+            return a
+
+        f_s = assert_correct_typing(f)
+        f_f = assert_correct_typing(f, elements=FULL)
+
+        f_s(["1"], b={"a": "b"})
+        f_f([1], b={"a": 1.0})
+
+        with self.assertRaises(AssertionError):
+            f_f(["1"])
+
+        with self.assertRaises(AssertionError):
+            f_f([1], b={"a": "b"})
+
+    def test_lazy_context(self):
+        with mock.patch(
+            "strong.core.decorators.get_function_context",
+            wraps=get_function_context,
+        ) as context:
+            f = assert_correct_typing(f_mul_int_typed)
+            f(1, 2)
+            self.assertEqual(context.call_count, 0)
+
+            for _ in range(2):
+                with self.assertRaises(AssertionError) as error:
+                    f(1, 2.0)
+            self.assertEqual(context.call_count, 1)
+
+        self.assertIn("functions.py:5:f_mul_int_typed", str(error.exception))
+
+        f = assert_correct_typing(f_mul_int_typed_from_string)
+
+        with self.assertRaises(AssertionError) as error:
+            f(1, 2.0)
+        self.assertIn("<string>:1:", str(error.exception))
+
+    def test_lazy(self):
+        with mock.patch(
+            "strong.core.decorators.get_function_typing_plan",
+            wraps=get_function_typing_plan,
+        ) as plan:
+
+            # 1. Check that the plan is built once, on first call
+
+            f = assert_correct_typing(f_mul_int_typed, lazy=True)
+            self.assertEqual(plan.call_count, 0)
+
+            threads = [threading.Thread(target=f, args=(1, 2)) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(plan.call_count, 1)
+
+            with self.assertRaises(AssertionError):
+                f(1, 2.0)
+            self.assertEqual(plan.call_count, 1)
+
+            # 2. Check warmup
+
+            g = assert_correct_typing(f_mul_int_typed_kwd, lazy=True)
+            h = assert_correct_typing(f_mul_int_missing_one, lazy=True)
+            self.assertEqual(warmup(g), 1)
+            self.assertEqual(plan.call_count, 2)
+            warmup()
+            self.assertEqual(plan.call_count, 3)
+            self.assertEqual(warmup(), 0)
+
+            g(1)
+            h(1, 2)
+            self.assertEqual(plan.call_count, 3)
+
+    def test_sampling(self):
+        def failures(f, n):
+            failed = []
+            for i in range(n):
+                try:
+                    f(1, 2.0)
+                except AssertionError:
+                    failed.append(i)
+            return failed
+
+        # 1. Check one call every N, with the seed setting the first one
+
+        f = assert_correct_typing(f_mul_int_typed, sample_every=4, seed=1)
+        self.assertEqual(failures(f, 12), [1, 5, 9])
+
+        f = assert_correct_typing(f_mul_int_typed, sample_every=1)
+        self.assertEqual(len(failures(f, 12)), 12)
+
+        # 2. Check that sampling is deterministic
+
+        f = assert_correct_typing(f_mul_int_typed, sample_rate=0.1, seed=3)
+        g = assert_correct_typing(f_mul_int_typed, sample_rate=0.1, seed=3)
+        sampled = failures(f, 2000)
+        self.assertEqual(sampled, failures(g, 2000))
+        self.assertTrue(100 < len(sampled) < 300)
+
+        f = assert_correct_typing(f_mul_int_typed, sample_rate=0.1)
+        g = assert_correct_typing(f_mul_int_typed, sample_rate=0.1)
+        self.assertEqual(failures(f, 100), failures(g, 100))
+
+        # 3. Check invalid options
+
+        for kwargs in (
+            {"sample_every": 0},
+            {"sample_rate": 0},
+            {"sample_rate": 1.5},
+            {"sample_every": 2, "sample_rate": 0.5},
+        ):
+            with self.subTest(**kwargs):
+                with self.assertRaises(ValueError):
+                    assert_correct_typing(f_mul_int_typed, **kwargs)
+
+    def test_kill_switch(self):
+        import strong
+
+        # 1. Check that functions are returned as is when disabled
+
+        with mock.patch("strong.core.decorators.ENABLED", False):
+            self.assertIs(assert_correct_typing(f_mul_int_typed), f_mul_int_typed)
+            self.assertIs(
+                assert_correct_typing(lazy=True)(f_mul_int_typed), f_mul_int_typed
+            )
+            self.assertEqual(warmup(f_mul_int_typed), 0)
+
+        for value, enabled in (("", True), ("0", True), ("1", False), ("yes", False)):
+            with self.subTest(value=value):
+                with mock.patch.dict(os.environ, {"STRONG_DISABLE": value}):
+                    self.assertEqual(_is_enabled(), enabled)
+
+        # 2. Check that calls are not checked in suspended blocks
+
+        f = strong.assert_correct_typing(f_mul_int_typed)
+
+        with strong.suspended():
+            self.assertEqual(f(1, 2.0), 1.0)
+            with strong.suspended():
+                f(1, 2.0)
+            f(1, 2.0)
+
+        with self.assertRaises(AssertionError):
+            f(1, 2.0)
+
+    def test_coroutine(self):
+        @assert_correct_typing
+        async def f(a: int, b: int) -> float:
+            await asyncio.sleep(0)
+            return a * b * 0.5
+
+        self.assertTrue(inspect.iscoroutinefunction(f))
+        self.assertEqual(asyncio.run(f(1, 2)), 1.0)
+
+        with self.assertRaises(AssertionError):
+            asyncio.run(f(1, 2.0))
+
+        @assert_correct_typing(sample_every=2, seed=0)
+        async def g(a: int) -> float:
+            return a
+
+        with self.assertRaises(AssertionError) as error:
+            asyncio.run(g(1))
+        self.assertIn("Return value", str(error.exception))
+        self.assertEqual(asyncio.run(g(1)), 1)
+
+        h = assert_correct_typing(f, budget=0.5)
+        for _ in range(20):
+            self.assertEqual(asyncio.run(h(1, 2)), 1.0)
+
+    def test_generators(self):
+        @assert_correct_typing
+        def f(n: int) -> Iterator[int]:
+            for i in range(n):
+                yield i if i != 5 else "5"
+
+        # 1. Check that items are checked lazily
+
+        items = f(10)
+        self.assertIsInstance(items, CheckedGenerator)
+        self.assertEqual([next(items) for _ in range(5)], [0, 1, 2, 3, 4])
+        with self.assertRaises(AssertionError) as error:
+            next(items)
+        self.assertIn("Yielded value", str(error.exception))
+
+        with self.assertRaises(AssertionError):
+            f("10")
+
+        g = assert_correct_typing(f.__wrapped__, yields=SHALLOW)
+        self.assertEqual(len(list(g(10))), 10)
+        g = assert_correct_typing(f.__wrapped__, yields=first_elements(5))
+        self.assertEqual(len(list(g(10))), 10)
+
+        # 2. Check return values of generators
+
+        @assert_correct_typing
+        def h(value: Any) -> Generator[int, None, str]:
+            yield 1
+            return value
+
+        self.assertEqual(list(h("done")), [1])
+        with self.assertRaises(AssertionError):
+            list(h(None))
+
+        # 3. Check asynchronous generators
+
+        @assert_correct_typing
+        async def agen(n: int) -> AsyncIterator[int]:
+            for i in range(n):
+                yield i if i != 2 else None
+
+        async def consume(items):
+            return [item async for item in items]
+
+        self.assertIsInstance(agen(1), CheckedAsyncGenerator)
+        self.assertEqual(asyncio.run(consume(agen(2))), [0, 1])
+        with self.assertRaises(AssertionError):
+            asyncio.run(consume(agen(3)))
+
+        with self.assertRaises(ValueError):
+            assert_correct_typing(agen.__wrapped__, budget=0.1)
+
+    def test_iterators(self):
+        def total(items: Iterable[int], more: Iterator[int] = iter(())) -> int:
+            return sum(items) + sum(more)
+
+        def lines(n: int) -> Iterator[str]:
+            return iter(["line"] * n + [None])
+
+        # 1. Check that iterators are left untouched by default
+
+        f = assert_correct_typing(total)
+        self.assertEqual(f([1, 2]), 3)
+        self.assertEqual(f(x for x in (1, 2)), 3)
+
+        # 2. Check that items of iterators are checked as they are consumed
+
+        f = assert_correct_typing(total, iterators=FULL)
+        self.assertEqual(f([1, 2], more=iter([3])), 6)
+        self.assertEqual(f(x for x in (1, 2)), 3)
+
+        with self.assertRaises(AssertionError) as error:
+            f(x for x in (1, "2"))
+        self.assertIn("Item of `items`", str(error.exception))
+        with self.assertRaises(AssertionError):
+            f([], more=iter([1.0]))
+
+        # Collections are not consumed by checks, nor replaced
+        with self.assertRaises(TypeError):
+            f([1, "2"])
+
+        g = assert_correct_typing(total, iterators=first_elements(2))
+        with self.assertRaises(TypeError):
+            g(x for x in (1, 2, "3"))
+
+        # 3. Check return values
+
+        g = assert_correct_typing(lines, iterators=FULL)
+        items = g(2)
+        self.assertIsInstance(items, CheckedIterator)
+        self.assertEqual(next(items), "line")
+        self.assertEqual(next(items), "line")
+        with self.assertRaises(AssertionError):
+            next(items)
+
+        with self.assertRaises(AssertionError):
+            g("2")
+
+        # 4. Check that other attributes of the iterators are still available
+
+        def first_line(f: Iterator[str]) -> str:
+            line = next(f)
+            return line + f.readline()
+
+        h = assert_correct_typing(first_line, iterators=FULL)
+        self.assertEqual(h(io.StringIO("a\nb\nc\n")), "a\nb\n")
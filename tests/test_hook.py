@@ -0,0 +1,153 @@
+from strong.core import hook
+from strong.core.hook import install_import_hook, uninstall_import_hook
+from strong.utils.output import raise_assertion_error
+
+import importlib
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+import warnings
+from unittest import TestCase, mock
+
+SOURCE = '''"""Docstring."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List, Optional
+
+from strong.core.decorators import assert_correct_typing
+
+if TYPE_CHECKING:
+    from decimal import Decimal
+
+
+def f(a: int, b: List[int] = [], *args: str, c: Optional[float] = None) -> float:
+    """Docstring."""
+    if a < 0:
+        return "negative"
+    return a * 0.5
+
+
+def no_return(a: int) -> int:
+    pass
+
+
+class Foo:
+    def method(self, other: Foo) -> Foo:
+        def inner(x: str) -> str:
+            return x
+
+        return other
+
+    def gen(self, n: int):
+        yield n
+
+
+@assert_correct_typing
+def decorated(a: int) -> int:
+    return a
+
+
+def type_checking_only(a: Decimal) -> int:
+    return 1
+'''
+
+
+class TestHook(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        os.mkdir(os.path.join(self.tmp.name, "hooked"))
+        self.path = os.path.join(self.tmp.name, "hooked", "__init__.py")
+        with open(self.path, "w") as f:
+            f.write(SOURCE)
+        sys.path.insert(0, self.tmp.name)
+        self.hook = install_import_hook(["hooked"], output=raise_assertion_error)
+
+    def tearDown(self):
+        uninstall_import_hook(self.hook)
+        sys.path.remove(self.tmp.name)
+        sys.modules.pop("hooked", None)
+        self.tmp.cleanup()
+
+    def test_import_hook(self):
+        import hooked
+
+        # 1. Check arguments and return values
+
+        self.assertEqual(hooked.f(2), 1.0)
+        self.assertEqual(hooked.f(2, [1], "x", c=1.0), 1.0)
+        self.assertEqual(hooked.f.__doc__, "Docstring.")
+        self.assertEqual(hooked.__doc__, "Docstring.")
+
+        for args, kwargs in (
+            (("2",), {}),
+            ((-1,), {}),
+            ((2, ()), {}),
+            ((2, [], 1), {}),
+            ((2,), {"c": "1"}),
+        ):
+            with self.subTest(args=args, kwargs=kwargs):
+                with self.assertRaises(AssertionError) as error:
+                    hooked.f(*args, **kwargs)
+                self.assertIn("__init__.py:12:f", str(error.exception))
+
+        with self.assertRaises(AssertionError):
+            hooked.no_return(1)
+
+        # 2. Check methods, with forward references
+
+        foo = hooked.Foo()
+        self.assertIs(foo.method(foo), foo)
+        with self.assertRaises(AssertionError) as error:
+            foo.method(1)
+        self.assertIn("Foo.method", str(error.exception))
+
+        # 3. Check that generators and decorated functions are left untouched
+
+        self.assertEqual(list(foo.gen("1")), ["1"])
+        self.assertEqual(hooked.decorated.__wrapped__("1"), "1")
+
+        # 4. Check that annotations which never resolve are not checked
+
+        with self.assertWarns(Warning):
+            self.assertEqual(hooked.type_checking_only("1"), 1)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")  # Only warned once
+            self.assertEqual(hooked.type_checking_only(1), 1)
+
+    def test_bytecode_cache(self):
+        with mock.patch.object(sys, "dont_write_bytecode", False):
+            import hooked
+
+        cache = importlib.util.cache_from_source(self.path, optimization=hook._OPTIMIZATION_)
+        self.assertTrue(os.path.exists(cache))
+
+        # The regular bytecode is not overwritten
+        self.assertFalse(os.path.exists(importlib.util.cache_from_source(self.path)))
+
+        del sys.modules["hooked"]
+        loader = type(hooked.__loader__)
+        with mock.patch.object(
+            loader, "source_to_code", wraps=hooked.__loader__.source_to_code
+        ) as source_to_code:
+            hooked = importlib.import_module("hooked")
+            self.assertEqual(source_to_code.call_count, 0)
+
+        with self.assertRaises(AssertionError):
+            hooked.f("2")
+
+    def test_disabled(self):
+        with mock.patch("strong.core.decorators.ENABLED", False):
+            self.assertIsNone(install_import_hook(["hooked"]))
+
+
+class TestLazyImport(TestCase):
+    def test_import_strong(self):
+        code = (
+            "import sys, strong\n"
+            "assert 'strong.core.hook' not in sys.modules\n"
+            "assert strong.install_import_hook is not None\n"
+            "assert 'strong.core.hook' in sys.modules\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,118 @@
+import strong
+from strong.core.decorators import assert_correct_typing
+from strong.core.instrument import is_instrumented, iter_functions
+from strong.utils.output import raise_assertion_error
+
+import types
+from unittest import TestCase
+
+SOURCE = """
+from typing import List
+from strong.core.decorators import assert_correct_typing
+
+
+def f(a: int) -> int:
+    return a
+
+
+def g(a):
+    return a
+
+
+@assert_correct_typing
+def h(a: int) -> int:
+    return a
+
+
+class Foo:
+    def method(self, a: int) -> int:
+        return a
+
+    @classmethod
+    def build(cls, a: int) -> "Foo":
+        return cls()
+
+    @staticmethod
+    def static(a: int) -> int:
+        return a
+
+    class Inner:
+        def method(self, a: int) -> int:
+            return a
+
+
+Alias = Foo
+"""
+
+
+def make_module():
+    module = types.ModuleType("instrumented")
+    exec(SOURCE, module.__dict__)
+    return module
+
+
+class TestInstrument(TestCase):
+    def test_iter_functions(self):
+        module = make_module()
+        names = [name for _, name, _, _ in iter_functions(module)]
+        self.assertEqual(names, ["f", "g", "h", "method", "build", "static"])
+
+        # Imported functions are skipped, nested classes are walked
+        self.assertNotIn("assert_correct_typing", names)
+        self.assertNotIn("List", names)
+        names = [name for _, name, _, _ in iter_functions(module, depth=2)]
+        self.assertEqual(names.count("method"), 2)
+
+    def test_instrument_module(self):
+        module = make_module()
+        h = module.h
+        strong.instrument_module(module, depth=2, output=raise_assertion_error)
+
+        # 1. Check that annotated functions are wrapped once
+
+        self.assertTrue(is_instrumented(module.f))
+        self.assertFalse(is_instrumented(module.g))
+        self.assertIs(module.h, h)
+        self.assertEqual(module.Foo.__dict__["method"].__wrapped__.__name__, "method")
+
+        with self.assertRaises(AssertionError):
+            module.f("1")
+
+        # 2. Check methods, classmethods and staticmethods
+
+        foo = module.Foo()
+        self.assertEqual(foo.method(1), 1)
+        self.assertIsInstance(module.Foo.build(1), module.Foo)
+        self.assertEqual(module.Foo.static(1), 1)
+        self.assertIsInstance(module.Foo.__dict__["build"], classmethod)
+        self.assertIsInstance(module.Foo.__dict__["static"], staticmethod)
+
+        for call in (
+            lambda: foo.method("1"),
+            lambda: module.Foo.build("1"),
+            lambda: foo.static("1"),
+            lambda: module.Foo.Inner().method("1"),
+        ):
+            with self.assertRaises(AssertionError):
+                call()
+
+        # 3. Check that instrumenting twice does not wrap twice
+
+        method = module.Foo.__dict__["method"]
+        strong.instrument_module(module)
+        self.assertIs(module.Foo.__dict__["method"], method)
+
+    def test_instrument_class(self):
+        module = make_module()
+
+        @strong.instrument_class(decorator=assert_correct_typing)
+        class Bar(module.Foo):
+            def other(self, a: str) -> None:
+                pass
+
+        with self.assertRaises(AssertionError):
+            Bar().other(1)
+
+        # Inherited methods are instrumented with their own class only
+        self.assertEqual(Bar().method("1"), "1")
+        self.assertIs(strong.instrument_class(Bar), Bar)
@@ -0,0 +1,120 @@
+from strong.core.decorators import (
+    assert_correct_typing,
+    suspended,
+    warn_if_incorrect_typing,
+)
+from strong.core.metrics import (
+    METRICS,
+    RETURN,
+    MetricsRegistry,
+    get_function_name,
+    merge,
+    to_prometheus,
+)
+
+from typing import List
+import warnings
+
+from unittest import TestCase
+
+
+class TestMetrics(TestCase):
+    def test_decorators(self):
+        registry = MetricsRegistry()
+
+        @warn_if_incorrect_typing(metrics=registry)
+        def f(a: int, *b: int, c: List[int] = None) -> int:
+            return a
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            f(1, 2, "3", c=[4])
+            f("1")
+        with suspended():
+            f(1)
+
+        self.assertIs(f.metrics, registry.functions[get_function_name(f)])
+        self.assertEqual(
+            registry.snapshot()[get_function_name(f)],
+            {
+                "checked": 2,
+                "skipped": 1,
+                "failures": 3,
+                "check_time_ns": 0,
+                "params": {
+                    "a": {"checked": 2, "failures": 1, "check_time_ns": 0},
+                    "b": {"checked": 2, "failures": 1, "check_time_ns": 0},
+                    "c": {"checked": 1, "failures": 0, "check_time_ns": 0},
+                    RETURN: {"checked": 2, "failures": 1, "check_time_ns": 0},
+                },
+            },
+        )
+
+        # 1. Check sampled calls, timing and the default registry
+
+        registry = MetricsRegistry(timing=True)
+
+        @assert_correct_typing(metrics=registry, sample_every=4, seed=0)
+        def g(a: int) -> int:
+            return a
+
+        for i in range(8):
+            g(i)
+
+        metrics = g.metrics
+        self.assertEqual((metrics.checked, metrics.skipped), (2, 6))
+        self.assertGreater(metrics.check_time_ns, 0)
+        self.assertGreater(metrics.params["a"].check_time_ns, 0)
+
+        @assert_correct_typing(metrics=True, lazy=True)
+        def h(a: int) -> None:
+            pass
+
+        h(1)
+        self.assertEqual(METRICS.snapshot()[get_function_name(h)]["checked"], 1)
+        self.assertFalse(hasattr(assert_correct_typing(h.__wrapped__), "metrics"))
+
+    def test_merge_and_export(self):
+        a = {
+            "m.f": {
+                "checked": 1,
+                "skipped": 2,
+                "failures": 0,
+                "check_time_ns": 10,
+                "params": {"a": {"checked": 1, "failures": 0, "check_time_ns": 10}},
+            }
+        }
+        b = {
+            "m.f": {
+                "checked": 3,
+                "skipped": 0,
+                "failures": 1,
+                "check_time_ns": 5,
+                "params": {"a": {"checked": 3, "failures": 1, "check_time_ns": 5}},
+            },
+            'm."g"': {
+                "checked": 1,
+                "skipped": 0,
+                "failures": 0,
+                "check_time_ns": 0,
+                "params": {},
+            },
+        }
+
+        merged = merge(a, b)
+        self.assertEqual(merged["m.f"]["checked"], 4)
+        self.assertEqual(merged["m.f"]["skipped"], 2)
+        self.assertEqual(
+            merged["m.f"]["params"]["a"],
+            {"checked": 4, "failures": 1, "check_time_ns": 15},
+        )
+        self.assertEqual(merge(merged), merged)
+
+        text = to_prometheus(merged)
+        self.assertIn("# TYPE strong_calls_checked_total counter\n", text)
+        self.assertIn('strong_calls_checked_total{function="m.f"} 4\n', text)
+        self.assertIn('strong_calls_checked_total{function="m.\\"g\\""} 1\n', text)
+        self.assertIn(
+            'strong_parameter_failures_total{function="m.f",parameter="a"} 1\n', text
+        )
+        self.assertIn('strong_check_seconds_total{function="m.f"} 1.5e-08\n', text)
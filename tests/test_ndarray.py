@@ -0,0 +1,139 @@
+from strong.core.decorators import assert_correct_typing
+from strong.core.signature import check_columns, check_obj_typing, call_scope
+from typing import Any, List, Optional
+import warnings
+
+from unittest import TestCase, skipIf
+
+try:
+    import numpy as np
+    import numpy.typing as npt
+    from strong.core.ndarray import Dim, NDArray
+
+    import postponed_ndarray
+except ImportError:
+    np = None
+
+
+@skipIf(np is None, "NumPy is not installed")
+class TestNDArray(TestCase):
+    def test_check_obj_typing(self):
+
+        a = np.zeros((2, 3))
+
+        # 1. Check for correct typing
+
+        args = [
+            NDArray,
+            NDArray[Any],
+            NDArray[float],
+            NDArray["f8"],
+            NDArray["float64"],
+            NDArray[np.floating],
+            NDArray[np.float64],
+            NDArray[float, (2, 3)],
+            NDArray[float, (None, 3)],
+            NDArray[float, 2],
+            NDArray[float, (..., 3)],
+            NDArray[float, (2, ...)],
+            NDArray[float, Any, "C"],
+            Optional[NDArray[float]],
+            npt.NDArray[np.float64],
+            np.ndarray,
+        ]
+
+        for i, tp in enumerate(args):
+            with self.subTest(i=i):
+                self.assertTrue(check_obj_typing(a, tp))
+
+        # 2. Check for incorrect typing
+
+        args = [
+            NDArray[int],
+            NDArray["f"],
+            NDArray["i8"],
+            NDArray[np.integer],
+            NDArray[np.float32],
+            NDArray[float, (2, 4)],
+            NDArray[float, 3],
+            NDArray[float, (..., 2)],
+            NDArray[float, (..., 1, 2, 3)],
+            NDArray[float, ("n", "n")],
+            NDArray[float, Any, "F"],
+            npt.NDArray[np.int8],
+            List[NDArray],
+        ]
+
+        for i, tp in enumerate(args):
+            with self.subTest(i=i):
+                self.assertFalse(check_obj_typing(a, tp))
+
+        self.assertFalse(check_obj_typing([0.0], NDArray))
+
+    def test_dtype_strings(self):
+
+        # Strings are NumPy dtype specifications, e.g. "b" is int8 and not bool
+        self.assertTrue(check_obj_typing(np.zeros(2, dtype=np.int8), NDArray["b"]))
+        self.assertFalse(check_obj_typing(np.zeros(2, dtype=bool), NDArray["b"]))
+        self.assertTrue(check_obj_typing(np.zeros(2, dtype=bool), NDArray["?"]))
+        self.assertFalse(check_obj_typing(np.zeros(2, dtype=np.int8), NDArray["?"]))
+
+    def test_check_columns(self):
+        n = Dim("n")
+
+        def f(a: NDArray[float, (n,)], b: NDArray[float, (n,)], c: int):
+            pass
+
+        records = [
+            (np.zeros(2), np.zeros(2), 1),
+            (np.zeros(2), np.zeros(3), 1),  # Sizes of `n` differ
+            (np.zeros(3), np.zeros(3), "1"),
+            (np.zeros(4), np.zeros(4), 1),
+        ]
+        self.assertEqual(check_columns(records, f), [1, 2])
+
+    def test_postponed_annotations(self):
+
+        f = assert_correct_typing(postponed_ndarray.f_strings)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")  # Not replaced with Any
+            self.assertEqual(f(np.zeros(2), np.zeros(2)), 1)
+
+        for args in (
+            (np.zeros(2, dtype=np.int32), np.zeros(2)),
+            (np.zeros(2), np.zeros(3)),
+            (np.zeros(2), np.zeros(4)[::2]),
+        ):
+            with self.subTest(args=args):
+                with self.assertRaises(AssertionError):
+                    f(*args)
+
+    def test_symbolic_dimensions(self):
+
+        tp = NDArray[float, ("n",)]
+
+        with call_scope():
+            self.assertTrue(check_obj_typing(np.zeros(3), tp))
+            self.assertFalse(check_obj_typing(np.zeros(4), tp))
+
+        m, n = Dim("m"), Dim("n")
+
+        @assert_correct_typing
+        def dot(
+            a: NDArray[float, (m, n)], b: NDArray[float, (n,)]
+        ) -> NDArray[float, (m,)]:
+            return a @ b
+
+        @assert_correct_typing
+        def transpose(a: NDArray[Any, (m, n)]) -> NDArray[Any, (m, n)]:
+            return a.T
+
+        dot(np.ones((2, 3)), np.ones(3))
+        dot(np.ones((3, 2)), np.ones(2))
+        transpose(np.ones((2, 2)))
+
+        with self.assertRaises(AssertionError):
+            dot(np.ones((2, 3)), np.ones(2))
+
+        with self.assertRaises(AssertionError):
+            transpose(np.ones((2, 3)))
@@ -0,0 +1,132 @@
+from strong.core.decorators import check_correct_typing
+from strong.utils.output import BackgroundOutput
+
+import io
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from unittest import TestCase, mock
+
+
+class TestOutput(TestCase):
+    def test_background_output(self):
+        stream = io.StringIO()
+        output = BackgroundOutput(stream, maxlen=2, interval=60)
+
+        # 1. Check that messages are only enqueued, and the oldest dropped
+
+        for msg in ("a", "b", "c"):
+            output(msg)
+
+        self.assertEqual(stream.getvalue(), "")
+        self.assertEqual(output.dropped, 1)
+
+        output.flush()
+        self.assertEqual(
+            stream.getvalue(), "b\nc\n1 message(s) dropped by strong's output\n"
+        )
+
+        # 2. Check that closing writes the waiting messages, and later ones
+
+        output("d")
+        output.close()
+        self.assertEqual(stream.getvalue().splitlines()[-1], "d")
+        output("e")
+        self.assertEqual(stream.getvalue().splitlines()[-1], "e")
+
+        # 3. Check that the background thread writes batches
+
+        stream = io.StringIO()
+        output = BackgroundOutput(stream, interval=0.01)
+
+        @check_correct_typing(output=output, join=False)
+        def f(a: int, b: int) -> int:
+            return a
+
+        f("1", "2")
+        for _ in range(500):
+            if stream.getvalue():
+                break
+            time.sleep(0.01)
+        output.close()
+
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(sum("does not match typing" in line for line in lines), 3)
+
+    def test_background_output_targets(self):
+        records = []
+
+        class Handler(logging.Handler):
+            def emit(self, record):
+                records.append((record.levelno, record.getMessage()))
+
+        output = BackgroundOutput(Handler(), interval=60, level=logging.ERROR)
+        output("a")
+        output.close()
+        self.assertEqual(records, [(logging.ERROR, "a")])
+
+        logger = logging.getLogger("strong.tests.output")
+        logger.propagate = False
+        logger.addHandler(Handler())
+        output = BackgroundOutput(logger, interval=60)
+        output("b")
+        output.close()
+        self.assertEqual(records[-1], (logging.WARNING, "b"))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "errors.log")
+            output = BackgroundOutput(path, interval=60)
+            output("c")
+            output("d")
+            output.close()
+            output("e")  # Written synchronously, without leaving the file open
+            self.assertIsNone(output._file)
+            with open(path) as file:
+                self.assertEqual(file.read(), "c\nd\ne\n")
+
+        with self.assertRaises(ValueError):
+            BackgroundOutput(maxlen=0)
+
+    def test_background_output_errors(self):
+        class Stream(io.StringIO):
+            fail = True
+
+            def write(self, s):
+                if self.fail:
+                    self.fail = False
+                    raise OSError("disk full")
+                return super().write(s)
+
+        # 1. Check that the thread reports the error and keeps writing
+
+        stream = Stream()
+        output = BackgroundOutput(stream, interval=0.01)
+        with mock.patch.object(sys, "stderr", io.StringIO()) as stderr:
+            output("a")
+            for _ in range(500):
+                if stderr.getvalue():
+                    break
+                time.sleep(0.01)
+            self.assertIn("OSError: disk full", stderr.getvalue())
+            self.assertTrue(output._thread.is_alive())
+
+            output("b")
+            for _ in range(500):
+                if stream.getvalue():
+                    break
+                time.sleep(0.01)
+            output.close()
+        self.assertEqual(stream.getvalue(), "b\n")
+
+        # 2. Check that a forked child does not write the parent's messages
+
+        stream = io.StringIO()
+        output = BackgroundOutput(stream, maxlen=1, interval=60)
+        output("a")
+        output("b")
+        output._after_fork()
+        output.close()
+        self.assertEqual(stream.getvalue(), "")
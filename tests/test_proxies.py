@@ -0,0 +1,73 @@
+from strong.core.proxies import (
+    CheckedGenerator,
+    compile_stream_selector,
+    get_stream_types,
+)
+from strong.core.signature import FULL, SHALLOW, first_elements, sampled_elements
+
+from typing import (
+    Any,
+    AsyncIterator,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+)
+
+from unittest import TestCase
+
+
+class TestProxies(TestCase):
+    def test_get_stream_types(self):
+        self.assertEqual(get_stream_types(Iterator[int]), (int, None))
+        self.assertEqual(get_stream_types(Iterable), (Any, None))
+        self.assertEqual(get_stream_types(Generator[int, None, str]), (int, str))
+        self.assertIsNone(get_stream_types(List[int]))
+        self.assertIsNone(get_stream_types(AsyncIterator[int]))
+        self.assertEqual(
+            get_stream_types(AsyncIterator[int], asynchronous=True), (int, None)
+        )
+
+    def test_compile_stream_selector(self):
+        self.assertIsNone(compile_stream_selector(FULL))
+        self.assertFalse(compile_stream_selector(SHALLOW)(0))
+
+        select = compile_stream_selector(first_elements(3))
+        self.assertEqual([i for i in range(10) if select(i)], [0, 1, 2])
+
+        # Logarithmic number of checks, deterministic with a seed
+        select = compile_stream_selector(sampled_elements(4, seed=0))
+        selected = [i for i in range(100000) if select(i)]
+        self.assertEqual(selected[:4], [0, 1, 2, 3])
+        self.assertLess(len(selected), 200)
+
+        select = compile_stream_selector(sampled_elements(4, seed=0))
+        self.assertEqual(selected, [i for i in range(100000) if select(i)])
+
+    def test_checked_generator(self):
+        def gen():
+            received = yield 1
+            yield received
+            return "done"
+
+        items = []
+        returned = []
+        proxy = CheckedGenerator(gen(), items.append, returned.append)
+
+        self.assertEqual(next(proxy), 1)
+        self.assertEqual(proxy.send(2), 2)
+        with self.assertRaises(StopIteration) as stop:
+            next(proxy)
+        self.assertEqual(stop.exception.value, "done")
+        self.assertEqual(items, [1, 2])
+        self.assertEqual(returned, ["done"])
+
+        proxy = CheckedGenerator(gen(), items.append)
+        self.assertEqual(list(proxy), [1, None])
+        proxy = CheckedGenerator(gen(), items.append)
+        next(proxy)
+        self.assertIsNotNone(proxy.gi_frame)
+        self.assertFalse(proxy.gi_running)
+        proxy.close()
+        with self.assertRaises(StopIteration):
+            next(proxy)
@@ -1,6 +1,23 @@
 from strong.core.signature import (
     get_function_parameters,
+    get_function_type_hints,
+    get_function_typing_plan,
     check_obj_typing,
+    compile_obj_typing,
+    clear_typing_cache,
+    set_typing_cache_size,
+    typing_cache_info,
+    tag,
+    TYPING_CACHE_SIZE,
+    FULL,
+    SHALLOW,
+    first_elements,
+    sampled_elements,
+    check_many,
+    check_columns,
+    get_callable_type_hints,
+    clear_callable_cache,
+    resolve_annotation,
 )
 from functions import (
     f_mul_int_typed,
@@ -9,14 +26,75 @@ from functions import (
     f_mul_int_missing_all,
     f_mul_int_typed_kwd,
     f_mul_int_typed_from_string,
+    f_variadic,
+    f_positional_only,
+)
+from objects import Foo, Proxy, SubInt
+import postponed
+from typing import (
+    List,
+    Tuple,
+    Optional,
+    Mapping,
+    Union,
+    Set,
+    Any,
+    Callable,
+    Type,
+    Dict,
+    Sequence,
+    FrozenSet,
+    Literal,
 )
-from objects import Foo, SubInt
-from typing import List, Tuple, Optional, Mapping, Union, Set, Any, Callable, Type
 import inspect
+import abc
+import functools
+import sys
+import unittest
+import warnings
+from unittest import mock
 
 from unittest import TestCase
 
 
+CORRECT_TYPING = [
+    (4, int),
+    (4, Any),
+    (SubInt(), int),
+    (Foo(), Foo),
+    (4, Union[int, float]),
+    (4, Optional[int]),
+    ([4, 5], List[int]),
+    ([4, None], List[Optional[int]]),
+    ([SubInt(4), 4, 3.0, Foo()], List[Union[int, float, Foo]]),
+    ({"k": 1, 2: 3, "a": 33}, Mapping[Union[str, int], int]),
+    ((1, "b", 3.0), Tuple[int, str, float]),
+    ((1, (2, "3")), Tuple[int, Tuple[Any, str]]),
+    ((1, 2, 3), Tuple[int, ...]),
+    ((), Tuple[int, ...]),
+    ((1, "b"), tuple),
+    ({1, 2, 3}, Set[int]),
+    (f_mul_int_typed, Callable[[int, int], float]),
+    (f_mul_int_typed, Callable[[int, Any], Any]),
+    (1, Type[int]),
+]
+
+INCORRECT_TYPING = [
+    (4, SubInt),
+    (SubInt(), float),
+    (Foo(), int),
+    (4, Union[float]),
+    (4, Optional[float]),
+    ([4, 5], Set[int]),
+    ((1, "b", 3.0), Tuple[int, str, float, str]),
+    ((1, "b", 3.0), Tuple[int, int, float]),
+    ((1, (2, "3")), Tuple[int, Tuple[int, int]]),
+    (f_mul_int_typed, Callable[[int, int], int]),
+    (f_mul_int_missing_all, Callable[[int, int], int]),
+    (f_mul_int_missing_all, Callable[[int, Any], int]),
+]
+
+
 def ok_get_function_signature(f):
     sign = inspect.signature(f)
     return sign.parameters, sign.return_annotation
@@ -49,45 +127,365 @@ class TestDecorators(TestCase):
 
         # 1. Check for correct typing
 
-        args = [
-            (4, int),
-            (4, Any),
-            (SubInt(), int),
-            (Foo(), Foo),
-            (4, Union[int, float]),
-            (4, Optional[int]),
-            ([4, 5], List[int]),
-            ([4, None], List[Optional[int]]),
-            ([SubInt(4), 4, 3.0, Foo()], List[Union[int, float, Foo]]),
-            ({"k": 1, 2: 3, "a": 33}, Mapping[Union[str, int], int]),
-            ((1, "b", 3.0), Tuple[int, str, float]),
-            ({1, 2, 3}, Set[int]),
-            (f_mul_int_typed, Callable[[int, int], float]),
-            (f_mul_int_typed, Callable[[int, Any], Any]),
-            (1, Type[int]),
-        ]
+        for i, arg in enumerate(CORRECT_TYPING):
+            with self.subTest(i=i):
+                got = check_obj_typing(arg[0], arg[1])
+                self.assertTrue(got)
 
-        for i, arg in enumerate(args):
+        # 2. Check for incorrect typing
+
+        for i, arg in enumerate(INCORRECT_TYPING):
             with self.subTest(i=i):
                 got = check_obj_typing(arg[0], arg[1])
+                self.assertFalse(got)
+
+    def test_compile_obj_typing(self):
+
+        # 1. Check for correct typing
+
+        for i, arg in enumerate(CORRECT_TYPING):
+            with self.subTest(i=i):
+                got = compile_obj_typing(arg[1])(arg[0])
                 self.assertTrue(got)
 
         # 2. Check for incorrect typing
 
+        for i, arg in enumerate(INCORRECT_TYPING):
+            with self.subTest(i=i):
+                got = compile_obj_typing(arg[1])(arg[0])
+                self.assertFalse(got)
+
+        # 3. Check that None stands for NoneType
+
+        self.assertTrue(compile_obj_typing(None)(None))
+        self.assertFalse(compile_obj_typing(None)(0))
+
+    def test_get_function_typing_plan(self):
+
+        # 1. Check that unannotated parameters are left out
+
+        plan = get_function_typing_plan(f_mul_int_missing_one)
+        self.assertEqual([p.name for _, p, _ in plan.positional], ["a"])
+        self.assertIsNone(plan.check_args((1, 1j), {}))
+        self.assertIsNone(plan.check_args((1,), {"b": 1j}))
+
+        plan = get_function_typing_plan(f_mul_int_missing_all)
+        self.assertEqual(plan.positional, ())
+        self.assertIsNone(plan.check_args((1j, 1j), {}))
+        self.assertIsNone(plan.check_ret(None))
+
+        # 2. Check that errors are reported for each argument
+
+        plan = get_function_typing_plan(f_mul_int_typed_kwd)
+        self.assertEqual(len(plan.check_args((1.0,), {"b": 1.0})), 2)
+        self.assertIsNone(plan.check_ret(1.0))
+        self.assertIsNotNone(plan.check_ret(1))
+
+    def test_typing_cache(self):
+
+        # 1. Check that compiled annotations are reused
+
+        clear_typing_cache()
+        tp = Union[int, Callable[[int], float]]
+
+        self.assertTrue(check_obj_typing(1, tp))
+        self.assertTrue(check_obj_typing(2, tp))
+        self.assertIs(compile_obj_typing(tp), compile_obj_typing(tp))
+
+        info = typing_cache_info()
+        self.assertEqual(info.maxsize, TYPING_CACHE_SIZE)
+        self.assertGreaterEqual(info.hits, 3)
+
+        # 2. Check that registering a tag invalidates the cache
+
+        class Tagged:
+            pass
+
+        self.assertFalse(check_obj_typing(1, Tagged))
+
+        @tag(Tagged)
+        def _tagged_(x: Any, *args: type) -> bool:
+            return True
+
+        self.assertEqual(typing_cache_info().currsize, 0)
+        self.assertTrue(check_obj_typing(1, Tagged))
+
+        # 3. Check that the cache is bounded
+
+        set_typing_cache_size(2)
+        try:
+            for tp in [int, float, str, bytes]:
+                compile_obj_typing(tp)
+            self.assertEqual(typing_cache_info().currsize, 2)
+        finally:
+            set_typing_cache_size(TYPING_CACHE_SIZE)
+
+    def test_type_verdicts(self):
+
+        # 1. Check that registering a class in an ABC is seen
+
+        class Base(abc.ABC):
+            pass
+
+        class Bar:
+            pass
+
+        checker = compile_obj_typing(Union[int, Base])
+        self.assertTrue(checker.by_type)
+        self.assertFalse(checker(Bar()))
+        Base.register(Bar)
+        self.assertTrue(checker(Bar()))
+
+        # 2. Check that instance-dependent checks are not cached
+
+        class EvenMeta(type):
+            def __instancecheck__(cls, x):
+                return isinstance(x, int) and x % 2 == 0
+
+        class Even(metaclass=EvenMeta):
+            pass
+
+        checker = compile_obj_typing(Optional[Even])
+        self.assertFalse(checker.by_type)
+        self.assertTrue(checker(2))
+        self.assertFalse(checker(3))
+        self.assertTrue(checker(None))
+
+        # 3. Check that proxies are checked by their `__class__`
+
+        checker = compile_obj_typing(Union[int, float])
+        self.assertTrue(checker.by_type)
+        self.assertTrue(checker(Proxy(1)))
+        self.assertFalse(checker(Proxy("1")))
+        self.assertTrue(checker(Proxy(1.0)))
+
+    def test_union_flattening(self):
+
+        # 1. Check that plain classes are checked by one isinstance
+
+        checker = compile_obj_typing(Optional[Union[int, str, Type[float]]])
+        self.assertEqual(checker.classes, (int, str, float, type(None)))
+
+        # 2. Check that other members are still checked
+
+        tp = Union[int, None, Callable[[int, int], float], Tuple[int, str]]
+        checker = compile_obj_typing(tp)
+        self.assertFalse(hasattr(checker, "classes"))
+
+        for obj in [1, None, f_mul_int_typed, (1, "a")]:
+            with self.subTest(obj=obj):
+                self.assertTrue(checker(obj))
+
+        for obj in [1.0, f_mul_int_missing_all, (1,)]:
+            with self.subTest(obj=obj):
+                self.assertFalse(checker(obj))
+
+    @unittest.skipIf(sys.version_info < (3, 10), "PEP 604 unions need Python 3.10")
+    def test_pep604_union(self):
+        checker = compile_obj_typing(eval("int | None"))
+        self.assertEqual(checker.classes, (int, type(None)))
+        self.assertTrue(checker(1))
+        self.assertTrue(checker(None))
+        self.assertFalse(checker("1"))
+
+        tp = eval("List[int] | Tuple[int, str]")
+        self.assertTrue(check_obj_typing((1, "a"), tp))
+        self.assertFalse(check_obj_typing((1, 2), tp))
+
+        def f(a: "int | None") -> "int | None":
+            return a
+
+        plan = get_function_typing_plan(f)
+        self.assertIsNone(plan.check_args((1,), {}))
+        self.assertIsNone(plan.check_args((None,), {}))
+        self.assertIsNotNone(plan.check_args(("1",), {}))
+
+    def test_typing_plan_binding(self):
+
+        # 1. Check *args and **kwargs elements
+
+        plan = get_function_typing_plan(f_variadic)
+
+        self.assertIsNone(plan.check_args((1, 2, 3), {"b": "", "c": 1.0}))
+        failed = plan.check_args((1, 2, "3"), {"b": "", "c": "1"})
+        self.assertEqual(len(failed), 2)
+        self.assertIn("`args[1]`", failed[0])
+        self.assertIn("`kwargs['c']`", failed[1])
+        self.assertEqual(len(plan.check_args((1,), {"b": 1})), 1)
+
+        # 2. Check that positional-only parameters are not bound by name
+
+        plan = get_function_typing_plan(f_positional_only)
+
+        self.assertIsNone(plan.check_args((1,), {"a": "1"}))
+        self.assertEqual(len(plan.check_args((1,), {"a": 1})), 1)
+
+    def test_container_elements(self):
+
+        # 1. Check every element
+
         args = [
-            (4, SubInt),
-            (SubInt(), float),
-            (Foo(), int),
-            (4, Union[float]),
-            (4, Optional[float]),
-            ([4, 5], Set[int]),
-            ((1, "b", 3.0), Tuple[int, str, float, str]),
-            (f_mul_int_typed, Callable[[int, int], int]),
-            (f_mul_int_missing_all, Callable[[int, int], int]),
-            (f_mul_int_missing_all, Callable[[int, Any], int]),
+            ([4, "5"], List[int]),
+            ([[4], [5, None]], List[List[int]]),
+            ({1, 2.0}, Set[int]),
+            (frozenset({"a", 1}), FrozenSet[str]),
+            (("a", 1), Sequence[str]),
+            ({"a": 1, "b": "2"}, Dict[str, int]),
+            ({"a": 1, 2: 2}, Mapping[str, int]),
         ]
 
         for i, arg in enumerate(args):
             with self.subTest(i=i):
-                got = check_obj_typing(arg[0], arg[1])
-                self.assertFalse(got)
+                self.assertTrue(check_obj_typing(arg[0], arg[1], SHALLOW))
+                self.assertFalse(check_obj_typing(arg[0], arg[1], FULL))
+
+        self.assertTrue(check_obj_typing([[4], [5, 6]], List[List[int]], FULL))
+        self.assertTrue(check_obj_typing({"a": 1}, Dict[str, Any], FULL))
+
+        # 2. Check bounded strategies
+
+        values = list(range(100000)) + ["bad"]
+
+        self.assertFalse(check_obj_typing(values, List[int], FULL))
+        self.assertTrue(check_obj_typing(values, List[int], first_elements(10)))
+        self.assertFalse(check_obj_typing(["bad"] + values, List[int], first_elements(1)))
+
+        values = ["bad"] * 100
+        strategy = sampled_elements(3, seed=1234)
+        self.assertFalse(check_obj_typing(values, List[int], strategy))
+
+        values = [0] * 100
+        self.assertTrue(check_obj_typing(values, List[int], strategy))
+
+    def test_variadic_tuple(self):
+
+        values = tuple(range(100000)) + ("bad",)
+
+        self.assertTrue(check_obj_typing(values, Tuple[int, ...]))
+        self.assertFalse(check_obj_typing(values, Tuple[int, ...], FULL))
+        self.assertTrue(check_obj_typing(values, Tuple[int, ...], first_elements(5)))
+        self.assertFalse(check_obj_typing([1, 2], Tuple[int, ...], FULL))
+        self.assertTrue(check_obj_typing(((1, "a"),), Tuple[Tuple[int, str], ...], FULL))
+
+        self.assertTrue(check_obj_typing((), Tuple[()]))
+        self.assertFalse(check_obj_typing((1,), Tuple[()]))
+        self.assertFalse(check_obj_typing([], Tuple[()]))
+        self.assertTrue(check_obj_typing((1, "a"), Tuple))
+        self.assertFalse(check_obj_typing(((1,),), Tuple[Tuple[()], ...], FULL))
+
+    def test_check_many(self):
+
+        values = [1, None, "2", SubInt(3), 4.0] * 1000
+        failed = check_many(values, Optional[int])
+        self.assertEqual(failed, [i for i in range(len(values)) if i % 5 in (2, 4)])
+
+        self.assertEqual(check_many(iter([[1], ["2"]]), List[int], FULL), [1])
+        self.assertEqual(check_many([(1, "a"), (1, 2)], Tuple[int, str]), [1])
+
+        values = [Proxy(1), Proxy("2"), Proxy(3.0), Proxy(4)]
+        self.assertEqual(check_many(values, Union[int, float]), [1])
+
+    def test_check_columns(self):
+
+        records = [(1, "a"), (2, 3), ("3", "c"), (4,), (5, "e", "extra")]
+        self.assertEqual(check_columns(records, f_mul_int_missing_one), [2])
+        self.assertEqual(check_columns(records, f_mul_int_typed), [0, 2, 4])
+        self.assertEqual(check_columns(records, f_mul_int_missing_all), [])
+
+        records = [(1,), (1, 2, 3), (1, 2, "3"), ("1", 2)]
+        self.assertEqual(check_columns(records, f_variadic), [2, 3])
+        signature = inspect.signature(f_variadic)
+        self.assertEqual(check_columns(records, signature), [2, 3])
+
+    def test_callable_cache(self):
+
+        class Multiplier:
+            def mul(self, a: int, b: int) -> float:
+                return a * b * 0.5
+
+        clear_callable_cache()
+        tp = Callable[[int, int], float]
+
+        # 1. Check that signatures are retrieved once per callable
+
+        with mock.patch(
+            "strong.core.signature.get_function_type_hints",
+            wraps=get_function_type_hints,
+        ) as hints:
+            for _ in range(3):
+                self.assertTrue(check_obj_typing(f_mul_int_typed, tp))
+                self.assertTrue(check_obj_typing(Multiplier().mul, tp))
+            self.assertEqual(hints.call_count, 2)
+
+        # 2. Check partial functions and builtins
+
+        partial = functools.partial(f_mul_int_typed, 1)
+        self.assertTrue(check_obj_typing(partial, Callable[[int], float]))
+        self.assertFalse(check_obj_typing(partial, tp))
+        self.assertTrue(check_obj_typing(partial, Callable[..., float]))
+
+        self.assertIsNone(get_callable_type_hints(max))
+        self.assertTrue(check_obj_typing(max, tp))
+        self.assertIsNotNone(get_callable_type_hints(len))
+        self.assertFalse(check_obj_typing(len, tp))
+        self.assertFalse(check_obj_typing(1, tp))
+
+    def test_postponed_annotations(self):
+
+        # 1. Check that string annotations are resolved once
+
+        plan = get_function_typing_plan(postponed.f_postponed)
+        self.assertEqual(plan.positional[1][1].annotation, List[int])
+        self.assertEqual(plan.ret_annotation, float)
+        self.assertIsNone(plan.check_args((1, [1], postponed.Node()), {}))
+        self.assertEqual(len(plan.check_args(("1", (1,), 1), {})), 3)
+        self.assertIsNotNone(plan.check_ret(1))
+
+        plan = get_function_typing_plan(postponed.Node.merge)
+        self.assertIsNone(plan.check_args((postponed.Node(), postponed.Node()), {}))
+        self.assertIsNotNone(plan.check_args((postponed.Node(), 1), {}))
+
+        self.assertEqual(resolve_annotation(int), int)
+        self.assertEqual(resolve_annotation(Literal["x"]), Literal["x"])
+        self.assertEqual(resolve_annotation("List[int]", {"List": List}), List[int])
+        self.assertEqual(resolve_annotation(List["Foo"], {"Foo": Foo}), List[Foo])
+
+        # 2. Check that unresolvable forward references are resolved on use
+
+        plan = get_function_typing_plan(postponed.f_circular)
+
+        class Later:
+            pass
+
+        with mock.patch.object(postponed, "Later", Later, create=True):
+            self.assertIsNone(plan.check_args((Later(),), {}))
+            self.assertIsNotNone(plan.check_args((1,), {}))
+            self.assertIsNone(plan.check_ret(Later()))
+
+        # 3. Check that references which never resolve are not checked
+
+        for f in (
+            postponed.f_circular,
+            postponed.f_type_checking,
+            postponed.make_f_local(),
+        ):
+            plan = get_function_typing_plan(f)
+            with self.assertWarns(Warning):
+                self.assertIsNone(plan.check_args((1,), {}))
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")  # Only warned once
+                self.assertIsNone(plan.check_args(("1",), {}))
+
+        def f_malformed(a: "List[int, int]", b: "int[") -> int:
+            return 1
+
+        with self.assertWarns(Warning):
+            plan = get_function_typing_plan(f_malformed)
+        self.assertIsNone(plan.check_args((1, 2), {}))
+
+        # 4. Check callables with string annotations
+
+        self.assertTrue(
+            check_obj_typing(postponed.f_postponed, Callable[..., float])
+        )
+        self.assertFalse(check_obj_typing(postponed.f_postponed, Callable[..., int]))